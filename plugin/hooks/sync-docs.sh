@@ -125,7 +125,8 @@ doc_count() {
 # Kick off a background cache sync. We launch unconditionally rather than gating on a
 # foreground `status` scan: status is O(pages) and a large cache blew the 5s timeout
 # (exit 124, not 2), silently stranding pending updates. `sync` has its own cheap
-# 0-fetch fast path, so an already-current cache just no-ops in the background.
+# 0-fetch fast path (one content_hash compare when the manifest is unchanged since
+# the last complete sync), so an already-current cache just no-ops in the background.
 # Concurrency control lives inside `fetch-docs.sh sync` itself (issue #28: a
 # PID-owned lock in the cache dir covers EVERY caller, not just this hook), so
 # the child is a cheap no-op when another session is already syncing — the
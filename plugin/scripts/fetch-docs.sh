@@ -7,7 +7,9 @@
 #
 # Subcommands:
 #   sync [--background]   Fetch every page whose cache copy is missing or whose
-#                         sha256 differs from the manifest (parallel, retry-once).
+#                         sha256 differs from the manifest (parallel, retry-once);
+#                         an unchanged normalized fingerprint only labels the
+#                         re-fetch cosmetic-only.
 #                         --background forks and returns immediately.
 #   get <filename|id>     Fetch a single page on demand (used on cache miss).
 #   status                Print cached / pending / stale counts.
@@ -16,7 +18,14 @@
 # Layout (resolved relative to this script's clone, overridable by env):
 #   manifest : $CLAUDE_DOCS_MANIFEST      (default <clone>/paths_manifest.json)
 #   cache    : $CLAUDE_DOCS_CACHE_DIR     (default <clone>/cache)
-#   sidecars : <cache>/.meta/<filename>.json  {manifest_sha256, content_sha256, fetched_at, stale_manifest}
+#   sidecars : <cache>/.meta/<filename>.json  {manifest_sha256, manifest_fingerprint,
+#              content_sha256, fetched_at, stale_manifest}
+#   manifest : paths_manifest.json, read through its TSV companion
+#              (paths_manifest.tsv) whenever that carries the same content_hash
+#   deltas   : manifest_deltas/<content_hash>.tsv beside the manifest, one per CI
+#              write: the pages added/changed/removed since that content_hash
+#   marker   : <cache>/.meta/.synced_content_hash  (manifest content_hash of the
+#              last sync that left nothing pending)
 #
 # Cache filenames match the manifest's flattened convention (claude-code__hooks.md),
 # so the search skills' globs work unchanged.
@@ -29,8 +38,14 @@ CLONE_ROOT="$(cd "$SCRIPT_DIR/../.." && pwd)"
 SELF="$SCRIPT_DIR/fetch-docs.sh"
 
 MANIFEST="${CLAUDE_DOCS_MANIFEST:-$CLONE_ROOT/paths_manifest.json}"
+COMPANION="${MANIFEST%.json}.tsv"
+DELTA_DIR="$(dirname "$MANIFEST")/manifest_deltas"
+# Longest delta chain followed before falling back to a full scan (CI keeps 56).
+MAX_DELTA_STEPS=64
+USE_COMPANION=0
 CACHE_DIR="${CLAUDE_DOCS_CACHE_DIR:-$CLONE_ROOT/cache}"
 META_DIR="$CACHE_DIR/.meta"
+SYNCED_MARKER="$META_DIR/.synced_content_hash"
 PARALLEL="${CLAUDE_DOCS_PARALLEL:-8}"
 # Sanitize: non-numeric or empty -> default; 0 would stall the job pool -> floor at 1.
 case "$PARALLEL" in ''|*[!0-9]*) PARALLEL=8 ;; esac
@@ -45,6 +60,9 @@ ALLOWED_HOSTS="code.claude.com platform.claude.com raw.githubusercontent.com"
 
 die() { echo "fetch-docs: $*" >&2; exit 1; }
 
+# manifest_content_hash, companion_current
+. "$SCRIPT_DIR/manifest-lib.sh" || die "missing $SCRIPT_DIR/manifest-lib.sh"
+
 have_jq() { command -v jq >/dev/null 2>&1; }
 
 # Guard used by every subcommand: jq present, manifest exists, parses to a JSON
@@ -53,13 +71,88 @@ have_jq() { command -v jq >/dev/null 2>&1; }
 # "0 pages / up to date" downstream. NB: `jq -e .` is NOT enough — jq 1.6 exits 0 on
 # empty/whitespace input; the type tests reject those (and the v1 shape) while still
 # accepting an empty {"pages":[]}.
+# A current companion was written by the same save as this manifest, so the JSON
+# checks (two full parses) are skipped and every read below goes to the TSV.
 require_manifest() {
     have_jq || die "jq is required"
     [ -f "$MANIFEST" ] || die "manifest not found: $MANIFEST"
+    if companion_current; then
+        USE_COMPANION=1
+        return 0
+    fi
     [ "$(jq -r 'type' "$MANIFEST" 2>/dev/null)" = "object" ] || die "manifest is not a valid JSON object: $MANIFEST"
     [ "$(jq -r '.pages | type' "$MANIFEST" 2>/dev/null)" = "array" ] || die "manifest has no .pages array (wrong schema?): $MANIFEST"
 }
 
+# Every manifest page as one tab-separated row: filename, id, md_url, sha256,
+# fingerprint, category, title ("-" for a missing value). Read straight from the
+# companion when require_manifest found it current; otherwise jq emits the same rows.
+manifest_rows() {
+    if [ "$USE_COMPANION" = 1 ]; then
+        grep -v '^#' "$COMPANION"
+    else
+        jq -r '.pages[] | [.filename, .id, .md_url, .sha256, .fingerprint, .category, .title]
+            | map(if . == null or . == "" then "-" else tostring end) | @tsv' "$MANIFEST" 2>/dev/null
+    fi
+}
+
+# 0 if the last complete sync ran against this exact manifest content. Pages deleted
+# from the cache by hand since then are not noticed here; `get` refetches on a miss.
+synced_to_manifest() {
+    local want; want=$(manifest_content_hash)
+    [ -n "$want" ] && [ -f "$SYNCED_MARKER" ] && [ "$(cat "$SYNCED_MARKER" 2>/dev/null)" = "$want" ]
+}
+
+# delta_rows <base_hash> <target_hash> — "filename<TAB>md_url<TAB>sha256<TAB>fingerprint"
+# for every page the delta chain base -> target added or changed (latest row per
+# file; removals dropped — prune owns those). Returns 1, printing nothing, when the
+# chain is broken (a delta pruned or never written) or longer than MAX_DELTA_STEPS.
+delta_rows() {
+    local hash="$1" want="$2" steps=0
+    local chain=()
+    while [ "$hash" != "$want" ]; do
+        steps=$((steps + 1))
+        [ "$steps" -le "$MAX_DELTA_STEPS" ] || return 1
+        case "$hash" in ''|*[!0-9a-f]*) return 1 ;; esac
+        [ -f "$DELTA_DIR/$hash.tsv" ] || return 1
+        chain+=("$DELTA_DIR/$hash.tsv")
+        hash=$(sed -n '1s/^# from=[0-9a-f]* to=\([0-9a-f]*\) .*$/\1/p' "$DELTA_DIR/$hash.tsv" 2>/dev/null)
+    done
+    [ "${#chain[@]}" -gt 0 ] || return 0
+    # Columns: op, filename, id, md_url, sha256, fingerprint, category, title.
+    cat "${chain[@]}" \
+    | awk -F'\t' -v OFS='\t' '
+        /^#/ { next }
+        !($2 in op) { order[++n] = $2 }
+        { op[$2] = $1; row[$2] = $2 OFS $4 OFS $5 OFS ($6 == "-" ? "" : $6); sha[$2] = $5 }
+        END {
+            for (i = 1; i <= n; i++) {
+                f = order[i]
+                if (op[f] != "R" && sha[f] != "-") print row[f]
+            }
+        }'
+}
+
+# Pages sync must check, as "filename<TAB>md_url<TAB>sha256<TAB>fingerprint" rows.
+# After a complete sync that is only what the deltas since then added or changed;
+# without an unbroken chain from that base, every syncable page.
+sync_candidates() {
+    local base want
+    base=$(cat "$SYNCED_MARKER" 2>/dev/null)
+    want=$(manifest_content_hash)
+    if [ -n "$base" ] && [ -n "$want" ] && delta_rows "$base" "$want"; then
+        return 0
+    fi
+    # Only pages with a real sha256 are syncable (failed pages have none: "-").
+    manifest_rows | awk -F'\t' -v OFS='\t' '$4 != "-" { print $1, $3, $4, ($5 == "-" ? "" : $5) }'
+}
+
+mark_synced() {
+    local hash; hash=$(manifest_content_hash)
+    [ -n "$hash" ] || return 0
+    printf '%s\n' "$hash" > "$SYNCED_MARKER.$$" && mv -f "$SYNCED_MARKER.$$" "$SYNCED_MARKER"
+}
+
 url_host() { printf '%s' "$1" | sed -E 's#^https?://([^/]+).*#\1#'; }
 
 host_allowed() {
@@ -190,29 +283,42 @@ fetch_url() {
 # the content sha we actually got. "Up to date" means synced against the current
 # manifest entry — so a hash-mismatch (stale) page is fetched once, flagged, and
 # NOT re-fetched every run; it re-fetches only when the manifest entry changes.
+# manifest_fingerprint is recorded only when the bytes matched the manifest sha —
+# then it is the cached copy's own fingerprint (see cosmetic_change).
 write_sidecar() {
-    local filename="$1" manifest_sha="$2" content_sha="$3" stale="$4"
+    local filename="$1" manifest_sha="$2" content_sha="$3" stale="$4" fingerprint="${5:-}"
+    [ "$stale" = false ] && [ "$fingerprint" != "null" ] || fingerprint=""
     # Atomic like the content write: temp file in the same dir, then rename.
     local tmp="$META_DIR/.tmp.$filename.json.$$"
-    printf '{"manifest_sha256":"%s","content_sha256":"%s","fetched_at":"%s","stale_manifest":%s}\n' \
-        "$manifest_sha" "$content_sha" "$(date -u +%Y-%m-%dT%H:%M:%SZ)" "$stale" > "$tmp"
+    printf '{"manifest_sha256":"%s","manifest_fingerprint":"%s","content_sha256":"%s","fetched_at":"%s","stale_manifest":%s}\n' \
+        "$manifest_sha" "$fingerprint" "$content_sha" "$(date -u +%Y-%m-%dT%H:%M:%SZ)" "$stale" > "$tmp"
     mv -f "$tmp" "$META_DIR/$filename.json"
 }
 
 # needs_fetch <filename> <manifest_sha> — 0 (yes) if file missing or the sidecar
-# was synced against a different manifest sha than the current one.
+# was synced against a different manifest sha than the current one. The sha256 is
+# authoritative: a cosmetic-only upstream change (same fingerprint) still
+# re-fetches, so every cached copy verifies against its manifest sha256.
 needs_fetch() {
     local file="$CACHE_DIR/$1" meta="$META_DIR/$1.json"
     [ -f "$file" ] || return 0
     [ -f "$meta" ] || return 0
-    local have
-    have=$(jq -r '.manifest_sha256 // ""' "$meta" 2>/dev/null)
-    [ "$have" = "$2" ] && return 1 || return 0
+    [ "$(jq -r '.manifest_sha256 // ""' "$meta" 2>/dev/null)" != "$2" ]
+}
+
+# cosmetic_change <filename> <manifest_fingerprint> — 0 if the cached copy has the
+# manifest's fingerprint: the pending re-fetch brings only cosmetic bytes
+# (whitespace, a build timestamp). Classifies the sync's work; never skips it.
+cosmetic_change() {
+    local meta="$META_DIR/$1.json" want_fp="${2:-}"
+    [ -n "$want_fp" ] && [ "$want_fp" != "null" ] && [ -f "$meta" ] || return 1
+    [ "$(jq -r '.manifest_fingerprint // ""' "$meta" 2>/dev/null)" = "$want_fp" ]
 }
 
-# Core single-page fetch. Args: filename, md_url, expected_sha ("" or "null" to skip check).
+# Core single-page fetch. Args: filename, md_url, expected_sha ("" or "null" to skip
+# check), and optionally the manifest fingerprint (for the sidecar).
 fetch_one() {
-    local filename="$1" md_url="$2" expected="$3"
+    local filename="$1" md_url="$2" expected="$3" fingerprint="${4:-}"
     # Filename comes from the manifest and is used to build cache/sidecar paths.
     # Reject anything that could escape the cache dir (defense in depth: the CI
     # generator flattens names, but a tampered manifest must not traverse paths).
@@ -253,15 +359,19 @@ fetch_one() {
         stale=true  # committed manifest hash differs from the live page; accept anyway
     fi
     mv -f "$tmp" "$CACHE_DIR/$filename"
-    write_sidecar "$filename" "$expected" "$got" "$stale"
+    write_sidecar "$filename" "$expected" "$got" "$stale" "$fingerprint"
     return 0
 }
 
-# Look up a page by filename OR id in the manifest -> "md_url<TAB>sha256".
+# Look up a page by filename OR id in the manifest ->
+# "filename<TAB>md_url<TAB>sha256<TAB>fingerprint" (sha256 "null" when never fetched).
+# First match wins, in manifest order; the whole input is read (no early exit into
+# a pipe whose writer ignores SIGPIPE).
 lookup_page() {
-    jq -r --arg k "$1" '
-        .pages[] | select(.filename == $k or .id == $k)
-        | [.md_url, (.sha256 // "null")] | @tsv' "$MANIFEST" 2>/dev/null | head -1
+    manifest_rows | awk -F'\t' -v k="$1" -v OFS='\t' '
+        ($1 == k || $2 == k) && !found++ {
+            print $1, $3, ($4 == "-" ? "null" : $4), ($5 == "-" ? "" : $5)
+        }'
 }
 
 # --------------------------------------------------------------------------
@@ -271,14 +381,15 @@ lookup_page() {
 cmd_get() {
     [ -n "${1:-}" ] || die "usage: get <filename|id>"
     require_manifest
-    local key="$1" row md_url sha filename
+    local key="$1" row md_url sha fingerprint filename
     row=$(lookup_page "$key")
     [ -n "$row" ] || die "no manifest entry for '$key'"
-    md_url=$(printf '%s' "$row" | cut -f1)
-    sha=$(printf '%s' "$row" | cut -f2)
-    # If key was an id, resolve the filename for the cache path.
-    filename=$(jq -r --arg k "$key" '.pages[] | select(.filename==$k or .id==$k) | .filename' "$MANIFEST" | head -1)
-    fetch_one "$filename" "$md_url" "$sha"
+    # The row carries the filename, so a key given as an id resolves in the same pass.
+    filename=$(printf '%s' "$row" | cut -f1)
+    md_url=$(printf '%s' "$row" | cut -f2)
+    sha=$(printf '%s' "$row" | cut -f3)
+    fingerprint=$(printf '%s' "$row" | cut -f4)
+    fetch_one "$filename" "$md_url" "$sha" "$fingerprint"
 }
 
 cmd_sync() {
@@ -302,24 +413,38 @@ cmd_sync() {
             echo "fetch-docs: could not record sync-lock ownership (disk full?) — sync skipped" >&2
             return 1 ;;
     esac
+    # One value answers "anything to do?" for an unchanged manifest: no per-page
+    # sidecar reads (the hook runs this on every session start).
+    if synced_to_manifest; then
+        echo "fetch-docs: cache up to date (0 fetches)"
+        return 0
+    fi
     local pending; pending=$(mktemp)
-    # Only pages with a real sha256 are syncable (failed pages have null).
-    jq -r '.pages[] | select(.sha256 != null) | [.filename, .md_url, .sha256] | @tsv' "$MANIFEST" \
-    | while IFS=$'\t' read -r filename md_url sha; do
+    sync_candidates \
+    | while IFS=$'\t' read -r filename md_url sha fp; do
         if needs_fetch "$filename" "$sha"; then
-            printf '%s\t%s\t%s\n' "$filename" "$md_url" "$sha"
+            printf '%s\t%s\t%s\t%s\n' "$filename" "$md_url" "$sha" "$fp"
         fi
     done > "$pending"
 
     local count; count=$(wc -l < "$pending" | tr -d ' ')
     if [ "$count" -eq 0 ]; then
         rm -f "$pending"
+        mark_synced
         echo "fetch-docs: cache up to date (0 fetches)"
         return 0
     fi
-    echo "fetch-docs: fetching $count page(s)..."
+    local cosmetic=0
+    while IFS=$'\t' read -r filename _ _ fp; do
+        cosmetic_change "$filename" "$fp" && cosmetic=$((cosmetic + 1))
+    done < "$pending"
+    if [ "$cosmetic" -gt 0 ]; then
+        echo "fetch-docs: fetching $count page(s) ($cosmetic cosmetic-only)..."
+    else
+        echo "fetch-docs: fetching $count page(s)..."
+    fi
 
-    # Parallel fetch: re-invoke self per line (line = filename\tmd_url\tsha) via
+    # Parallel fetch: re-invoke self per line (line = filename\tmd_url\tsha\tfp) via
     # a true worker pool — xargs keeps $PARALLEL children busy continuously,
     # unlike the old batch loop where every batch waited on its slowest fetch
     # (idling up to PARALLEL-1 slots). NUL-delimited with -n1, NOT -I: BSD xargs
@@ -335,12 +460,13 @@ cmd_sync() {
     # to exit nonzero on a total failure — a silent 'sync complete' after 0 fetches
     # (e.g. offline) is otherwise indistinguishable from success to the hook.
     local still=0
-    while IFS=$'\t' read -r filename _ sha; do
+    while IFS=$'\t' read -r filename _ sha fp; do
         needs_fetch "$filename" "$sha" && still=$((still + 1))
     done < "$pending"
     rm -f "$pending"
 
     local fetched=$((count - still))
+    [ "$still" -eq 0 ] && mark_synced
     echo "fetch-docs: sync complete ($fetched/$count fetched)"
     if [ "$fetched" -eq 0 ]; then
         echo "fetch-docs: all $count fetch(es) failed (offline?)" >&2
@@ -353,11 +479,12 @@ cmd_sync() {
 cmd_fetch_line() {
     local line="${1:-}"
     [ -n "$line" ] || return 0
-    local filename md_url sha
+    local filename md_url sha fp
     filename=$(printf '%s' "$line" | cut -f1)
     md_url=$(printf '%s' "$line" | cut -f2)
     sha=$(printf '%s' "$line" | cut -f3)
-    fetch_one "$filename" "$md_url" "$sha" || true  # skip failures, don't abort the pool
+    fp=$(printf '%s' "$line" | cut -f4)
+    fetch_one "$filename" "$md_url" "$sha" "$fp" || true  # skip failures, don't abort the pool
     # Heartbeat for the recycled-PID reap (per page, since the pool parent has
     # no batch boundary to fire it from). Dir-guarded: after a lock removal
     # races us, an unguarded touch would recreate the path as a plain FILE and
@@ -368,17 +495,22 @@ cmd_fetch_line() {
 
 cmd_status() {
     require_manifest
-    local total syncable cached=0 pending=0 stale=0
-    total=$(jq '.pages | length' "$MANIFEST")
-    syncable=$(jq '[.pages[] | select(.sha256 != null)] | length' "$MANIFEST")
+    local rows total syncable cached=0 pending=0 stale=0
+    rows=$(manifest_rows | awk -F'\t' -v OFS='\t' '{ print $1, $4, ($5 == "-" ? "" : $5) }')
+    total=$(printf '%s' "$rows" | grep -c '')
+    syncable=$(printf '%s' "$rows" | awk -F'\t' '$2 != "-"' | grep -c '')
 
-    while IFS=$'\t' read -r filename sha; do
-        if needs_fetch "$filename" "$sha"; then
-            pending=$((pending + 1))
-        else
-            cached=$((cached + 1))
-        fi
-    done < <(jq -r '.pages[] | select(.sha256 != null) | [.filename, .sha256] | @tsv' "$MANIFEST")
+    if synced_to_manifest; then
+        cached=$syncable
+    else
+        while IFS=$'\t' read -r filename sha fp; do
+            if needs_fetch "$filename" "$sha"; then
+                pending=$((pending + 1))
+            else
+                cached=$((cached + 1))
+            fi
+        done < <(printf '%s\n' "$rows" | awk -F'\t' '$2 != "-"')
+    fi
 
     if [ -d "$META_DIR" ]; then
         stale=$(grep -l '"stale_manifest":true' "$META_DIR"/*.json 2>/dev/null | wc -l | tr -d ' ')
@@ -397,7 +529,7 @@ cmd_prune() {
     require_manifest
     [ -d "$CACHE_DIR" ] || { echo "fetch-docs: no cache to prune"; return 0; }
     local keep; keep=$(mktemp)
-    jq -r '.pages[].filename' "$MANIFEST" | sort > "$keep"
+    manifest_rows | cut -f1 | sort > "$keep"
     if [ ! -s "$keep" ]; then
         rm -f "$keep"
         die "manifest lists 0 pages — refusing to prune (would wipe the entire cache)"
@@ -7,7 +7,14 @@
 #
 # "Changed" is keyed off sha256 deltas between manifest revisions — NOT lastmod,
 # because platform.claude.com pages carry no lastmod (76% of the corpus), so a
-# lastmod-based diff would silently miss most content changes.
+# lastmod-based diff would silently miss most content changes. A sha256 delta
+# whose normalized "fingerprint" is unchanged (whitespace, a build timestamp,
+# reordered links) is cosmetic: listed under "cosmetic", not "changed".
+#
+# Within a changed page, the per-section hashes (the entry's "sections": anchor-key
+# -> hash, in page order; hashes only) say which heading sections changed, were
+# added, or were removed. Sections are named from search_index.json's headings,
+# which line up with the keyed sections; unnamed ones print as "section N".
 #
 # Replaces the mirror-era `git log -- docs/` for the what's-new / changelog features.
 
@@ -56,8 +63,8 @@ base_rev=$(git rev-list -1 --before="$git_since" HEAD -- "$MANIFEST_REL" 2>/dev/
 
 # Write both manifests to temp files — they can be ~700KB, too large to pass on
 # jq's command line (--argjson would overflow ARG_MAX). --slurpfile reads from files.
-old_f=$(mktemp); new_f=$(mktemp)
-trap 'rm -f "$old_f" "$new_f"' EXIT
+old_f=$(mktemp); new_f=$(mktemp); idx_f=$(mktemp)
+trap 'rm -f "$old_f" "$new_f" "$idx_f"' EXIT
 
 if [ -n "$base_rev" ]; then
     git show "$base_rev:$MANIFEST_REL" > "$old_f" 2>/dev/null || echo '{"pages":[]}' > "$old_f"
@@ -65,15 +72,45 @@ else
     echo '{"pages":[]}' > "$old_f"  # window predates repo history -> everything is "added"
 fi
 cp "$MANIFEST_REL" "$new_f"
+# Section names only; a missing/unreadable index just leaves sections numbered.
+jq -c '{pages: [.pages[]? | {id, headings}]}' search_index.json > "$idx_f" 2>/dev/null \
+    || echo '{"pages":[]}' > "$idx_f"
 
 # .pages // [] tolerates a legacy v1 ({categories}) baseline -> treated as empty.
-diff_json=$(jq -n --slurpfile old "$old_f" --slurpfile new "$new_f" '
+# section_changes (changed pages): {changed: [names], added: [names], removed: N},
+# or null when either revision predates section hashes.
+diff_json=$(jq -n --slurpfile old "$old_f" --slurpfile new "$new_f" --slurpfile idx "$idx_f" '
+    def section_names($new; $headings):
+        ($new | keys_unsorted) as $keys
+        | (if ($keys | first) == "" then 1 else 0 end) as $off
+        | [ range(0; $keys | length) as $i
+            | if $i < $off then "(intro)"
+              elif ($headings | length) == ($keys | length) - $off then $headings[$i - $off].text
+              else "section \($i + 1)" end ];
+    def section_changes($old; $new; $headings):
+        if ($old | type) != "object" or ($new | type) != "object" then null
+        else
+            section_names($new; $headings) as $names
+            | [ $new | keys_unsorted | to_entries[] ] as $pos
+            | { changed: [ $pos[] | select($old[.value] != null and $old[.value] != $new[.value]) | $names[.key] ],
+                added:   [ $pos[] | select($old[.value] == null) | $names[.key] ],
+                removed: ([ $old | keys_unsorted[] | select($new[.] == null) ] | length) }
+        end;
+    def moved($a; $b): $a.sha256 != $b.sha256;
+    def cosmetic($a; $b): moved($a; $b) and $a.fingerprint != null and $a.fingerprint == $b.fingerprint;
     ($old[0].pages // [] | map({(.id): .}) | add // {}) as $o
     | ($new[0].pages // [] | map({(.id): .}) | add // {}) as $n
+    | ($idx[0].pages // [] | map({(.id): (.headings // [])}) | add // {}) as $h
     | {
-        added:   [ $n | to_entries[] | select($o[.key] == null) | .value ],
-        removed: [ $o | to_entries[] | select($n[.key] == null) | .value ],
-        changed: [ $n | to_entries[] | select(($o[.key] != null) and ($o[.key].sha256 != .value.sha256)) | .value ]
+        added:   [ $n | to_entries[] | select($o[.key] == null) | .value | del(.sections) ],
+        removed: [ $o | to_entries[] | select($n[.key] == null) | .value | del(.sections) ],
+        cosmetic: [ $n | to_entries[] | select(($o[.key] != null) and cosmetic($o[.key]; .value))
+                    | .value | del(.sections) ],
+        changed: [ $n | to_entries[] | select(($o[.key] != null) and moved($o[.key]; .value)
+                                              and (cosmetic($o[.key]; .value) | not))
+                   | .key as $id | .value
+                   | . + {section_changes: section_changes($o[$id].sections; .sections; $h[$id] // [])}
+                   | del(.sections) ]
       }
 ')
 
@@ -87,7 +124,14 @@ section() {
     local n; n=$(printf '%s' "$diff_json" | jq -r --arg k "$key" '.[$k] | length')
     echo "=== $label ($n) ==="
     printf '%s' "$diff_json" | jq -r --arg k "$key" \
-        '.[$k] | sort_by(.category, .id)[] | "[\(.category)] \(.title // .id)\n    \(.url)"'
+        '.[$k] | sort_by(.category, .id)[]
+         | "[\(.category)] \(.title // .id)\n    \(.url)"
+           + (.section_changes // null | if . == null then "" else
+                [ (if (.changed | length) > 0 then "changed: " + (.changed | join(", ")) else empty end),
+                  (if (.added | length) > 0 then "added: " + (.added | join(", ")) else empty end),
+                  (if .removed > 0 then "removed: \(.removed)" else empty end) ]
+                | if length > 0 then "\n    sections " + join("; ") else "" end
+              end)'
     echo ""
 }
 
@@ -96,3 +140,5 @@ echo ""
 section added "Added"
 section changed "Changed"
 section removed "Removed"
+cosmetic=$(printf '%s' "$diff_json" | jq -r '.cosmetic | length')
+[ "$cosmetic" -eq 0 ] || echo "($cosmetic page(s) with cosmetic-only changes not listed)"
@@ -0,0 +1,22 @@
+# manifest-lib.sh — manifest reads shared by the plugin's shell scripts.
+# Sourced, not run: by fetch-docs.sh, fuzzy-search.sh and validate-paths.sh, so
+# the freshness check on the TSV companion has one definition. The caller sets
+# MANIFEST (paths_manifest.json) and COMPANION (paths_manifest.tsv) first.
+
+# The manifest's content_hash (a hash of everything but generated_at), or "" for a
+# manifest that predates it. Read with sed, not jq: it is one top-level line of the
+# pretty-printed file, and this check exists to skip parsing the whole manifest.
+manifest_content_hash() {
+    sed -n '/^  "content_hash": /{s/^  "content_hash": "\([0-9a-f]*\)",\{0,1\}$/\1/p;q;}' "$MANIFEST" 2>/dev/null
+}
+
+# 0 if the TSV companion exists and its header names this manifest's content_hash.
+# A companion from another run (or a manifest without content_hash) is ignored.
+companion_current() {
+    [ -f "$COMPANION" ] || return 1
+    local want have
+    want=$(manifest_content_hash)
+    [ -n "$want" ] || return 1
+    have=$(sed -n '1s/^# content_hash=\([0-9a-f]*\) .*$/\1/p' "$COMPANION" 2>/dev/null)
+    [ "$have" = "$want" ]
+}
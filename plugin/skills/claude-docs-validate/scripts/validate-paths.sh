@@ -2,7 +2,9 @@
 # validate-paths.sh — HTTP reachability checks for the v2 manifest.
 # Usage: validate-paths.sh [--quick]
 #   --quick: sample 20 random pages instead of all.
-# Reads md_urls directly from paths_manifest.json (no filename->URL derivation).
+# Reads md_urls directly from paths_manifest.json (no filename->URL derivation),
+# through its TSV companion (paths_manifest.tsv) when that carries the same
+# content_hash.
 # Exit: 0 if all reachable, 1 if any broken/timeout.
 
 set -uo pipefail
@@ -10,6 +12,9 @@ set -uo pipefail
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]:-$0}")" && pwd)"
 CLONE_ROOT="$(cd "$SCRIPT_DIR/../../../.." && pwd)"
 MANIFEST="${CLAUDE_DOCS_MANIFEST:-$CLONE_ROOT/paths_manifest.json}"
+COMPANION="${MANIFEST%.json}.tsv"
+# manifest_content_hash, companion_current (shared with fetch-docs.sh)
+. "$CLONE_ROOT/plugin/scripts/manifest-lib.sh" || exit 1
 QUICK_SAMPLE=20
 MAX_PARALLEL=5
 TIMEOUT=10
@@ -18,13 +23,21 @@ quick_mode=false
 [ "${1:-}" = "--quick" ] && quick_mode=true
 
 [ -f "$MANIFEST" ] || { echo "Manifest not found: $MANIFEST" >&2; exit 1; }
-command -v jq >/dev/null 2>&1 || { echo "jq is required" >&2; exit 1; }
+
+# md_url is column 3 of the companion, trusted only while its header names the
+# manifest's content_hash (companion_current); otherwise jq reads the JSON.
+if companion_current; then
+    page_urls() { awk -F'\t' '!/^#/ && $3 != "-" { print $3 }' "$COMPANION"; }
+else
+    command -v jq >/dev/null 2>&1 || { echo "jq is required" >&2; exit 1; }
+    page_urls() { jq -r '.pages[].md_url | select(. != null)' "$MANIFEST"; }
+fi
 
 # No mapfile: must run on stock macOS bash 3.2.
 all_urls=()
 while IFS= read -r u; do
     [ -n "$u" ] && all_urls+=("$u")
-done < <(jq -r '.pages[].md_url | select(. != null)' "$MANIFEST")
+done < <(page_urls)
 [ ${#all_urls[@]} -gt 0 ] || { echo "No URLs in manifest" >&2; exit 1; }
 
 if [ "$quick_mode" = true ]; then
@@ -1,13 +1,22 @@
 #!/usr/bin/env bash
 # content-search.sh — full-text keyword search over the v2 search index.
-# Usage: content-search.sh <keyword> [keyword2 ...]
+# Usage: content-search.sh [--category NAME[,NAME...]] <keyword> [keyword2 ...]
 #
-# Scores each page (BM25-lite in jq): title x10 + filename-slug x10 + matched
-# headings (capped 3) x3 + sqrt(stemmed-term freq) x2. Falls back to grep over
-# the cache when the index or jq is unavailable. Uniform output on BOTH paths:
+# Scores each page: title x10 + filename-slug x10 + matched headings (capped 3)
+# x3 + the stemmed term's BM25 weight (IDF + length normalization, from the
+# index's "bm25" statistics; sqrt(freq) x2 for an index that predates them).
+# When the inverted-index sidecar (search_index.postings.json) matches the
+# index's content_hash, its precomputed weights are summed over the postings of
+# the query's terms; otherwise every page record is scanned and the weight
+# computed exactly as scripts/build_search_index.py:bm25_weight does — same
+# scores either way. --category (repeatable) keeps only pages of those
+# categories, reading just their shards from search_shards/ while its
+# catalog.json matches the index (the full index otherwise); scores are the
+# unfiltered ones. Falls back to grep over the cache when the index or jq is
+# unavailable (the grep fallback cannot filter by category). Uniform output on BOTH paths:
 # filename<TAB>title<TAB>score, sorted by score descending (top 20).
 #
-# STEMMING must match scripts/build_search_index.py exactly (strip first of
+# STEMMING must match scripts/fetcher/analysis.py exactly (strip first of
 # ing/ed/es/s if >=3 chars remain). See tests/unit/test_stem_parity.py.
 
 set -uo pipefail
@@ -16,20 +25,32 @@ trap '' PIPE
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]:-$0}")" && pwd)"
 CLONE_ROOT="$(cd "$SCRIPT_DIR/../../../.." && pwd)"
 INDEX="${CLAUDE_DOCS_INDEX:-$CLONE_ROOT/search_index.json}"
+POSTINGS="${INDEX%.json}.postings.json"
+CATALOG="$(dirname "$INDEX")/search_shards/catalog.json"
 CACHE_DIR="${CLAUDE_DOCS_CACHE_DIR:-${DOCS_DIR:-$CLONE_ROOT/cache}}"
 
-if [ $# -eq 0 ]; then
-    echo "Usage: content-search.sh <keyword> [keyword2 ...]" >&2
+usage() {
+    echo "Usage: content-search.sh [--category NAME[,NAME...]] <keyword> [keyword2 ...]" >&2
     exit 1
-fi
+}
+[ $# -eq 0 ] && usage
 
 # Sanitize + tokenize like the Python indexer: split on every non-alphanumeric char
 # so a compound query fans into the same tokens the index holds ("agent-sdk" ->
 # "agent" "sdk", "node.js" -> "node" "js"). Keeping hyphens made a hyphenated query
 # match no index field and score 0 (build_search_index.py:100-106 splits on non-alpha).
 keywords=()
-for arg in "$@"; do
-    clean=$(printf '%s' "$arg" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9]/ /g')
+categories=""
+while [ $# -gt 0 ]; do
+    case "$1" in
+        --category)
+            [ $# -ge 2 ] || usage
+            categories="${categories:+$categories,}$2"; shift 2; continue ;;
+        --category=*)
+            categories="${categories:+$categories,}${1#--category=}"; shift; continue ;;
+    esac
+    clean=$(printf '%s' "$1" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9]/ /g')
+    shift
     read -ra toks <<< "$clean"
     for w in "${toks[@]}"; do
         [ -n "$w" ] && keywords+=("$w")
@@ -40,28 +61,139 @@ if [ ${#keywords[@]} -eq 0 ]; then
     exit 1
 fi
 
-# Strategy 1: v2 index + jq (BM25-lite scoring, stemming mirrored from Python).
-if [ -f "$INDEX" ] && command -v jq >/dev/null 2>&1; then
-    results=$(jq -r --args '
-        def stem:
-          ascii_downcase as $w
-          | if   ($w|endswith("ing")) and (($w|length) >= 6) then $w[0:-3]
-            elif ($w|endswith("ed"))  and (($w|length) >= 5) then $w[0:-2]
-            elif ($w|endswith("es"))  and (($w|length) >= 5) then $w[0:-2]
-            elif ($w|endswith("s"))   and (($w|length) >= 4) then $w[0:-1]
-            else $w end;
+JQ_STEM='
+    def stem:
+      ascii_downcase as $w
+      | if   ($w|endswith("ing")) and (($w|length) >= 6) then $w[0:-3]
+        elif ($w|endswith("ed"))  and (($w|length) >= 5) then $w[0:-2]
+        elif ($w|endswith("es"))  and (($w|length) >= 5) then $w[0:-2]
+        elif ($w|endswith("s"))   and (($w|length) >= 4) then $w[0:-1]
+        else $w end;'
+
+# content_hash of a JSON file written by build_search_index.py, whose hash is a
+# single line near the top indented by $2 ("  " for the index and the shard
+# catalog, "" for the postings); sed stops at the first match.
+content_hash_of() {
+    sed -n "/^$2\"content_hash\": /{s/^$2\"content_hash\": \"\([0-9a-f]*\)\",\{0,1\}\$/\1/p;q;}" "$1" 2>/dev/null
+}
+
+# The sidecar is used only while it carries weights (schema 2) and its
+# content_hash is the index's.
+postings_current() {
+    [ -f "$POSTINGS" ] || return 1
+    [ "$(sed -n '2{p;q;}' "$POSTINGS" 2>/dev/null)" = '"schema_version": 2,' ] || return 1
+    local want
+    want=$(content_hash_of "$INDEX" "  ")
+    [ -n "$want" ] && [ "$(content_hash_of "$POSTINGS" "")" = "$want" ]
+}
+
+# Shard files for $categories, one path per line — only while the catalog's
+# content_hash is the index's (the builder writes the catalog after the shards).
+category_shards() {
+    [ -f "$CATALOG" ] || return 1
+    local want
+    want=$(content_hash_of "$INDEX" "  ")
+    [ -n "$want" ] && [ "$(content_hash_of "$CATALOG" "  ")" = "$want" ] || return 1
+    jq -r --arg cats "$categories" --arg dir "$(dirname "$CATALOG")" '
+        ($cats | split(",")) as $want
+        | .shards[] | select(.category as $c | any($want[]; . == $c)) | "\($dir)/\(.file)"
+    ' "$CATALOG" 2>/dev/null
+}
+
+# Strategy 1b program (stemming mirrored from Python): scans every page record
+# of each input document, keeping those in $cats (comma list; empty = all).
+# bm25 must stay operation-for-operation identical to
+# build_search_index.py:bm25_weight.
+JQ_SCAN='
+        def bm25($tf; $dl; $df; $s):
+          (1 + ($s.pages - $df + 0.5) / ($df + 0.5) | log) as $idf
+          | ($idf * ($tf * ($s.k1 + 1) / ($tf + $s.k1 * (1 - $s.b + $s.b * $dl / $s.avgdl)))) as $w
+          | ($w * 10000 + 0.5 | floor) / 10000;
+        def weight($p; $t; $s):
+          ($p.terms[$t] // 0) as $tf
+          | if $tf == 0 then 0
+            elif $s then bm25($tf; $p.word_count // 0; $s.df[$t]; $s)
+            else ($tf | sqrt) * 2 end;
         ($ARGS.positional | map(stem)) as $q
+        | ($cats | split(",")) as $want
+        | .bm25 as $s
         | .pages[] | . as $p
+        | select(($want | length) == 0 or (($p.category // "") as $c | any($want[]; . == $c)))
         | ($p.filename | ascii_downcase | gsub("[_-]+"; " ")) as $fn
         | ( [ $q[] as $t
               | (if (($p.title // "")|ascii_downcase|contains($t)) then 10 else 0 end)
               + (if ($fn|contains($t)) then 10 else 0 end)
               + (([ $p.headings[]? | select(.text|ascii_downcase|contains($t)) ] | length | if . > 3 then 3 else . end) * 3)
-              + ((($p.terms[$t] // 0) | sqrt) * 2)
+              + weight($p; $t; $s)
+            ] | add ) as $score
+        | select($score > 0)
+        | [$p.filename, ($p.title // ""), ($score|tostring)] | @tsv'
+
+# Category filter: the 1b scan over the matching shards (or the whole index when
+# the catalog is stale or missing). A filtered query never falls through to the
+# grep fallback, which cannot filter.
+if [ -n "$categories" ] && [ -f "$INDEX" ] && command -v jq >/dev/null 2>&1; then
+    if shards=$(category_shards); then
+        sources=()
+        while IFS= read -r shard; do
+            [ -f "$shard" ] && sources+=("$shard")
+        done <<< "$shards"
+    else
+        sources=("$INDEX")
+    fi
+    if [ ${#sources[@]} -gt 0 ]; then
+        cat "${sources[@]}" \
+            | jq -r --arg cats "$categories" --args "$JQ_STEM$JQ_SCAN" "${keywords[@]}" 2>/dev/null \
+            | sort -t$'\t' -k3 -rn \
+            | head -20
+    fi
+    exit 0
+
+# Strategy 1a: postings sidecar + jq. Per query term: its posting list, an
+# exact-key lookup; the title / filename / heading tokens equal to it (exact
+# key), then those that merely contain it (a substring test over the token
+# keys alone — 1b tests substrings of the full text, and a term is a substring
+# of the text exactly when it is one of a token). Only pages hit by some term
+# are scored, with the same arithmetic in the same order as 1b. Cost per query:
+# jq still parses the whole sidecar (no random access into a JSON file); past
+# that, O(query terms x token vocabulary) string tests plus the hit postings,
+# independent of the number of pages and headings.
+elif [ -f "$INDEX" ] && command -v jq >/dev/null 2>&1 && postings_current; then
+    results=$(jq -r --args "$JQ_STEM"'
+        def hits($table; $t):
+          [ ($table[$t] // [])[],
+            ($table | keys_unsorted[] | select(. != $t and contains($t)) | $table[.][]) ];
+        def set: map({key: tostring, value: true}) | from_entries;
+        ($ARGS.positional | map(stem)) as $q
+        | .pages as $pages
+        | [ $q[] as $t
+            | { title: (hits(.title_tokens; $t) | set),
+                fn: (hits(.filename_tokens; $t) | set),
+                head: (hits(.heading_tokens; $t) | unique | group_by(.[0])
+                       | map({key: (.[0][0] | tostring), value: length}) | from_entries),
+                w: ([.terms[$t][]?] | map({key: (.[0] | tostring), value: .[2]}) | from_entries) }
+          ] as $hits
+        | ([ $hits[] | (.title, .fn, .head, .w) | keys[] ] | unique)[] as $c
+        | ( [ $hits[] as $h
+              | (if $h.title[$c] then 10 else 0 end)
+              + (if $h.fn[$c] then 10 else 0 end)
+              + ((($h.head[$c] // 0) | if . > 3 then 3 else . end) * 3)
+              + ($h.w[$c] // 0)
             ] | add ) as $score
         | select($score > 0)
-        | [$p.filename, ($p.title // ""), ($score|tostring)] | @tsv
-    ' "${keywords[@]}" < "$INDEX" 2>/dev/null \
+        | $pages[$c | tonumber] as $p
+        | [$p[0], $p[1], ($score|tostring)] | @tsv
+    ' "${keywords[@]}" < "$POSTINGS" 2>/dev/null \
+        | sort -t$'\t' -k3 -rn \
+        | head -20)
+
+    if [ -n "$results" ]; then
+        printf '%s\n' "$results"
+        exit 0
+    fi
+# Strategy 1b: v2 index + jq, every page record scanned.
+elif [ -f "$INDEX" ] && command -v jq >/dev/null 2>&1; then
+    results=$(jq -r --arg cats "" --args "$JQ_STEM$JQ_SCAN" "${keywords[@]}" < "$INDEX" 2>/dev/null \
         | sort -t$'\t' -k3 -rn \
         | head -20)
 
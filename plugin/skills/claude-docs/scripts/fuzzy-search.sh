@@ -3,7 +3,9 @@
 # Usage: fuzzy-search.sh <query>
 #
 # Reads filenames + titles from paths_manifest.json (not the cache), so it works
-# before any page is fetched. Output: ranked filenames (top 10), one per line.
+# before any page is fetched — via its TSV companion (paths_manifest.tsv) when that
+# carries the same content_hash, so no JSON parse. Output: ranked filenames (top
+# 10), one per line.
 
 set -uo pipefail
 trap '' PIPE
@@ -11,6 +13,9 @@ trap '' PIPE
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]:-$0}")" && pwd)"
 CLONE_ROOT="$(cd "$SCRIPT_DIR/../../../.." && pwd)"
 MANIFEST="${CLAUDE_DOCS_MANIFEST:-$CLONE_ROOT/paths_manifest.json}"
+COMPANION="${MANIFEST%.json}.tsv"
+# manifest_content_hash, companion_current (shared with fetch-docs.sh)
+. "$CLONE_ROOT/plugin/scripts/manifest-lib.sh" || exit 1
 
 if [ $# -eq 0 ]; then
     echo "Usage: fuzzy-search.sh <query>" >&2
@@ -20,12 +25,20 @@ fi
 query=$(printf '%s' "$*" | tr '[:upper:]' '[:lower:]' | sed 's/[^a-z0-9 -]//g' | xargs)
 [ -n "$query" ] || { echo "No valid query provided" >&2; exit 1; }
 [ -f "$MANIFEST" ] || { echo "Manifest not found: $MANIFEST" >&2; exit 1; }
-command -v jq >/dev/null 2>&1 || { echo "jq is required" >&2; exit 1; }
-# Validate the manifest BEFORE the pipeline: a malformed/truncated manifest must
-# fail loudly here, not surface as "no results, exit 0". (jq -e alone is not
-# enough — jq 1.6 exits 0 on empty input; the type test rejects that too.)
-[ "$(jq -r '.pages | type' "$MANIFEST" 2>/dev/null)" = "array" ] \
-    || { echo "Manifest has no .pages array (malformed?): $MANIFEST" >&2; exit 1; }
+
+# filename<TAB>title rows. The companion is trusted only while its header names the
+# manifest's content_hash (companion_current); otherwise jq reads the JSON.
+if companion_current; then
+    page_rows() { awk -F'\t' '!/^#/ { print $1 "\t" ($7 == "-" ? "" : $7) }' "$COMPANION"; }
+else
+    command -v jq >/dev/null 2>&1 || { echo "jq is required" >&2; exit 1; }
+    # Validate the manifest BEFORE the pipeline: a malformed/truncated manifest must
+    # fail loudly here, not surface as "no results, exit 0". (jq -e alone is not
+    # enough — jq 1.6 exits 0 on empty input; the type test rejects that too.)
+    [ "$(jq -r '.pages | type' "$MANIFEST" 2>/dev/null)" = "array" ] \
+        || { echo "Manifest has no .pages array (malformed?): $MANIFEST" >&2; exit 1; }
+    page_rows() { jq -r '.pages[] | [.filename, (.title // "")] | @tsv' "$MANIFEST"; }
+fi
 
 # Single awk pass over the whole manifest. The old per-page shell loop forked
 # grep up to ~10 times per page (~7,000 processes, ~17s per query); awk's
@@ -36,7 +49,7 @@ command -v jq >/dev/null 2>&1 || { echo "jq is required" >&2; exit 1; }
 # 15), all-tokens bonus +50. (The old loop also scored a hyphenated variant of
 # the query against the filename, but the filename haystack has every hyphen
 # converted to a space, so that branch could never match — dropped, not ported.)
-jq -r '.pages[] | [.filename, (.title // "")] | @tsv' "$MANIFEST" \
+page_rows \
 | awk -F'\t' -v query="$query" '
     BEGIN {
         ntok = split(query, tok, " ")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+End-to-end fetcher benchmark against a local replay of the doc sites.
+
+Runs the real pipeline — ``discover_pages`` → ``fetch_pages`` (``build_page_entry``
+per page) → changelog → ``build_manifest`` — against a
+:class:`fetcher.replay.ReplayServer`, once per combination of worker count,
+5xx error rate and 429 rate, and reports wall time and throughput for each.
+Nothing touches the production hosts, so concurrency / retry settings can be
+tuned freely.
+
+Usage:
+    # synthetic corpus, production pacing
+    python scripts/bench_fetcher.py --pages 200 --workers 1,4,8
+
+    # recorded corpus, failure sweep, unthrottled pacing
+    python scripts/bench_fetcher.py --record corpus/    # once, hits production
+    python scripts/bench_fetcher.py --corpus corpus/ --rate 100 \\
+        --latency-ms 80 --error-rate 0,0.05 --throttle-rate 0,0.02 --json bench.json
+
+``--warm`` benchmarks the revalidation path instead: each scenario first runs
+cold, then is timed re-running against the first run's manifest and discovery
+cache (conditional GETs answered 304).
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+from fetcher import content
+from fetcher.cli import PageFetcher, build_changelog_entry, map_pages_to_filenames
+from fetcher.config import (
+    HOST_RATE_BURST,
+    HOST_RATE_LIMIT,
+    LLMS_TXT_URLS,
+    RETRY_BUDGET,
+    SITEMAP_URLS,
+    logger,
+)
+from fetcher.discovery import discover_pages
+from fetcher.manifest import build_manifest, pages_by_url, save_manifest
+from fetcher.replay import ReplayServer, record_corpus, synthesize_corpus
+from fetcher.report import timed
+from fetcher.source_cache import SourceCache, discovery_cache_path
+from fetcher.throttle import HostLimiter
+
+
+def _floats(raw: str) -> List[float]:
+    return [float(v) for v in raw.split(",") if v.strip()]
+
+
+def _ints(raw: str) -> List[int]:
+    return [int(v) for v in raw.split(",") if v.strip()]
+
+
+def run_pipeline(session: requests.Session, limiter: HostLimiter, workers: int,
+                 scratch: Path, old_by_url: Dict) -> Dict:
+    """One fetch run (minus safeguards and state), as ``cli.main`` sequences it."""
+    phases: Dict[str, float] = {}
+    fetch_info: Dict[str, Dict] = {}
+    cache = SourceCache.load(discovery_cache_path(scratch))
+    with PageFetcher(session, scratch, old_by_url, limiter, workers, fetch_info) as fetcher:
+        with timed(phases, "discovery"):
+            page_pairs = map_pages_to_filenames(
+                discover_pages(session, limiter, on_llms=fetcher.start, cache=cache)
+            )
+            cache.save(discovery_cache_path(scratch))
+        with timed(phases, "pages"):
+            pages = fetcher.fetch(page_pairs)
+    with timed(phases, "changelog"):
+        fetch_info["changelog.md"] = {}
+        pages.append(build_changelog_entry(session, scratch, old_by_url, limiter, fetch_info["changelog.md"]))
+    with timed(phases, "write"):
+        manifest = build_manifest(pages, list(SITEMAP_URLS) + list(LLMS_TXT_URLS))
+        save_manifest(scratch / "paths_manifest.json", manifest)
+    return {"pages": pages, "phases": phases, "manifest": manifest}
+
+
+def run_scenario(args: argparse.Namespace, corpus: Path, workers: int,
+                 error_rate: float, throttle_rate: float) -> Dict:
+    server = ReplayServer(
+        corpus,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=error_rate,
+        throttle_rate=throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    with server, tempfile.TemporaryDirectory(prefix="bench-scratch-") as tmp:
+        scratch = Path(tmp)
+
+        def limiter() -> HostLimiter:
+            return HostLimiter(args.rate, HOST_RATE_BURST, max_concurrency=workers,
+                               retry_budget=args.retry_budget)
+
+        old_by_url: Dict = {}
+        pool_size = max(workers, len(SITEMAP_URLS) + len(LLMS_TXT_URLS))  # as cli.main sizes it
+        with server.session(pool_maxsize=pool_size) as session:
+            if args.warm:
+                old_by_url = pages_by_url(run_pipeline(session, limiter(), workers, scratch, {})["manifest"])
+                for key in server.stats:
+                    server.stats[key] = 0
+            run_limiter = limiter()
+            started = time.monotonic()
+            result = run_pipeline(session, run_limiter, workers, scratch, old_by_url)
+            wall = time.monotonic() - started
+
+    statuses = {"ok": 0, "stale": 0, "failed": 0}
+    for entry in result["pages"]:
+        statuses[entry["fetch_status"]] += 1
+    metrics = run_limiter.metrics()
+    return {
+        "workers": workers,
+        "error_rate": error_rate,
+        "throttle_rate": throttle_rate,
+        "wall_s": round(wall, 3),
+        "pages_per_s": round(len(result["pages"]) / wall, 2) if wall else None,
+        "pages": len(result["pages"]),
+        **statuses,
+        "phases": {k: round(v, 3) for k, v in result["phases"].items()},
+        "server": dict(server.stats),
+        "retries": run_limiter.retries.spent,
+        "throttle_events": sum(m["throttle_events"] for m in metrics.values()),
+        "hosts": metrics,
+    }
+
+
+def _print_table(results: List[Dict]) -> None:
+    header = (f"{'workers':>7} {'err%':>5} {'429%':>5} {'wall_s':>8} {'pages/s':>8} "
+              f"{'ok':>5} {'stale':>5} {'fail':>5} {'reqs':>6} {'5xx':>5} {'429':>5} {'retries':>7}")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['workers']:>7} {r['error_rate'] * 100:>5g} {r['throttle_rate'] * 100:>5g} "
+              f"{r['wall_s']:>8.2f} {r['pages_per_s'] or 0:>8.2f} {r['ok']:>5} {r['stale']:>5} "
+              f"{r['failed']:>5} {r['server']['requests']:>6} {r['server']['errors']:>5} "
+              f"{r['server']['throttled']:>5} {r['retries']:>7}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, help="Recorded corpus dir (default: synthesize one)")
+    parser.add_argument("--record", type=Path, metavar="DIR",
+                        help="Record the live sites into DIR and exit (hits production!)")
+    parser.add_argument("--pages", type=int, default=200, help="Synthetic corpus size (default: 200)")
+    parser.add_argument("--workers", type=_ints, default=[1, 4, 8], help="Comma list (default: 1,4,8)")
+    parser.add_argument("--error-rate", type=_floats, default=[0.0], help="Comma list of 503 probabilities")
+    parser.add_argument("--throttle-rate", type=_floats, default=[0.0], help="Comma list of 429 probabilities")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After on injected 429s (whole seconds)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Per-response latency (default: 50)")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Extra random latency, 0..N ms")
+    parser.add_argument("--rate", type=float, default=HOST_RATE_LIMIT,
+                        help=f"Per-host req/s ceiling (default: production {HOST_RATE_LIMIT:g})")
+    parser.add_argument("--retry-budget", type=int, default=RETRY_BUDGET)
+    parser.add_argument("--retry-delay", type=float, default=None,
+                        help="Override the initial backoff delay (fetcher.content.RETRY_DELAY)")
+    parser.add_argument("--warm", action="store_true", help="Time a revalidation run (304s) instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="Also write the results as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Keep the fetcher's INFO log")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logger.setLevel(logging.WARNING)
+    if args.retry_delay is not None:
+        content.RETRY_DELAY = args.retry_delay
+
+    if args.record:
+        with requests.Session() as session:
+            record_corpus(args.record, session)
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="bench-corpus-") as tmp:
+        corpus = args.corpus
+        if corpus is None:
+            corpus = Path(tmp)
+            synthesize_corpus(corpus, args.pages)
+        results = [
+            run_scenario(args, corpus, workers, error_rate, throttle_rate)
+            for workers, error_rate, throttle_rate
+            in itertools.product(args.workers, args.error_rate, args.throttle_rate)
+        ]
+
+    _print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,15 +2,26 @@
 """
 Build the v2 search index (prose-free) from the fetch scratch dir + manifest.
 
-Output: repo-root ``search_index.json``. Per page::
+Output: repo-root ``search_index.json`` — ``schema_version``, ``generated_at``,
+``content_hash`` (sha256 of everything but the timestamp; the file is left
+untouched when it already matches), ``bm25`` (collection statistics, see
+:func:`bm25_stats`) and ``pages``. Per page::
 
     { "filename": "claude-code__hooks.md", "id": "claude-code/hooks",
       "title": "Hooks", "category": "claude_code",
       "url": "https://code.claude.com/docs/en/hooks",
+      "sha256": "...",   # of the body the record was built from; null if none
       "headings": [ {"text": "Configuration", "level": 2}, ... ],  # anchor = slugify(text), not stored
       "terms": { "hook": 12, "matcher": 5, ... },   # stemmed word -> frequency, capped
       "word_count": 1234 }
 
+Beside it, ``search_index.postings.json`` (:func:`build_postings`): the same data
+inverted — term -> ``[page ordinal, freq, BM25 weight]`` postings and token
+tables for titles, filenames and headings — so a query reads only its own
+terms' entries and adds up weights computed here. ``search_shards/`` holds one
+index per category plus ``catalog.json`` (:func:`build_shards`), so a query
+filtered by category reads only those pages.
+
 FORBIDDEN (spec): ``content_preview``, sentence fragments, token positions,
 n-grams, or any absolute ``file_path`` — nothing from which prose can be
 reconstructed. Only titles, headings, and a capped bag of stemmed word counts.
@@ -20,25 +31,47 @@ terms / word_count come from the fetched ``.md`` content in the scratch dir. A
 manifest page whose content is missing (fetch failed/stale) is still indexed by
 title so it stays findable.
 
-STEMMING CONTRACT (must be mirrored EXACTLY on the shell query side, B3):
-strip the first matching suffix from the ordered list ("ing", "ed", "es", "s")
-only if at least 3 characters remain; casefold first; applied AFTER stop-word
-filtering. B6 cross-checks the Python and shell implementations over a word list.
+When the fetcher ran its fused index stage (``DOCS_INDEX_RECORDS=1``, see
+``fetcher/index_records.py``) the scratch dir also holds ``index_records.json``:
+headings / terms / word_count per page, computed from the bytes as they were
+fetched. A record whose sha256 matches the manifest entry is used as is, and the
+page's ``.md`` is never read here. Failing that, the committed index's own record
+is reused while its ``sha256`` matches; only new and changed pages fall back to
+the scratch file.
+
+The page analysis itself (headings, term bags, sections, and the STEMMING
+CONTRACT the shell query side mirrors) lives in ``fetcher/analysis.py``, shared
+with the fetcher's fused index stage; its public names are re-exported here.
 """
 
+import hashlib
 import json
 import math
 import os
 import re
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+from fetcher.analysis import (  # noqa: F401  (re-exported)
+    ANALYZER_VERSION,
+    MAX_TERMS,
+    STOP_WORDS,
+    analyze_content,
+    analyze_sections,
+    extract_headings,
+    extract_terms,
+    section_hash,
+    slugify,
+    split_sections,
+    stem,
+)
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 INDEX_SCHEMA_VERSION = 2
-MAX_TERMS = 50
 # Minimum fraction of indexed pages that must carry non-empty terms; below this
 # the build refuses to overwrite the committed index (partial-outage guard).
 DEFAULT_MIN_CONTENT_SHARE = 0.90
@@ -49,86 +82,46 @@ DEFAULT_MIN_CONTENT_SHARE = 0.90
 # index silently. Majority-fresh by default; DOCS_INDEX_MAX_CARRY_SHARE=1
 # disables (a share can never exceed 1).
 DEFAULT_MAX_CARRY_SHARE = 0.50
-
-STOP_WORDS = {
-    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-    'to', 'was', 'will', 'with', 'or', 'but', 'not', 'can', 'this',
-    'we', 'you', 'all', 'if', 'have', 'do', 'use', 'your', 'how',
-    'when', 'which', 'what', 'they', 'their', 'them', 'these', 'those',
-    'there', 'then', 'than', 'into', 'out', 'over', 'more', 'may',
-}
-
-_SUFFIXES = ("ing", "ed", "es", "s")
-_MIN_STEM = 3
-
-
-def stem(word: str) -> str:
-    """Light suffix stemmer — see the STEMMING CONTRACT in the module docstring."""
-    w = word.lower()
-    for suffix in _SUFFIXES:
-        if w.endswith(suffix) and len(w) - len(suffix) >= _MIN_STEM:
-            return w[: -len(suffix)]
-    return w
-
-
-def slugify(text: str) -> str:
-    """GitHub-style heading anchor: lowercase, non-alphanumerics → '-', collapsed."""
-    s = text.lower()
-    s = re.sub(r"[^a-z0-9\s-]", "", s)
-    s = re.sub(r"[\s-]+", "-", s)
-    return s.strip("-")
-
-
-def _strip_code_blocks(content: str) -> str:
-    """Remove fenced code blocks so their contents don't pollute headings/terms."""
-    return re.sub(r"```[\s\S]*?```", " ", content)
-
-
-def extract_headings(content: str) -> List[Dict]:
+# Processes that read + tokenize scratch pages (DOCS_INDEX_WORKERS; 1 = serial,
+# in-process). The output is identical either way; only wall time changes.
+DEFAULT_INDEX_WORKERS = min(8, os.cpu_count() or 1)
+# Written into the scratch dir by the fetcher (scripts/fetcher/store.py): the
+# scratch files whose content the last fetch run changed.
+SCRATCH_JOURNAL_FILE = "scratch_journal.json"
+# Also written by the fetcher (scripts/fetcher/index_records.py), when enabled.
+INDEX_RECORDS_FILE = "index_records.json"
+POSTINGS_SCHEMA_VERSION = 2
+# Okapi BM25 parameters; term weights are rounded to BM25_DECIMALS places so
+# the shell's scan fallback can reproduce them exactly (floor(x * 10^d + 0.5)).
+BM25_K1 = 1.2
+BM25_B = 0.75
+BM25_DECIMALS = 4
+# Per-category copies of the index, beside it (see build_shards).
+SHARD_DIR = "search_shards"
+SHARD_CATALOG_FILE = "catalog.json"
+SHARD_CATALOG_SCHEMA_VERSION = 1
+
+
+def index_page(
+    entry: Dict, content: str, analysis: Optional[Dict] = None, sha256: Optional[str] = None
+) -> Dict:
     """
-    Extract markdown headings (levels 1-6) as ``{text, level}``, excluding code blocks.
-
-    Anchors are intentionally NOT stored: ``anchor == slugify(text)`` deterministically,
-    so a consumer that needs a deep-link fragment recomputes it. Storing them doubled
-    the heading payload (~435 KB on 725 pages) for zero added information.
+    Build one index record from a manifest entry + (possibly empty) content, or
+    from a precomputed ``analysis`` (an :func:`analyze_content` result).
+    ``sha256`` is the hash of the page body the analysis came from (None when
+    there was none); the next build reuses the record while it matches.
     """
-    body = _strip_code_blocks(content)
-    headings = []
-    for match in re.finditer(r"^(#{1,6})\s+(.+?)\s*#*\s*$", body, re.MULTILINE):
-        text = match.group(2).strip()
-        if not text:
-            continue
-        headings.append({"text": text, "level": len(match.group(1))})
-    return headings
-
-
-def extract_terms(content: str, cap: int = MAX_TERMS) -> Dict[str, int]:
-    """Extract a capped bag of stemmed word frequencies (stop-words removed)."""
-    text = _strip_code_blocks(content)
-    text = re.sub(r"`[^`]+`", " ", text)                       # inline code
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)       # links -> link text
-    text = re.sub(r"[^a-zA-Z\s]", " ", text)                   # drop non-alpha
-
-    counter: Counter = Counter()
-    for raw in re.findall(r"\b[a-z]{3,}\b", text.lower()):
-        if raw in STOP_WORDS:
-            continue
-        counter[stem(raw)] += 1
-    return dict(counter.most_common(cap))
-
-
-def index_page(entry: Dict, content: str) -> Dict:
-    """Build one index record from a manifest entry + (possibly empty) content."""
+    analysis = analysis if analysis is not None else analyze_content(content)
     return {
         "filename": entry["filename"],
         "id": entry.get("id", entry["filename"]),
         "title": entry.get("title") or "Untitled",
         "category": entry.get("category", "core_documentation"),
         "url": entry.get("url", ""),
-        "headings": extract_headings(content) if content else [],
-        "terms": extract_terms(content) if content else {},
-        "word_count": len(content.split()) if content else 0,
+        "sha256": sha256,
+        "headings": analysis["headings"],
+        "terms": analysis["terms"],
+        "word_count": analysis["word_count"],
     }
 
 
@@ -139,26 +132,111 @@ def _record_has_content(record: Optional[Dict]) -> bool:
     return bool(record.get("terms") or record.get("headings") or record.get("word_count"))
 
 
+def read_existing_index(path: Path) -> Dict:
+    """
+    The committed search index as a dict, or ``{}`` when it is missing or
+    unreadable — carry-forward is then simply unavailable (the content-share
+    guard still protects the write).
+    """
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        print(f"  ! could not read existing index {path}: {e}", file=sys.stderr)
+        return {}
+
+
+def index_pages_by_filename(index: Dict) -> Dict[str, Dict]:
+    """An index's page records keyed by filename."""
+    return {p["filename"]: p for p in index.get("pages", []) if p.get("filename")}
+
+
 def load_existing_index(path: Path) -> Dict[str, Dict]:
+    """Load the committed search index (if any) keyed by filename, for carry-forward."""
+    return index_pages_by_filename(read_existing_index(path))
+
+
+def load_scratch_journal(scratch_dir: Path) -> Optional[Set[str]]:
+    """
+    Filenames the last fetch run wrote new content for, or ``None`` if unknown.
+
+    ``None`` (no journal: a scratch dir from an older fetcher, or an unreadable
+    file) means "treat every entry as possibly new" — never "nothing changed".
     """
-    Load the committed search index (if any) keyed by filename, for carry-forward.
+    path = scratch_dir / SCRATCH_JOURNAL_FILE
+    if not path.exists():
+        return None
+    try:
+        return set(json.loads(path.read_text())["new"])
+    except Exception as e:
+        print(f"  ! could not read scratch journal {path}: {e}", file=sys.stderr)
+        return None
 
-    A missing or unreadable index yields ``{}`` — carry-forward is then simply
-    unavailable (the content-share guard still protects the write).
+
+def load_index_records(scratch_dir: Path) -> Dict[str, Dict]:
+    """
+    The fetcher's precomputed per-page analyses (filename -> record with
+    ``sha256``), or ``{}`` when the fused stage did not run, the file is
+    unreadable or it was written by another ``ANALYZER_VERSION`` — every page
+    then falls back to its scratch ``.md``.
     """
+    path = scratch_dir / INDEX_RECORDS_FILE
     if not path.exists():
         return {}
     try:
         data = json.loads(path.read_text())
-        return {p["filename"]: p for p in data.get("pages", []) if p.get("filename")}
+        if data.get("analyzer_version") != ANALYZER_VERSION:
+            print(f"  ~ ignoring index records {path} from another analyzer version")
+            return {}
+        return dict(data["records"])
     except Exception as e:
-        print(f"  ! could not read existing index {path}: {e}", file=sys.stderr)
+        print(f"  ! could not read index records {path}: {e}", file=sys.stderr)
         return {}
 
 
+def _scratch_analysis(md_path: str) -> Tuple[bool, Optional[Dict], Optional[str], Optional[str]]:
+    """
+    Read and analyze one scratch file: ``(read, analysis, sha256, error)``.
+
+    ``read`` is False for a missing or unreadable file (``error`` says why for
+    the latter); ``analysis`` is None when there is no content. ``sha256`` is
+    the hash of the bytes analyzed — what the record is stamped with, which is
+    not always the manifest's (a stale page's scratch copy). Module-level and
+    print-free so a worker process can run it and the caller reports in order.
+    """
+    path = Path(md_path)
+    if not path.exists():
+        return False, None, None, None
+    try:
+        raw = path.read_bytes()
+    except Exception as e:
+        return False, None, None, f"could not read {path}: {e}"
+    # Same text read_text(errors="ignore") gives, universal newlines included.
+    content = raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    return True, (analyze_content(content) if content else None), hashlib.sha256(raw).hexdigest(), None
+
+
+def _scratch_analyses(paths: List[str], workers: int) -> List[Tuple]:
+    """:func:`_scratch_analysis` for each path, in order — on a process pool when
+    ``workers`` > 1 and there is more than one file, else in this process."""
+    if workers <= 1 or len(paths) < 2:
+        return [_scratch_analysis(path) for path in paths]
+    workers = min(workers, len(paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_scratch_analysis, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+
 def build_index(
-    manifest: Dict, scratch_dir: Path, old_pages: Optional[Dict[str, Dict]] = None
-) -> "tuple[Dict, int]":
+    manifest: Dict,
+    scratch_dir: Path,
+    old_pages: Optional[Dict[str, Dict]] = None,
+    new_files: Optional[Set[str]] = None,
+    records: Optional[Dict[str, Dict]] = None,
+    workers: int = 1,
+    reuse_old: bool = True,
+) -> Tuple[Dict, int]:
     """
     Build the full v2 index from a manifest and the scratch content dir.
 
@@ -168,29 +246,68 @@ def build_index(
     empty record — the index-side mirror of the manifest's ``fetch_status: stale``
     carry-forward.
 
+    ``new_files`` (see :func:`load_scratch_journal`) only feeds the summary line.
+
+    ``records`` (see :func:`load_index_records`) supplies a page's analysis
+    without reading its scratch file, when the record's sha256 is the entry's.
+    An old index record with that sha256 is reused the same way, unless
+    ``reuse_old`` is False (``old_pages`` came from another ``ANALYZER_VERSION``
+    and serve only for carry-forward). Either applies only to an entry whose
+    ``fetch_status`` is ``"ok"``: a stale page's record is not confirmed by this
+    run, so it goes through the scratch file and, without one, counts as carried.
+
+    ``workers`` > 1 reads and tokenizes the remaining scratch files on a process
+    pool; results are consumed in manifest order, so the index, the counts and
+    the log lines are the same as the serial build's.
+
     Returns ``(index, carried)`` — the carried count feeds the carry-share
     ceiling (:func:`check_carry_share`), which cannot be recomputed from the
     index alone (a carried record is indistinguishable from a fresh one).
     """
     old_pages = old_pages or {}
+    records = records or {}
+    entries = manifest.get("pages", [])
+
+    def known_analysis(entry: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+        """A fetcher record or an old index record built from this entry's sha256."""
+        sha256 = entry.get("sha256")
+        if not sha256 or entry.get("fetch_status") != "ok":
+            return None, None
+        record = records.get(entry["filename"])
+        if record and record.get("sha256") == sha256:
+            return record, "precomputed"
+        old = old_pages.get(entry["filename"]) if reuse_old else None
+        if old and old.get("sha256") == sha256:
+            return old, "reused"
+        return None, None
+
+    to_read = [str(scratch_dir / e["filename"]) for e in entries if known_analysis(e)[0] is None]
+    analyses = iter(_scratch_analyses(to_read, workers))
+
     pages = []
     with_content = 0
     carried = 0
-    for entry in manifest.get("pages", []):
-        md_path = scratch_dir / entry["filename"]
-        content = ""
-        if md_path.exists():
-            try:
-                content = md_path.read_text(encoding="utf-8", errors="ignore")
-                with_content += 1
-            except Exception as e:
-                print(f"  ! could not read {md_path}: {e}", file=sys.stderr)
-
-        page = index_page(entry, content)
-        if not content:
+    known = {"precomputed": 0, "reused": 0}
+    for entry in entries:
+        record, source = known_analysis(entry)
+        if record is not None:
+            pages.append(index_page(entry, "", record, entry["sha256"]))
+            with_content += 1
+            known[source] += 1
+            continue
+        read, analysis, sha256, error = next(analyses)
+        if error:
+            print(f"  ! {error}", file=sys.stderr)
+        if read:
+            with_content += 1
+
+        page = index_page(entry, "", analysis, sha256)
+        if analysis is None:
             old = old_pages.get(entry["filename"])
             if _record_has_content(old):
                 # Carry forward the old search data; metadata stays manifest-fresh.
+                # The sha256 stays the one that data was built from.
+                page["sha256"] = old.get("sha256")
                 page["headings"] = old.get("headings", [])
                 page["terms"] = old.get("terms", {})
                 page["word_count"] = old.get("word_count", 0)
@@ -198,18 +315,78 @@ def build_index(
                 print(f"  ~ carried forward search data for {entry['filename']} (scratch file missing)")
         pages.append(page)
 
+    fresh = ""
+    if new_files is not None:
+        listed = {entry["filename"] for entry in entries}
+        fresh = f", {len(new_files & listed)} new this fetch run"
+    precomputed = f", {known['precomputed']} from fetcher records" if records else ""
     print(
-        f"Indexed {len(pages)} pages ({with_content} with content, "
-        f"{carried} carried forward) from {scratch_dir}"
+        f"Indexed {len(pages)} pages ({with_content} with content{precomputed}, "
+        f"{known['reused']} unchanged since the last index, {carried} carried forward{fresh}) "
+        f"from {scratch_dir}"
     )
     index = {
         "schema_version": INDEX_SCHEMA_VERSION,
         "generated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "content_hash": None,
+        "analyzer_version": ANALYZER_VERSION,
+        "bm25": bm25_stats(pages),
         "pages": pages,
     }
+    index["content_hash"] = index_content_hash(index)
     return index, carried
 
 
+def bm25_stats(pages: List[Dict]) -> Dict:
+    """
+    Collection statistics for Okapi BM25 over the capped term bags::
+
+        {"k1": 1.2, "b": 0.75, "pages": N, "avgdl": 812.4,
+         "df": {"hook": 37, ...}}   # pages whose bag holds the term
+
+    ``avgdl`` is the mean ``word_count`` of the pages that have one. ``df``
+    counts the capped bags, so a term outside a page's top :data:`MAX_TERMS`
+    does not count for that page — the same view the scorer has of ``tf``.
+    """
+    df: Counter = Counter()
+    lengths = []
+    for page in pages:
+        df.update(page.get("terms", {}).keys())
+        if page.get("word_count"):
+            lengths.append(page["word_count"])
+    return {
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "pages": len(pages),
+        "avgdl": sum(lengths) / len(lengths) if lengths else 1.0,
+        "df": dict(sorted(df.items())),
+    }
+
+
+def bm25_weight(tf: int, dl: int, df: int, stats: Dict) -> float:
+    """
+    BM25 weight of a term with frequency ``tf`` in a page of ``dl`` words that
+    ``df`` pages contain: ``idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))``
+    with the non-negative ``idf = ln(1 + (N - df + 0.5) / (df + 0.5))``.
+
+    ``content-search.sh`` evaluates the same expression, operation for
+    operation, when it has to score without the postings sidecar; keep the two
+    in step.
+    """
+    k1, b = stats["k1"], stats["b"]
+    idf = math.log(1 + (stats["pages"] - df + 0.5) / (df + 0.5))
+    weight = idf * (tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / stats["avgdl"])))
+    scale = 10 ** BM25_DECIMALS
+    return math.floor(weight * scale + 0.5) / scale
+
+
+def index_content_hash(index: Dict) -> str:
+    """sha256 of the index's canonical JSON, minus ``generated_at`` / ``content_hash``."""
+    content = {k: v for k, v in index.items() if k not in ("generated_at", "content_hash")}
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 def check_content_share(index: Dict, min_share: float) -> None:
     """
     Guard: refuse an index where too few pages have real terms.
@@ -286,10 +463,226 @@ def _parse_env_number(name: str, default, cast, disable: str = "0"):
         sys.exit(1)
 
 
-def save_index(index: Dict, path: Path) -> None:
+def _parse_worker_count(name: str, default: int) -> int:
+    """
+    Parse a process count from the environment: unset or empty falls back to
+    the default; anything but a positive integer exits with a clear error.
+    """
+    raw = os.environ.get(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        value = int(raw)
+        if value < 1:
+            raise ValueError
+        return value
+    except ValueError:
+        print(
+            f"ERROR: invalid {name}={raw!r}: must be a positive number of processes "
+            f"(e.g. {name}={default}; set {name}=1 for a serial, in-process build).",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+
+def save_index(index: Dict, path: Path) -> bool:
+    """
+    Write the index — unless ``path`` already records the same ``content_hash``
+    (then ``generated_at`` stays the time the content last changed). Returns
+    True if written.
+    """
+    content_hash = index.get("content_hash")
+    if content_hash and _stored_content_hash(path) == content_hash:
+        print(f"Search index unchanged (content_hash {content_hash[:12]}); left {path} as is")
+        return False
     path.write_text(json.dumps(index, indent=2) + "\n")
     size_kb = path.stat().st_size / 1024
     print(f"Wrote v2 search index: {len(index['pages'])} pages, {size_kb:.1f} KB -> {path}")
+    return True
+
+
+def _stored_content_hash(path: Path) -> Optional[str]:
+    try:
+        return json.loads(path.read_text()).get("content_hash")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+_QUERY_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _match_tokens(text: str) -> Set[str]:
+    """
+    The alphanumeric runs of ``text`` after an ASCII-only lowercase (jq's
+    ``ascii_downcase``). A query term is ``[a-z0-9]+``, so it is a substring of
+    ``text`` exactly when it is a substring of one of these runs.
+    """
+    return set(_QUERY_TOKEN.findall(text.translate(_ASCII_LOWER)))
+
+
+def postings_path(index_path: Path) -> Path:
+    """The inverted-index sidecar beside an index (``search_index.postings.json``)."""
+    return index_path.with_name(index_path.stem + ".postings.json")
+
+
+def build_postings(index: Dict) -> Dict:
+    """
+    Inverted view of ``index`` for ``content-search.sh``; pages are referred to by
+    their ordinal in ``index["pages"]``::
+
+        { "schema_version": 2, "content_hash": "<the index's>",
+          "pages": [["claude-code__hooks.md", "Hooks"], ...],
+          "terms": {"hook": [[ordinal, freq, weight], ...]}, # the capped term bags
+          "filename_tokens": {"hooks": [ordinal, ...]},
+          "title_tokens": {"hooks": [ordinal, ...]},
+          "heading_tokens": {"matcher": [[ordinal, heading], ...]} }
+
+    Token tables hold :func:`_match_tokens` of each filename, title and heading
+    (``heading`` is its position in the page's ``headings``), so the shell's
+    substring tests run over the vocabulary instead of every page. ``weight``
+    is :func:`bm25_weight` under the index's ``bm25`` statistics (computed here
+    for an index that predates them). No positions in the text, nothing beyond
+    what the index already holds.
+    """
+    pages_in = index.get("pages", [])
+    stats = index.get("bm25") or bm25_stats(pages_in)
+    df = stats["df"]
+    terms: Dict[str, List] = {}
+    filename_tokens: Dict[str, List[int]] = {}
+    title_tokens: Dict[str, List[int]] = {}
+    heading_tokens: Dict[str, List] = {}
+    pages = []
+    for ordinal, page in enumerate(pages_in):
+        title = page.get("title") or ""
+        pages.append([page["filename"], title])
+        dl = page.get("word_count") or 0
+        for term, freq in page.get("terms", {}).items():
+            terms.setdefault(term, []).append([ordinal, freq, bm25_weight(freq, dl, df[term], stats)])
+        for token in sorted(_match_tokens(page["filename"])):
+            filename_tokens.setdefault(token, []).append(ordinal)
+        for token in sorted(_match_tokens(title)):
+            title_tokens.setdefault(token, []).append(ordinal)
+        for position, heading in enumerate(page.get("headings", [])):
+            for token in sorted(_match_tokens(heading.get("text", ""))):
+                heading_tokens.setdefault(token, []).append([ordinal, position])
+    return {
+        "schema_version": POSTINGS_SCHEMA_VERSION,
+        "content_hash": index.get("content_hash"),
+        "pages": pages,
+        "terms": dict(sorted(terms.items())),
+        "filename_tokens": dict(sorted(filename_tokens.items())),
+        "title_tokens": dict(sorted(title_tokens.items())),
+        "heading_tokens": dict(sorted(heading_tokens.items())),
+    }
+
+
+def _postings_json(postings: Dict) -> str:
+    # One line per page / term / token: valid JSON that diffs line by line.
+    def compact(value) -> str:
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+    parts = []
+    for key, value in postings.items():
+        if isinstance(value, list):
+            body = ",\n".join(compact(item) for item in value)
+            parts.append(f"{json.dumps(key)}: [\n{body}\n]" if value else f"{json.dumps(key)}: []")
+        elif isinstance(value, dict):
+            body = ",\n".join(f"{json.dumps(k)}: {compact(v)}" for k, v in value.items())
+            parts.append(f"{json.dumps(key)}: {{\n{body}\n}}" if value else f"{json.dumps(key)}: {{}}")
+        else:
+            parts.append(f"{json.dumps(key)}: {compact(value)}")
+    return "{\n" + ",\n".join(parts) + "\n}\n"
+
+
+def save_postings(postings: Dict, path: Path) -> bool:
+    """Write the postings sidecar unless the file already holds exactly this. Returns True if written."""
+    text = _postings_json(postings)
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return False
+    except OSError:
+        pass
+    path.write_text(text, encoding="utf-8")
+    print(f"Wrote postings: {len(postings['terms'])} terms, {len(text) / 1024:.1f} KB -> {path}")
+    return True
+
+
+def shard_dir(index_path: Path) -> Path:
+    """The category shard directory beside an index (``search_shards/``)."""
+    return index_path.with_name(SHARD_DIR)
+
+
+def build_shards(index: Dict) -> Tuple[Dict[str, Dict], Dict]:
+    """
+    Split ``index`` by page ``category`` into ``({file name: shard}, catalog)``.
+
+    Each shard is a v2 index of its own — ``schema_version``, ``generated_at``,
+    ``content_hash`` (:func:`index_content_hash` of the shard), ``category``,
+    ``bm25`` and ``pages`` in index order. Its ``bm25`` keeps the collection-wide
+    ``pages`` / ``avgdl`` and the ``df`` of its own terms, so a page scores the
+    same in its shard as in the full index. The catalog::
+
+        { "schema_version": 1, "content_hash": "<the index's>",
+          "shards": [{"category": "agent_sdk", "file": "agent_sdk.json",
+                      "pages": 32, "content_hash": "..."}, ...] }
+    """
+    stats = index.get("bm25") or bm25_stats(index.get("pages", []))
+    by_category: Dict[str, List[Dict]] = {}
+    for page in index.get("pages", []):
+        by_category.setdefault(page["category"], []).append(page)
+    shards: Dict[str, Dict] = {}
+    entries = []
+    for category in sorted(by_category):
+        pages = by_category[category]
+        terms = {term for page in pages for term in page.get("terms", {})}
+        shard = {
+            "schema_version": index.get("schema_version", INDEX_SCHEMA_VERSION),
+            "generated_at": index.get("generated_at"),
+            "content_hash": None,
+            "category": category,
+            "bm25": dict(stats, df={t: n for t, n in stats["df"].items() if t in terms}),
+            "pages": pages,
+        }
+        shard["content_hash"] = index_content_hash(shard)
+        name = re.sub(r"[^A-Za-z0-9_-]", "_", category) + ".json"
+        shards[name] = shard
+        entries.append({"category": category, "file": name, "pages": len(pages),
+                        "content_hash": shard["content_hash"]})
+    catalog = {
+        "schema_version": SHARD_CATALOG_SCHEMA_VERSION,
+        "content_hash": index.get("content_hash"),
+        "shards": entries,
+    }
+    return shards, catalog
+
+
+def save_shards(index: Dict, directory: Path) -> int:
+    """
+    Write :func:`build_shards` into ``directory``: each shard unless its file
+    already records the same ``content_hash``, then the catalog last, so a
+    catalog that matches the index always lists current shards. Shards of
+    categories that no longer exist are removed. Returns the number of shards
+    written.
+    """
+    shards, catalog = build_shards(index)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for name, shard in shards.items():
+        path = directory / name
+        if _stored_content_hash(path) != shard["content_hash"]:
+            path.write_text(json.dumps(shard, indent=2) + "\n")
+            written += 1
+    for path in directory.glob("*.json"):
+        if path.name != SHARD_CATALOG_FILE and path.name not in shards:
+            path.unlink()
+    text = json.dumps(catalog, indent=2) + "\n"
+    catalog_path = directory / SHARD_CATALOG_FILE
+    if not catalog_path.exists() or catalog_path.read_text() != text:
+        catalog_path.write_text(text)
+    if written:
+        print(f"Wrote {written}/{len(shards)} category shards -> {directory}")
+    return written
 
 
 def main() -> None:
@@ -310,6 +703,7 @@ def main() -> None:
         "DOCS_INDEX_MAX_CARRY_SHARE", default=DEFAULT_MAX_CARRY_SHARE, cast=float,
         disable="1",
     )
+    workers = _parse_worker_count("DOCS_INDEX_WORKERS", default=DEFAULT_INDEX_WORKERS)
 
     if not manifest_path.exists():
         print(f"ERROR: manifest not found at {manifest_path}", file=sys.stderr)
@@ -326,11 +720,21 @@ def main() -> None:
         sys.exit(1)
 
     manifest = json.loads(manifest_path.read_text())
-    old_pages = load_existing_index(index_path)
-    index, carried = build_index(manifest, scratch_dir, old_pages)
+    existing = read_existing_index(index_path)
+    reuse_old = existing.get("analyzer_version") == ANALYZER_VERSION
+    if existing and not reuse_old:
+        print("  ~ existing index was built by another analyzer version; its records are not reused")
+    new_files = load_scratch_journal(scratch_dir)
+    records = load_index_records(scratch_dir)
+    index, carried = build_index(
+        manifest, scratch_dir, index_pages_by_filename(existing), new_files, records, workers,
+        reuse_old=reuse_old,
+    )
     check_content_share(index, min_content_share)
     check_carry_share(carried, len(index["pages"]), max_carry_share)
     save_index(index, index_path)
+    save_postings(build_postings(index), postings_path(index_path))
+    save_shards(index, shard_dir(index_path))
 
 
 if __name__ == "__main__":
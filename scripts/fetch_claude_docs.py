@@ -10,6 +10,7 @@ The implementation lives in the ``fetcher`` package:
 - fetcher/discovery.py  - Union of llms.txt + sitemap into the page set
 - fetcher/paths.py      - URL → filename / category / id mapping
 - fetcher/content.py    - Verbatim .md fetching and validation
+- fetcher/throttle.py   - Per-host request pacing for the concurrent page loop
 - fetcher/manifest.py   - v2 manifest read/write
 - fetcher/safeguards.py - Discovery + manifest-transition safeguards
 - fetcher/cli.py        - Main entry point
@@ -13,6 +13,8 @@ from .config import (
     LLMS_TXT_URLS,
     MANIFEST_FILE,
     PATHS_MANIFEST_FILE,
+    MANIFEST_DELTA_DIR,
+    MANIFEST_DELTA_KEEP,
     MANIFEST_SCHEMA_VERSION,
     DEFAULT_SCRATCH_DIR,
     ALLOWED_DOMAINS,
@@ -20,10 +22,20 @@ from .config import (
     MAX_RETRIES,
     RETRY_DELAY,
     MAX_RETRY_DELAY,
+    MAX_BODY_BYTES,
     RATE_LIMIT_DELAY,
+    FETCH_WORKERS,
+    HOST_RATE_LIMIT,
+    HOST_RATE_BURST,
+    HOST_INITIAL_CONCURRENCY,
+    HOST_MAX_CONCURRENCY,
+    CIRCUIT_FAILURE_THRESHOLD,
+    RETRY_BUDGET,
+    FULL_SWEEP_EVERY,
     MIN_DISCOVERY_THRESHOLD,
     MAX_DELETION_PERCENT,
     MIN_EXPECTED_FILES,
+    MIN_DEADLINE_FLOOR,
 )
 
 from .manifest import (
@@ -31,6 +43,11 @@ from .manifest import (
     load_manifest,
     pages_by_url,
     build_manifest,
+    manifest_content_hash,
+    companion_path,
+    manifest_tsv,
+    manifest_delta,
+    prune_manifest_deltas,
     save_manifest,
 )
 
@@ -58,9 +75,70 @@ from .content import (
     validate_markdown_content,
     extract_title,
     fetch_markdown,
+    stream_markdown,
     fetch_changelog,
     save_markdown_file,
     content_has_changed,
+    scratch_copy_matches,
+)
+
+from .throttle import (
+    TokenBucket,
+    AIMDController,
+    CircuitBreaker,
+    RetryBudget,
+    HostUnavailable,
+    DeadlineReached,
+    HostLimiter,
+)
+
+from .store import (
+    ObjectStore,
+    write_scratch_journal,
+)
+
+from .schedule import (
+    fetch_order,
+    fetch_priority,
+)
+
+from .source_cache import (
+    SourceCache,
+    discovery_cache_path,
+)
+
+from .index_records import (
+    IndexRecords,
+    index_records_path,
+)
+
+from .analysis import (
+    analyze_content,
+    analyze_sections,
+    split_sections,
+)
+
+from .sections import page_sections
+
+from .fingerprint import (
+    canonical_markdown,
+    content_changed,
+    fingerprint,
+)
+
+from .incremental import (
+    load_fetch_state,
+    save_fetch_state,
+    is_full_sweep,
+    recheck_interval,
+    select_skippable,
+    record_history,
+)
+
+from .report import (
+    build_report,
+    write_report,
+    render_prometheus,
 )
 
 from .safeguards import (
@@ -76,6 +154,8 @@ __all__ = [
     "LLMS_TXT_URLS",
     "MANIFEST_FILE",
     "PATHS_MANIFEST_FILE",
+    "MANIFEST_DELTA_DIR",
+    "MANIFEST_DELTA_KEEP",
     "MANIFEST_SCHEMA_VERSION",
     "DEFAULT_SCRATCH_DIR",
     "ALLOWED_DOMAINS",
@@ -83,15 +163,30 @@ __all__ = [
     "MAX_RETRIES",
     "RETRY_DELAY",
     "MAX_RETRY_DELAY",
+    "MAX_BODY_BYTES",
     "RATE_LIMIT_DELAY",
+    "FETCH_WORKERS",
+    "HOST_RATE_LIMIT",
+    "HOST_RATE_BURST",
+    "HOST_INITIAL_CONCURRENCY",
+    "HOST_MAX_CONCURRENCY",
+    "CIRCUIT_FAILURE_THRESHOLD",
+    "RETRY_BUDGET",
+    "FULL_SWEEP_EVERY",
     "MIN_DISCOVERY_THRESHOLD",
     "MAX_DELETION_PERCENT",
     "MIN_EXPECTED_FILES",
+    "MIN_DEADLINE_FLOOR",
     # Manifest
     "manifest_path",
     "load_manifest",
     "pages_by_url",
     "build_manifest",
+    "manifest_content_hash",
+    "companion_path",
+    "manifest_tsv",
+    "manifest_delta",
+    "prune_manifest_deltas",
     "save_manifest",
     # Paths
     "url_to_filename",
@@ -109,9 +204,52 @@ __all__ = [
     "validate_markdown_content",
     "extract_title",
     "fetch_markdown",
+    "stream_markdown",
     "fetch_changelog",
     "save_markdown_file",
     "content_has_changed",
+    "scratch_copy_matches",
+    # Throttle
+    "TokenBucket",
+    "AIMDController",
+    "CircuitBreaker",
+    "RetryBudget",
+    "HostUnavailable",
+    "DeadlineReached",
+    "HostLimiter",
+    # Scratch object store
+    "ObjectStore",
+    "write_scratch_journal",
+    # Fetch scheduling
+    "fetch_order",
+    "fetch_priority",
+    # Discovery source cache
+    "SourceCache",
+    "discovery_cache_path",
+    # Fused index records
+    "IndexRecords",
+    "index_records_path",
+    # Search-index page analysis
+    "analyze_content",
+    "analyze_sections",
+    "split_sections",
+    # Section hashes
+    "page_sections",
+    # Normalized fingerprint
+    "canonical_markdown",
+    "content_changed",
+    "fingerprint",
+    # Incremental refresh
+    "load_fetch_state",
+    "save_fetch_state",
+    "is_full_sweep",
+    "recheck_interval",
+    "select_skippable",
+    "record_history",
+    # Run report
+    "build_report",
+    "write_report",
+    "render_prometheus",
     # Safeguards
     "validate_discovery_threshold",
     "validate_manifest_transition",
@@ -0,0 +1,203 @@
+"""
+Search-index page analysis: headings, stemmed term bags and heading sections.
+
+Shared by ``build_search_index.py`` (which tokenizes scratch pages) and the
+fetcher's fused index stage (:mod:`fetcher.index_records`, which tokenizes
+bodies as they arrive) and per-section manifest hashes (:mod:`fetcher.sections`),
+so a record, a section hash and the index all come from the same code.
+
+STEMMING CONTRACT (must be mirrored EXACTLY on the shell query side, B3):
+strip the first matching suffix from the ordered list ("ing", "ed", "es", "s")
+only if at least 3 characters remain; casefold first; applied AFTER stop-word
+filtering. B6 cross-checks the Python and shell implementations over a word list.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+# Bump on any change that alters what the analysis produces (MAX_TERMS,
+# STOP_WORDS, the stemmer, the regexes): stored index records and fetcher
+# records tagged with another version are re-analyzed instead of reused.
+# 1: whole-page term bags. 2: bags summed per heading section (analyze_sections).
+ANALYZER_VERSION = 2
+
+MAX_TERMS = 50
+# Hex digits kept of a section's key (hash of its anchor) and of its content hash.
+SECTION_KEY_HEX = 8
+SECTION_HASH_HEX = 16
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+    'to', 'was', 'will', 'with', 'or', 'but', 'not', 'can', 'this',
+    'we', 'you', 'all', 'if', 'have', 'do', 'use', 'your', 'how',
+    'when', 'which', 'what', 'they', 'their', 'them', 'these', 'those',
+    'there', 'then', 'than', 'into', 'out', 'over', 'more', 'may',
+}
+
+_SUFFIXES = ("ing", "ed", "es", "s")
+_MIN_STEM = 3
+
+
+def stem(word: str) -> str:
+    """Light suffix stemmer — see the STEMMING CONTRACT in the module docstring."""
+    w = word.lower()
+    for suffix in _SUFFIXES:
+        if w.endswith(suffix) and len(w) - len(suffix) >= _MIN_STEM:
+            return w[: -len(suffix)]
+    return w
+
+
+def slugify(text: str) -> str:
+    """GitHub-style heading anchor: lowercase, non-alphanumerics → '-', collapsed."""
+    s = text.lower()
+    s = re.sub(r"[^a-z0-9\s-]", "", s)
+    s = re.sub(r"[\s-]+", "-", s)
+    return s.strip("-")
+
+
+_CODE_BLOCK = re.compile(r"```[\s\S]*?```")
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+def _strip_code_blocks(content: str) -> str:
+    """Remove fenced code blocks so their contents don't pollute headings/terms."""
+    return _CODE_BLOCK.sub(" ", content)
+
+
+def split_sections(content: str) -> List[Tuple[str, str]]:
+    """
+    Split a page at its headings (outside code blocks) into ``(key, text)`` pairs.
+
+    A section runs from its heading line to the next heading of any level; text
+    before the first heading, if any, is a section keyed ``""``. The key is a
+    short hash of the heading's anchor (``slugify``, with GitHub's ``-1``, ``-2``
+    suffixes for repeats), so it survives edits to the section's body and
+    carries no prose. The sections' headings are exactly the page's index
+    ``headings``, in order.
+    """
+    fences = [m.span() for m in _CODE_BLOCK.finditer(content)]
+    starts = []
+    fence = 0
+    for match in _HEADING.finditer(content):
+        while fence < len(fences) and fences[fence][1] <= match.start():
+            fence += 1
+        if fence < len(fences) and fences[fence][0] <= match.start():
+            continue  # inside a code block
+        if match.group(2).strip():
+            starts.append((match.start(), slugify(match.group(2).strip())))
+
+    sections = []
+    if not starts or content[: starts[0][0]].strip():
+        sections.append(("", content[: starts[0][0]] if starts else content))
+    seen: Counter = Counter()
+    taken: Set[str] = set()
+    for n, (start, base) in enumerate(starts):
+        end = starts[n + 1][0] if n + 1 < len(starts) else len(content)
+        anchor = base
+        while anchor in taken:
+            seen[base] += 1
+            anchor = f"{base}-{seen[base]}"
+        taken.add(anchor)
+        key = hashlib.sha256(anchor.encode()).hexdigest()[:SECTION_KEY_HEX]
+        sections.append((key, content[start:end]))
+    return sections
+
+
+def section_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:SECTION_HASH_HEX]
+
+
+def extract_headings(content: str) -> List[Dict]:
+    """
+    Extract markdown headings (levels 1-6) as ``{text, level}``, excluding code blocks.
+
+    Anchors are intentionally NOT stored: ``anchor == slugify(text)`` deterministically,
+    so a consumer that needs a deep-link fragment recomputes it. Storing them doubled
+    the heading payload (~435 KB on 725 pages) for zero added information.
+    """
+    return _headings(_strip_code_blocks(content))
+
+
+def _headings(body: str) -> List[Dict]:
+    headings = []
+    for match in _HEADING.finditer(body):
+        text = match.group(2).strip()
+        if not text:
+            continue
+        headings.append({"text": text, "level": len(match.group(1))})
+    return headings
+
+
+def extract_terms(content: str, cap: int = MAX_TERMS) -> Dict[str, int]:
+    """Extract a capped bag of stemmed word frequencies (stop-words removed)."""
+    return _terms(_strip_code_blocks(content), cap)
+
+
+def _terms(text: str, cap: int = MAX_TERMS) -> Dict[str, int]:
+    return dict(_term_counts(text).most_common(cap))
+
+
+def _term_counts(text: str) -> Counter:
+    text = re.sub(r"`[^`]+`", " ", text)                       # inline code
+    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)       # links -> link text
+    text = re.sub(r"[^a-zA-Z\s]", " ", text)                   # drop non-alpha
+
+    counter: Counter = Counter()
+    for raw in re.findall(r"\b[a-z]{3,}\b", text.lower()):
+        if raw in STOP_WORDS:
+            continue
+        counter[stem(raw)] += 1
+    return counter
+
+
+def analyze_content(content: str) -> Dict:
+    """
+    ``headings`` / ``terms`` / ``word_count`` of one page, stripping code blocks
+    once for both extractors (the fetcher's fused stage calls this too).
+    """
+    if not content:
+        return {"headings": [], "terms": {}, "word_count": 0}
+    return analyze_sections(content)[0]
+
+
+def analyze_sections(
+    content: str, previous: Optional[Dict[str, Dict]] = None
+) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    :func:`analyze_content`, one :func:`split_sections` section at a time.
+
+    ``previous`` is the ``sections`` an earlier call returned for this page; a
+    section whose hash is unchanged reuses its stored analysis, so an edit to a
+    large page such as ``changelog.md`` re-tokenizes only the edited sections.
+
+    Term counts are summed per section, then capped. That is *not* always the
+    bag of the page tokenized whole: an inline-code span or a link that runs
+    across a heading pairs differently once the page is split (an unbalanced
+    backtick can hide or expose whole paragraphs). The per-section bag is the
+    definition — the index build and the fetcher's records both come from
+    here, so they always agree with each other.
+
+    Returns ``(analysis, sections)`` — ``sections`` maps section key to
+    ``{"sha256", "headings", "terms" (uncapped), "words"}``.
+    """
+    previous = previous or {}
+    headings: List[Dict] = []
+    terms: Counter = Counter()
+    words = 0
+    sections: Dict[str, Dict] = {}
+    for key, text in split_sections(content):
+        digest = section_hash(text)
+        part = previous.get(key)
+        if not part or part.get("sha256") != digest:
+            body = _strip_code_blocks(text)
+            part = {"sha256": digest, "headings": _headings(body),
+                    "terms": dict(_term_counts(body)), "words": len(text.split())}
+        sections[key] = part
+        headings += part["headings"]
+        terms.update(part["terms"])
+        words += part["words"]
+    analysis = {"headings": headings, "terms": dict(terms.most_common(MAX_TERMS)), "word_count": words}
+    return analysis, sections
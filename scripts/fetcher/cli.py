@@ -2,9 +2,9 @@
 Command-line interface for the v2 documentation fetcher.
 
 Pipeline: discover (llms.txt ∪ sitemap) → fail-fast filename-collision check →
-fetch each page's verbatim ``.md`` into an ephemeral scratch dir → hash →
-carry forward pages that fail to fetch → safeguard the transition → write the
-v2 manifest at the repo root.
+fetch each page's verbatim ``.md`` into an ephemeral scratch dir (bounded worker
+pool, paced per host) → hash → carry forward pages that fail to fetch →
+safeguard the transition → write the v2 manifest at the repo root.
 
 The scratch dir (``.doc_fetch/`` by default, ``$DOCS_SCRATCH_DIR`` to override)
 is gitignored and never committed — its only jobs are to hold content for
@@ -14,19 +14,48 @@ never written, so a full run leaves ``git status docs/`` clean.
 Set ``DOCS_FETCH_LIMIT=N`` for a fast local smoke run: it caps discovery to N
 pages, skips the count-based safeguards, and writes a throwaway
 ``paths_manifest.preview.json`` inside the scratch dir instead of the real one.
+Set ``DOCS_FETCH_WORKERS=N`` to size the page-fetch pool (``1`` = serial).
+Set ``DOCS_INDEX_RECORDS=1`` to analyze each page for the search index as it
+is fetched (:mod:`fetcher.index_records`), so ``build_search_index.py`` need
+not re-read the scratch dir.
+Set ``DOCS_FETCH_DEADLINE=SECONDS`` to bound the run: once that much time has
+passed since start, no new page fetch, retry or Retry-After hold is started
+(the changelog included) — the remaining pages are carried forward as
+``stale`` and the run still validates and writes its manifest.
+Set ``DOCS_FETCH_MODE=incremental`` to skip pages that are evidently unchanged
+(see :mod:`fetcher.incremental`); ``DOCS_FULL_SWEEP_EVERY=N`` sets how often an
+incremental run is forced to be a full one. ``DOCS_FETCH_MODE=verify`` is a
+hash-only run: every page is fetched in full and hashed without touching the
+scratch copies, the result goes to a throwaway ``paths_manifest.verify.json``
+in scratch, and pages whose hash differs from the committed manifest are
+counted. ``DOCS_MAX_BODY_BYTES=N`` overrides the per-page size limit.
+
+Every run writes ``fetch_report.json`` into scratch (see :mod:`fetcher.report`);
+``DOCS_FETCH_REPORT_PROM=<path>`` also writes it as a Prometheus textfile.
+Scratch files are links into a content-addressed store that persists with the
+scratch dir (:mod:`fetcher.store`); ``scratch_journal.json`` names the files
+whose content the run changed. ``discovery_cache.json`` lets a run whose
+discovery sources are all unchanged skip re-parsing them
+(:mod:`fetcher.source_cache`).
 """
 
+import hashlib
 import os
 import sys
 import time
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 
 from .config import (
-    RATE_LIMIT_DELAY,
+    FETCH_WORKERS,
+    HOST_RATE_LIMIT,
+    HOST_RATE_BURST,
+    FULL_SWEEP_EVERY,
+    MAX_BODY_BYTES,
     SITEMAP_URLS,
     LLMS_TXT_URLS,
     DEFAULT_SCRATCH_DIR,
@@ -34,7 +63,12 @@ from .config import (
 )
 from .discovery import discover_pages
 from .paths import url_to_filename, page_id_from_filename, categorize_from_url
-from .content import fetch_markdown, fetch_changelog, save_markdown_file, extract_title
+from .content import (
+    stream_markdown,
+    fetch_changelog,
+    extract_title,
+    scratch_copy_matches,
+)
 from .manifest import (
     manifest_path,
     load_manifest,
@@ -42,24 +76,194 @@ from .manifest import (
     build_manifest,
     save_manifest,
 )
+from .schedule import fetch_order, fetch_priority
 from .safeguards import validate_discovery_threshold, validate_manifest_transition
+from .index_records import IndexRecords, index_records_path
+from .fingerprint import content_changed, fingerprint
+from .sections import page_sections
+from .source_cache import SourceCache, discovery_cache_path
+from .store import ObjectStore, write_scratch_journal
+from .throttle import DeadlineReached, HostLimiter, HostUnavailable
+from .report import timed, build_report, write_report, write_prometheus, report_path
+from .incremental import (
+    fetch_state_path,
+    load_fetch_state,
+    save_fetch_state,
+    is_full_sweep,
+    select_skippable,
+    record_history,
+)
 
 CHANGELOG_URL = "https://github.com/anthropics/claude-code/blob/main/CHANGELOG.md"
 CHANGELOG_MD_URL = "https://raw.githubusercontent.com/anthropics/claude-code/main/CHANGELOG.md"
 
 
+def revalidation_validators(prev: Optional[Dict], scratch: Path, filename: str) -> Optional[Dict]:
+    """
+    Validators for a conditional GET of ``filename``, or ``None`` to fetch in full.
+
+    A 304 means "keep the copy you have", so asking is only safe when that copy
+    exists: the previous entry must carry an ``etag`` / ``last_modified`` and a
+    sha256, and the scratch file must still hash to that sha256 (a scratch dir
+    restored from an earlier run, not a fresh checkout or a partial overwrite).
+    Otherwise the index build would be left without content for the page.
+    """
+    if not prev or not (prev.get("etag") or prev.get("last_modified")):
+        return None
+    if not scratch_copy_matches(scratch, filename, prev.get("sha256")):
+        return None
+    return {"etag": prev.get("etag"), "last_modified": prev.get("last_modified")}
+
+
+def _buffered_result(scratch: Path, filename: str, content: bytes, hash_only: bool) -> Dict:
+    """Shape an in-memory body (the changelog) like a :func:`stream_markdown` result."""
+    changed = False
+    if hash_only:
+        sha256 = hashlib.sha256(content).hexdigest()
+    else:
+        store = ObjectStore(scratch)
+        sha256 = store.add_bytes(content)
+        changed = store.link(filename, sha256)
+        logger.info(f"Saved: {filename}")
+    return {"sha256": sha256, "bytes": len(content), "title": extract_title(content),
+            "changed": changed, "body": content}
+
+
+def _apply_fetch(
+    entry: Dict, result: Optional[Dict], prev: Optional[Dict], scratch: Path, info: Dict,
+    hash_only: bool = False,
+) -> None:
+    """
+    Fill ``entry`` from a fetched body's ``{sha256, bytes, title, changed[, body]}``
+    or a 304 (``None``).
+
+    ``fingerprint`` / ``sections`` need the whole body: the captured one when
+    the result carries it, else the previous entry's when the bytes are the
+    same, else the scratch copy just written — so without a capture only a
+    changed page is ever read whole, and only briefly. A hash-only (verify)
+    fetch wrote nothing, so a changed page gets none.
+    """
+    if result is None:
+        # Not modified: the scratch copy was verified against prev["sha256"]
+        # before asking, so the previous hash/title ARE this run's result.
+        entry["sha256"] = prev["sha256"]
+        _carry_derived(entry, prev, scratch)
+        entry["title"] = entry["title"] or prev.get("title")
+        info["not_modified"] = True
+        info["bytes_saved"] = (scratch / entry["filename"]).stat().st_size
+        fallback = prev  # a 304 may omit the validators; keep the ones that produced it
+    else:
+        entry["sha256"] = result["sha256"]
+        body = result.get("body")
+        if body is None and prev and prev.get("sha256") == result["sha256"]:
+            _carry_derived(entry, prev, None if hash_only else scratch)
+        else:
+            if body is None and not hash_only:
+                try:
+                    body = (scratch / entry["filename"]).read_bytes()
+                except OSError:
+                    body = None
+            if body is not None:
+                entry["fingerprint"] = fingerprint(body)
+                entry["sections"] = page_sections(body)
+        info["scratch_changed"] = result.get("changed", False)
+        if not entry["title"]:
+            entry["title"] = result["title"]
+        fallback = {}
+    entry["etag"] = info.get("etag") or fallback.get("etag")
+    entry["last_modified"] = info.get("last_modified") or fallback.get("last_modified")
+    entry["fetch_status"] = "ok"
+
+
+def _carry_derived(entry: Dict, prev: Dict, scratch: Optional[Path]) -> None:
+    """
+    Copy the previous entry's ``fingerprint`` / ``sections`` — computed from the
+    scratch copy (already verified to match ``prev["sha256"]``) when it
+    predates them, unless ``scratch`` is None.
+    """
+    entry["fingerprint"] = prev.get("fingerprint")
+    entry["sections"] = prev.get("sections")
+    if scratch is not None and (entry["fingerprint"] is None or entry["sections"] is None):
+        try:
+            body = (scratch / entry["filename"]).read_bytes()
+        except OSError:
+            return
+        entry["fingerprint"] = fingerprint(body)
+        entry["sections"] = page_sections(body)
+
+
+def _carry_unchanged(entry: Dict, prev: Dict, info: Dict, scratch: Path) -> None:
+    """Incremental skip: the previous entry (verified ``ok``) IS this run's result."""
+    entry["sha256"] = prev["sha256"]
+    _carry_derived(entry, prev, scratch)
+    entry["title"] = entry["title"] or prev.get("title")
+    entry["etag"] = prev.get("etag")
+    entry["last_modified"] = prev.get("last_modified")
+    entry["fetch_status"] = "ok"
+    info["skipped"] = True
+
+
+def _carry_forward(entry: Dict, prev: Optional[Dict]) -> None:
+    """Fetch failed: keep the previous hash/title/validators as ``stale``, else ``failed``."""
+    if prev and prev.get("sha256"):
+        entry["sha256"] = prev["sha256"]
+        entry["fingerprint"] = prev.get("fingerprint")
+        entry["sections"] = prev.get("sections")
+        entry["title"] = entry["title"] or prev.get("title")
+        entry["etag"] = prev.get("etag")
+        entry["last_modified"] = prev.get("last_modified")
+        entry["fetch_status"] = "stale"
+    else:
+        entry["fetch_status"] = "failed"
+
+
 def build_page_entry(
-    raw: Dict, filename: str, session: requests.Session, scratch: Path, old_by_url: Dict
+    raw: Dict,
+    filename: str,
+    session: requests.Session,
+    scratch: Path,
+    old_by_url: Dict,
+    limiter: Optional[HostLimiter] = None,
+    info: Optional[Dict] = None,
+    skip: bool = False,
+    hash_only: bool = False,
+    max_bytes: int = MAX_BODY_BYTES,
+    deadline: Optional[float] = None,
+    records: Optional[IndexRecords] = None,
 ) -> Dict:
     """
     Build one v2 manifest entry: enrich the discovery record, fetch, hash.
 
+    When the previous entry's scratch copy is still on disk the fetch is a
+    conditional GET (:func:`revalidation_validators`); a 304 keeps the previous
+    sha256 as ``fetch_status: "ok"`` without re-downloading the body.
+
     On fetch failure, carry forward the previous entry's hash/title with
     ``fetch_status: "stale"``; if there is no previous entry, mark ``"failed"``.
+    A host whose circuit is open (:class:`fetcher.throttle.HostUnavailable`)
+    takes the same branch without a single request, and so does every page
+    reached after the run's ``deadline`` (a ``time.monotonic()`` value;
+    ``info["deferred"]`` is set). A page whose retry or Retry-After hold would
+    run past the deadline (the limiter's :class:`fetcher.throttle.DeadlineReached`)
+    is deferred the same way.
     Either way the page stays in the manifest (discovery result, not
-    successful-fetches-only).
+    successful-fetches-only). ``info`` (optional) receives the fetch's
+    per-page stats — see :func:`fetcher.content.stream_markdown`.
+
+    ``skip=True`` (an incremental run, see :func:`fetcher.incremental.can_skip`)
+    issues no request at all: the previous entry is carried forward as ``ok``.
+
+    The body is streamed straight into ``scratch`` and hashed on the way in
+    (:func:`fetcher.content.stream_markdown`, aborting past ``max_bytes``);
+    ``hash_only=True`` (a verify run) hashes without writing and always fetches
+    in full — a 304 would verify nothing.
+
+    ``records`` (the fused index stage, :mod:`fetcher.index_records`) analyzes
+    a downloaded body for the search index from the bytes the stream collected
+    — only then is the body held whole, bounded by ``max_bytes``.
     """
     url = raw["url"]
+    info = {} if info is None else info
     entry = {
         "id": page_id_from_filename(filename),
         "filename": filename,
@@ -68,31 +272,64 @@ def build_page_entry(
         "title": raw.get("title"),
         "category": categorize_from_url(url),
         "sha256": None,
+        "fingerprint": None,
+        "sections": None,
         "lastmod": raw.get("lastmod"),
+        "etag": None,
+        "last_modified": None,
         "fetch_status": "ok",
     }
 
+    prev = old_by_url.get(url)
+    if skip:
+        _carry_unchanged(entry, prev, info, scratch)
+        return entry
+    started = time.monotonic()
+    if deadline is not None and started >= deadline:
+        info["deferred"] = True
+        _carry_forward(entry, prev)
+        return entry
     try:
-        content = fetch_markdown(raw["md_url"], session, filename)
-        entry["sha256"] = save_markdown_file(scratch, filename, content)
-        if not entry["title"]:
-            entry["title"] = extract_title(content)
-        entry["fetch_status"] = "ok"
+        validators = None if hash_only else revalidation_validators(prev, scratch, filename)
+        result = stream_markdown(
+            raw["md_url"], session, None if hash_only else scratch / filename, filename,
+            limiter=limiter, validators=validators, info=info, max_bytes=max_bytes,
+            capture=records is not None,
+        )
+        _apply_fetch(entry, result, prev, scratch, info, hash_only)
+        if records is not None and result is not None:
+            records.add(filename, result["sha256"], result["body"])
+    except DeadlineReached:
+        info["deferred"] = True
+        _carry_forward(entry, prev)
+    except HostUnavailable:
+        info["short_circuited"] = True  # the breaker already logged the outage once
+        _carry_forward(entry, prev)
     except Exception as e:
         logger.warning(f"Fetch failed for {filename}: {e}")
-        prev = old_by_url.get(url)
-        if prev and prev.get("sha256"):
-            entry["sha256"] = prev["sha256"]
-            entry["title"] = entry["title"] or prev.get("title")
-            entry["fetch_status"] = "stale"
-        else:
-            entry["fetch_status"] = "failed"
+        _carry_forward(entry, prev)
+    info["latency_s"] = time.monotonic() - started
 
     return entry
 
 
-def build_changelog_entry(session: requests.Session, scratch: Path, old_by_url: Dict) -> Dict:
-    """Build the changelog manifest entry (special-cased: GitHub raw md_url, no lastmod)."""
+def build_changelog_entry(
+    session: requests.Session,
+    scratch: Path,
+    old_by_url: Dict,
+    limiter: Optional[HostLimiter] = None,
+    info: Optional[Dict] = None,
+    hash_only: bool = False,
+    records: Optional[IndexRecords] = None,
+    deadline: Optional[float] = None,
+) -> Dict:
+    """
+    Build the changelog manifest entry (special-cased: GitHub raw md_url, no lastmod).
+
+    Honors the run ``deadline`` like :func:`build_page_entry`: past it, the
+    previous entry is carried forward without a request.
+    """
+    info = {} if info is None else info
     entry = {
         "id": "changelog",
         "filename": "changelog.md",
@@ -101,21 +338,35 @@ def build_changelog_entry(session: requests.Session, scratch: Path, old_by_url:
         "title": "Claude Code Changelog",
         "category": "release_notes",
         "sha256": None,
+        "fingerprint": None,
+        "sections": None,
         "lastmod": None,
+        "etag": None,
+        "last_modified": None,
         "fetch_status": "ok",
     }
+    prev = old_by_url.get(CHANGELOG_URL)
+    started = time.monotonic()
+    if deadline is not None and started >= deadline:
+        info["deferred"] = True
+        _carry_forward(entry, prev)
+        return entry
     try:
-        _, content = fetch_changelog(session)
-        entry["sha256"] = save_markdown_file(scratch, "changelog.md", content)
-        entry["fetch_status"] = "ok"
+        validators = None if hash_only else revalidation_validators(prev, scratch, "changelog.md")
+        _, content = fetch_changelog(session, limiter=limiter, validators=validators, info=info)
+        result = None if content is None else _buffered_result(
+            scratch, "changelog.md", content, hash_only
+        )
+        _apply_fetch(entry, result, prev, scratch, info, hash_only)
+        if records is not None and result is not None:
+            records.add("changelog.md", result["sha256"], result["body"])
+    except DeadlineReached:
+        info["deferred"] = True
+        _carry_forward(entry, prev)
     except Exception as e:
         logger.warning(f"Changelog fetch failed: {e}")
-        prev = old_by_url.get(CHANGELOG_URL)
-        if prev and prev.get("sha256"):
-            entry["sha256"] = prev["sha256"]
-            entry["fetch_status"] = "stale"
-        else:
-            entry["fetch_status"] = "failed"
+        _carry_forward(entry, prev)
+    info["latency_s"] = time.monotonic() - started
     return entry
 
 
@@ -151,6 +402,324 @@ def map_pages_to_filenames(raw_pages: List[Dict]) -> List[Tuple[Dict, str]]:
     return result
 
 
+class PageFetcher:
+    """
+    The page-fetch worker pool, open before discovery has finished.
+
+    :meth:`start` queues pages from the llms.txt half of discovery while the
+    sitemaps are still arriving (see :func:`fetcher.discovery.discover_pages`'s
+    ``on_llms``); :meth:`fetch` then takes the final, merged page set, reuses
+    the fetches already under way, queues the rest (sitemap-only pages) and
+    returns every entry in ``page_pairs`` order. Both queue in priority order
+    (:mod:`fetcher.schedule`: new pages, changed ``lastmod``, last run's
+    stale/failed, then least recently checked), using ``history`` — the
+    incremental history's per-URL ``checked_at`` — for the last tier. An early fetch writes nothing
+    but its scratch copy, so a run that later aborts (a discovery source or a
+    safeguard fails) publishes nothing, exactly as before.
+
+    Use as a context manager: leaving it cancels queued work and waits for the
+    in-flight fetches.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        scratch: Path,
+        old_by_url: Dict,
+        limiter: Optional[HostLimiter] = None,
+        workers: int = FETCH_WORKERS,
+        fetch_info: Optional[Dict[str, Dict]] = None,
+        hash_only: bool = False,
+        max_bytes: int = MAX_BODY_BYTES,
+        history: Optional[Dict] = None,
+        deadline: Optional[float] = None,
+        records: Optional[IndexRecords] = None,
+    ):
+        self.session = session
+        self.scratch = scratch
+        self.old_by_url = old_by_url
+        self.limiter = limiter
+        self.fetch_info = fetch_info
+        self.hash_only = hash_only
+        self.max_bytes = max_bytes
+        self.history = history or {}
+        self.deadline = deadline
+        self.records = records
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="fetch")
+        self._early: Dict[str, Tuple[str, Future]] = {}
+
+    def __enter__(self) -> "PageFetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, raw: Dict, filename: str, skip: bool, label: str) -> Future:
+        info: Dict = {}
+        if self.fetch_info is not None:
+            self.fetch_info[filename] = info  # submitted from one thread: no lock needed
+
+        def run() -> Dict:
+            entry = build_page_entry(
+                raw, filename, self.session, self.scratch, self.old_by_url, self.limiter,
+                info, skip=skip, hash_only=self.hash_only, max_bytes=self.max_bytes,
+                deadline=self.deadline, records=self.records,
+            )
+            if not skip:
+                logger.info(f"[{label}] {filename}: {entry['fetch_status']}")
+            return entry
+
+        return self._pool.submit(run)
+
+    def start(self, raw_pages: List[Dict]) -> None:
+        """Queue early fetches for discovery records that map to a filename."""
+        def priority(raw: Dict) -> Tuple[int, str]:
+            return fetch_priority(raw, self.old_by_url.get(raw["url"]), self.history.get(raw["url"]))
+
+        for raw in sorted(raw_pages, key=priority):
+            if raw["url"] in self._early:
+                continue
+            try:
+                filename = url_to_filename(raw["url"])
+            except ValueError:
+                continue  # map_pages_to_filenames logs it once the set is final
+            self._early[raw["url"]] = (filename, self._submit(raw, filename, False, "early"))
+        logger.info(f"Started {len(self._early)} page fetch(es) ahead of sitemap discovery")
+
+    def fetch(self, page_pairs: List[Tuple[Dict, str]], skip: Optional[Set[str]] = None) -> List[Dict]:
+        """Build every entry of the final page set (see :func:`fetch_pages`)."""
+        skip = skip or set()
+        total = len(page_pairs)
+        futures: Dict[int, Future] = {}
+        for n, i in enumerate(fetch_order(page_pairs, self.old_by_url, self.history, skip), 1):
+            raw, filename = page_pairs[i]
+            early = self._early.pop(raw["url"], None)
+            if early is not None and early[0] == filename and filename not in skip:
+                futures[i] = early[1]
+            else:
+                futures[i] = self._submit(raw, filename, filename in skip, f"{n}/{total}")
+        pending = [(raw, futures[i]) for i, (raw, _) in enumerate(page_pairs)]
+        if self.fetch_info is not None:
+            for filename, _ in self._early.values():
+                self.fetch_info.pop(filename, None)  # dropped by the final union
+        entries = []
+        for raw, future in pending:
+            entry = future.result()
+            # Early fetches ran before the sitemaps supplied lastmod.
+            entry["lastmod"] = raw.get("lastmod")
+            entries.append(entry)
+        return entries
+
+
+def fetch_pages(
+    page_pairs: List[Tuple[Dict, str]],
+    session: requests.Session,
+    scratch: Path,
+    old_by_url: Dict,
+    limiter: Optional[HostLimiter] = None,
+    workers: int = FETCH_WORKERS,
+    fetch_info: Optional[Dict[str, Dict]] = None,
+    skip: Optional[Set[str]] = None,
+    hash_only: bool = False,
+    max_bytes: int = MAX_BODY_BYTES,
+) -> List[Dict]:
+    """
+    Build every page entry through a bounded worker pool.
+
+    Concurrency changes only *when* pages are fetched, never the result: entries
+    come back in ``page_pairs`` order, and each one is still produced by
+    :func:`build_page_entry`, so carry-forward is per page exactly as in the
+    serial loop. Pacing is the ``limiter``'s job (one token bucket per host),
+    not a sleep between pages.
+
+    The shared ``requests.Session`` is safe here: workers only issue GETs, and its
+    urllib3 pool is thread-safe (main() sizes it to the worker count).
+
+    ``fetch_info`` (optional) collects each page's fetch stats, keyed by filename.
+    Filenames in ``skip`` are carried forward without a request (incremental run);
+    ``hash_only`` / ``max_bytes`` are passed to every :func:`build_page_entry`.
+    Pages are submitted in :mod:`fetcher.schedule` priority order.
+    (``main`` drives a :class:`PageFetcher` directly, to start during discovery.)
+    """
+    workers = max(1, min(workers, len(page_pairs) or 1))
+    with PageFetcher(
+        session, scratch, old_by_url, limiter, workers, fetch_info, hash_only, max_bytes
+    ) as fetcher:
+        return fetcher.fetch(page_pairs, skip)
+
+
+def summarize_transfer(fetch_info: Dict[str, Dict]) -> Dict[str, int]:
+    """
+    Tally full fetches vs 304 revalidations vs incremental skips from per-page stats
+    (plus ``short_circuited``: pages never requested because their host's circuit
+    was open, and ``deferred``: pages never requested because the run deadline
+    had passed).
+
+    ``ok`` alone cannot tell the two apart — a 304 is ``fetch_status: "ok"`` by
+    design — so the split comes from the ``info`` dicts the fetches filled in.
+    ``bytes_saved`` is the size of the reused scratch copies (what a full fetch
+    would have transferred).
+    """
+    totals = {
+        "full_fetches": 0, "bytes_fetched": 0, "not_modified": 0, "bytes_saved": 0, "skipped": 0,
+        "short_circuited": 0, "deferred": 0,
+    }
+    for info in fetch_info.values():
+        if info.get("short_circuited"):
+            totals["short_circuited"] += 1
+        elif info.get("deferred"):
+            totals["deferred"] += 1
+        elif info.get("skipped"):
+            totals["skipped"] += 1
+        elif info.get("not_modified"):
+            totals["not_modified"] += 1
+            totals["bytes_saved"] += info.get("bytes_saved", 0)
+        elif "bytes" in info:
+            totals["full_fetches"] += 1
+            totals["bytes_fetched"] += info["bytes"]
+    return totals
+
+
+def parse_fetch_workers(raw: str) -> int:
+    """Parse ``DOCS_FETCH_WORKERS`` (unset/blank -> ``FETCH_WORKERS``; must be >= 1)."""
+    raw = (raw or "").strip()
+    if not raw:
+        return FETCH_WORKERS
+    try:
+        workers = int(raw)
+        if workers < 1:
+            raise ValueError
+        return workers
+    except ValueError:
+        logger.error(
+            f"Invalid DOCS_FETCH_WORKERS={raw!r}: must be a positive integer "
+            f"(e.g. DOCS_FETCH_WORKERS=1 for a serial run, or unset for {FETCH_WORKERS})."
+        )
+        sys.exit(1)
+
+
+def parse_fetch_mode(raw: str) -> str:
+    """Parse ``DOCS_FETCH_MODE`` (unset/blank -> ``full``; else ``full``/``incremental``/``verify``)."""
+    mode = (raw or "").strip().lower() or "full"
+    if mode not in ("full", "incremental", "verify"):
+        logger.error(
+            f"Invalid DOCS_FETCH_MODE={raw!r}: must be 'full', 'incremental' or 'verify' "
+            f"(or unset for a full run)."
+        )
+        sys.exit(1)
+    return mode
+
+
+def parse_full_sweep_every(raw: str) -> int:
+    """Parse ``DOCS_FULL_SWEEP_EVERY`` (unset/blank -> ``FULL_SWEEP_EVERY``; must be >= 1)."""
+    raw = (raw or "").strip()
+    if not raw:
+        return FULL_SWEEP_EVERY
+    try:
+        every = int(raw)
+        if every < 1:
+            raise ValueError
+        return every
+    except ValueError:
+        logger.error(
+            f"Invalid DOCS_FULL_SWEEP_EVERY={raw!r}: must be a positive integer "
+            f"(1 makes every run a full sweep; unset for {FULL_SWEEP_EVERY})."
+        )
+        sys.exit(1)
+
+
+def parse_max_body_bytes(raw: str) -> int:
+    """Parse ``DOCS_MAX_BODY_BYTES`` (unset/blank -> ``MAX_BODY_BYTES``; must be >= 1)."""
+    raw = (raw or "").strip()
+    if not raw:
+        return MAX_BODY_BYTES
+    try:
+        limit = int(raw)
+        if limit < 1:
+            raise ValueError
+        return limit
+    except ValueError:
+        logger.error(
+            f"Invalid DOCS_MAX_BODY_BYTES={raw!r}: must be a positive integer "
+            f"(bytes; unset for {MAX_BODY_BYTES})."
+        )
+        sys.exit(1)
+
+
+def parse_fetch_deadline(raw: str) -> Optional[float]:
+    """Parse ``DOCS_FETCH_DEADLINE`` (seconds; unset/blank/0 -> no deadline)."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    try:
+        seconds = float(raw)
+        if not 0 <= seconds < float("inf"):
+            raise ValueError
+        return seconds or None
+    except ValueError:
+        logger.error(
+            f"Invalid DOCS_FETCH_DEADLINE={raw!r}: must be a number of seconds "
+            f"(e.g. DOCS_FETCH_DEADLINE=1500 to stop fetching after 25 minutes; 0 or unset for none)."
+        )
+        sys.exit(1)
+
+
+def parse_index_records(raw: str) -> bool:
+    """Parse ``DOCS_INDEX_RECORDS`` (unset/blank/``0`` -> off; ``1`` -> on)."""
+    raw = (raw or "").strip()
+    if raw not in ("", "0", "1"):
+        logger.error(f"Invalid DOCS_INDEX_RECORDS={raw!r}: must be 1 (on) or 0 / unset (off).")
+        sys.exit(1)
+    return raw == "1"
+
+
+def count_hash_changes(old_by_url: Dict, pages: List[Dict]) -> int:
+    """Pages fetched ok whose sha256 differs from (or is absent in) the old manifest."""
+    return sum(
+        1 for entry in pages
+        if entry["fetch_status"] == "ok"
+        and (old_by_url.get(entry["url"]) or {}).get("sha256") != entry["sha256"]
+    )
+
+
+def count_cosmetic_changes(old_by_url: Dict, pages: List[Dict]) -> int:
+    """Pages fetched ok whose sha256 moved but whose fingerprint did not."""
+    return sum(
+        1 for entry in pages
+        if entry["fetch_status"] == "ok"
+        and (old_by_url.get(entry["url"]) or {}).get("sha256") != entry["sha256"]
+        and not content_changed(old_by_url.get(entry["url"]), entry)
+    )
+
+
+def write_run_report(
+    scratch: Path,
+    pages: List[Dict],
+    fetch_info: Dict[str, Dict],
+    phases: Dict[str, float],
+    limiter: HostLimiter,
+    mode: str,
+    outcome: str,
+    started_at: datetime,
+) -> None:
+    """
+    Write ``fetch_report.json`` (and the optional Prometheus textfile).
+
+    Best effort: the report is diagnostics, so failing to write it is logged,
+    never allowed to fail (or mask the real outcome of) the run.
+    """
+    try:
+        report = build_report(
+            pages, fetch_info, phases, limiter.metrics(), mode, outcome, started_at
+        )
+        write_report(report_path(scratch), report)
+        prom = os.environ.get("DOCS_FETCH_REPORT_PROM", "").strip()
+        if prom:
+            write_prometheus(Path(prom), report)
+    except Exception as e:
+        logger.warning(f"Could not write fetch report: {e}")
+
+
 def parse_fetch_limit(raw: str) -> int:
     """Parse ``DOCS_FETCH_LIMIT`` with a clear error instead of a raw traceback.
 
@@ -171,6 +740,7 @@ def parse_fetch_limit(raw: str) -> int:
 def main():
     """Run the v2 fetch pipeline."""
     start_time = datetime.now()
+    started = time.monotonic()
     repo_root = Path(__file__).parent.parent.parent
 
     scratch = Path(os.environ.get("DOCS_SCRATCH_DIR", str(repo_root / DEFAULT_SCRATCH_DIR)))
@@ -178,53 +748,142 @@ def main():
     logger.info(f"Fetch scratch dir: {scratch}")
 
     limit = parse_fetch_limit(os.environ.get("DOCS_FETCH_LIMIT", "0"))
+    workers = parse_fetch_workers(os.environ.get("DOCS_FETCH_WORKERS", ""))
+    mode = parse_fetch_mode(os.environ.get("DOCS_FETCH_MODE", ""))
+    sweep_every = parse_full_sweep_every(os.environ.get("DOCS_FULL_SWEEP_EVERY", ""))
+    max_bytes = parse_max_body_bytes(os.environ.get("DOCS_MAX_BODY_BYTES", ""))
+    deadline_s = parse_fetch_deadline(os.environ.get("DOCS_FETCH_DEADLINE", ""))
+    deadline = None if deadline_s is None else started + deadline_s
+    hash_only = mode == "verify"
+    # Fused index stage: only for runs whose scratch feeds the index build.
+    records = None
+    if parse_index_records(os.environ.get("DOCS_INDEX_RECORDS", "")) and not hash_only and not limit:
+        records = IndexRecords.load(index_records_path(scratch))
 
     manifest_file = manifest_path(repo_root)
     old_manifest = load_manifest(manifest_file)
     old_by_url = pages_by_url(old_manifest)
 
+    state_file = fetch_state_path(scratch)
+    fetch_state = load_fetch_state(state_file)
+    full_sweep = mode != "incremental" or is_full_sweep(fetch_state, sweep_every)
+    source_cache = SourceCache.load(discovery_cache_path(scratch))
+    now = datetime.now(timezone.utc)
+
     stats = {"ok": 0, "stale": 0, "failed": 0}
+    # One limiter for the whole run — discovery included — so a 429 anywhere
+    # holds that host for every worker. AIMD can never usefully exceed the pool.
+    limiter = HostLimiter(HOST_RATE_LIMIT, HOST_RATE_BURST, max_concurrency=workers, deadline=deadline)
+    phases: Dict[str, float] = {}
+    fetch_info: Dict[str, Dict] = {}
     pages: List[Dict] = []
+    outcome = "aborted"
 
-    with requests.Session() as session:
-        raw_pages = discover_pages(session)
-
-        if limit:
-            raw_pages = raw_pages[:limit]
-            logger.warning(
-                f"DOCS_FETCH_LIMIT={limit}: preview mode — safeguards skipped, "
-                f"writing throwaway manifest to scratch."
+    try:
+        with requests.Session() as session, PageFetcher(
+            session, scratch, old_by_url, limiter, workers, fetch_info, hash_only, max_bytes,
+            history=fetch_state.get("pages"), deadline=deadline, records=records,
+        ) as fetcher:
+            # Discovery fetches all of its sources at once, whatever the pool size.
+            adapter = requests.adapters.HTTPAdapter(
+                pool_maxsize=max(workers, len(SITEMAP_URLS) + len(LLMS_TXT_URLS))
             )
-        else:
-            raw_pages = validate_discovery_threshold(raw_pages)
-
-        page_pairs = map_pages_to_filenames(raw_pages)
-
-        for i, (raw, filename) in enumerate(page_pairs, 1):
-            logger.info(f"[{i}/{len(page_pairs)}] {filename}")
-            entry = build_page_entry(raw, filename, session, scratch, old_by_url)
+            session.mount("https://", adapter)
+            # Pages listed in llms.txt start fetching while the sitemaps are still
+            # in flight — but only when every page will be fetched anyway: an
+            # incremental skip decision needs the sitemap lastmod, and a preview
+            # run's page set is a prefix of the final sorted union.
+            early = fetcher.start if full_sweep and not limit else None
+            with timed(phases, "discovery"):
+                raw_pages = discover_pages(session, limiter, on_llms=early, cache=source_cache)
+                if not hash_only:
+                    # Discovery succeeded (fail-closed), so every source is in it.
+                    source_cache.save(discovery_cache_path(scratch))
+
+                if limit:
+                    raw_pages = raw_pages[:limit]
+                    logger.warning(
+                        f"DOCS_FETCH_LIMIT={limit}: preview mode — safeguards skipped, "
+                        f"writing throwaway manifest to scratch."
+                    )
+                else:
+                    raw_pages = validate_discovery_threshold(raw_pages)
+
+                page_pairs = map_pages_to_filenames(raw_pages)
+            skip: Set[str] = set()
+            if not full_sweep:
+                skip = select_skippable(page_pairs, old_by_url, fetch_state, scratch, now)
+                logger.info(f"Incremental run: skipping {len(skip)} unchanged page(s)")
+            elif mode == "incremental":
+                logger.info("Incremental run: full sweep due, fetching every page")
+
+            logger.info(
+                f"Fetching {len(page_pairs)} pages with {workers} worker(s), "
+                f"{HOST_RATE_LIMIT:g} req/s per host"
+            )
+            with timed(phases, "pages"):
+                pages = fetcher.fetch(page_pairs, skip)
+            fetch_info["changelog.md"] = {}
+            with timed(phases, "changelog"):
+                pages.append(
+                    build_changelog_entry(
+                        session, scratch, old_by_url, limiter, fetch_info["changelog.md"], hash_only,
+                        records, deadline,
+                    )
+                )
+
+        for entry in pages:
             stats[entry["fetch_status"]] = stats.get(entry["fetch_status"], 0) + 1
-            pages.append(entry)
-            if i < len(page_pairs):
-                time.sleep(RATE_LIMIT_DELAY)
-
-        changelog = build_changelog_entry(session, scratch, old_by_url)
-        stats[changelog["fetch_status"]] = stats.get(changelog["fetch_status"], 0) + 1
-        pages.append(changelog)
-
-    sources = list(SITEMAP_URLS) + list(LLMS_TXT_URLS)
-    manifest = build_manifest(pages, sources)
-
-    if limit:
-        out_path = scratch / "paths_manifest.preview.json"
-    else:
-        # Guard runs BEFORE the write: a failed run must never overwrite the
-        # committed manifest. The fetch-success floor lives inside the
-        # transition guard (changelog excluded) — single owner, no drift.
-        validate_manifest_transition(old_manifest, pages)
-        out_path = manifest_file
-
-    save_manifest(out_path, manifest)
+        transfer = summarize_transfer(fetch_info)
+
+        sources = list(SITEMAP_URLS) + list(LLMS_TXT_URLS)
+        manifest = build_manifest(pages, sources)
+
+        with timed(phases, "safeguards"):
+            if limit:
+                out_path = scratch / "paths_manifest.preview.json"
+            elif hash_only:
+                # Verify run: a diagnostic, never a publish — nothing on disk changes
+                # except this throwaway manifest.
+                out_path = scratch / "paths_manifest.verify.json"
+                logger.info(
+                    f"Verify: {count_hash_changes(old_by_url, pages)} page(s) hash differently "
+                    f"from the committed manifest"
+                )
+            else:
+                # Guard runs BEFORE the write: a failed run must never overwrite the
+                # committed manifest. The fetch-success floor lives inside the
+                # transition guard (changelog excluded) — single owner, no drift.
+                # Deferred documentation pages only: the changelog is outside the floor.
+                deferred_docs = transfer["deferred"] - bool(fetch_info["changelog.md"].get("deferred"))
+                validate_manifest_transition(old_manifest, pages, deferred_docs)
+                out_path = manifest_file
+                logger.info(
+                    f"{count_hash_changes(old_by_url, pages)} page(s) hash differently from the "
+                    f"committed manifest, {count_cosmetic_changes(old_by_url, pages)} of them "
+                    f"cosmetic only (same fingerprint)"
+                )
+
+        with timed(phases, "write"):
+            save_manifest(out_path, manifest)
+            if not limit and not hash_only:
+                # Only after the transition guard passed: an aborted run leaves the
+                # history (and the sweep counter) exactly as the last good run left it.
+                record_history(fetch_state, pages, old_by_url, fetch_info, now, full_sweep)
+                save_fetch_state(state_file, fetch_state)
+                if records is not None:
+                    records.save(index_records_path(scratch), pages)
+                # Objects no manifest entry references any more (superseded
+                # bodies, dropped pages) — scratch links keep their own inode.
+                ObjectStore(scratch).prune(entry["sha256"] for entry in pages if entry.get("sha256"))
+        outcome = "ok"
+    finally:
+        # Written for aborted runs too — those are the ones worth reading.
+        write_run_report(scratch, pages, fetch_info, phases, limiter,
+                         "preview" if limit else mode, outcome, now)
+        if not hash_only:
+            # Also for aborted runs: the scratch files it changed did change.
+            write_scratch_journal(scratch, fetch_info, now)
 
     duration = datetime.now() - start_time
     logger.info("=" * 50)
@@ -232,6 +891,32 @@ def main():
     logger.info(
         f"Pages: {len(pages)} | ok={stats['ok']} stale={stats['stale']} failed={stats['failed']}"
     )
+    logger.info(
+        f"Transfer: {transfer['full_fetches']} full fetch(es), {transfer['bytes_fetched']} bytes | "
+        f"{transfer['not_modified']} not modified (304), ~{transfer['bytes_saved']} bytes saved | "
+        f"{transfer['skipped']} skipped (incremental)"
+    )
+    if transfer["deferred"]:
+        logger.warning(
+            f"Deadline: {transfer['deferred']} page(s) carried forward unfetched "
+            f"(DOCS_FETCH_DEADLINE={deadline_s:g}s reached)"
+        )
+    if transfer["short_circuited"]:
+        logger.warning(
+            f"Circuit breaker: {transfer['short_circuited']} page(s) carried forward "
+            f"without a request (host unavailable)"
+        )
+    logger.info(f"Retries: {limiter.retries.spent}/{limiter.retries.total} of the run budget used")
+    for host, m in limiter.metrics().items():
+        logger.info(
+            f"Host {host}: concurrency {m['concurrency']:g} "
+            f"(range {m['min_concurrency']:g}-{m['peak_concurrency']:g}), "
+            f"{m['throttle_events']} throttle event(s), held {m['held_seconds']:g}s, "
+            f"circuit {m['circuit']} (opened {m['circuit_opened']}x)"
+        )
+    logger.info(
+        "Phases: " + ", ".join(f"{name} {seconds:.1f}s" for name, seconds in phases.items())
+    )
     logger.info(f"Manifest: {out_path}")
 
     if stats["ok"] == 0:
@@ -33,6 +33,13 @@ SITEMAP_URLS = [
 ]
 # NOT discovery sources: docs.claude.com, docs.anthropic.com (301 redirect aliases)
 
+# Sitemaps are parsed as a stream (sitemap.py), gzip or plain. A <sitemapindex>
+# has its child sitemaps fetched SITEMAP_CHILD_WORKERS at a time. No sitemap may
+# expand past MAX_SITEMAP_BYTES (the sitemaps.org protocol limit is 50 MB
+# uncompressed), which bounds a decompression bomb.
+SITEMAP_CHILD_WORKERS = 4
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+
 # llms.txt sources — markdown lists of "title + .md URL + description" per page.
 # Used together with the sitemaps (union discovery): llms.txt supplies titles,
 # descriptions, and coverage the sitemap-only path (e.g. agent-sdk) fetch missed;
@@ -52,10 +59,40 @@ MANIFEST_FILE = "docs_manifest.json"  # legacy v1 manifest (docs/); removed in c
 MANIFEST_SCHEMA_VERSION = 2
 PATHS_MANIFEST_FILE = "paths_manifest.json"
 
+# Per-write manifest deltas, committed beside the manifest (manifest.py). Each file
+# is named by the content_hash it starts from; the newest KEEP are retained (a week
+# of 3-hourly runs that all changed something). A client further behind falls back
+# to checking every page.
+MANIFEST_DELTA_DIR = "manifest_deltas"
+MANIFEST_DELTA_KEEP = 56
+
 # Ephemeral scratch dir the v2 fetcher writes .md into (to hash + feed the index).
 # Never committed; overridable so Verify runs don't churn the tracked docs/ tree.
 DEFAULT_SCRATCH_DIR = ".doc_fetch"
 
+# Per-run fetch report (report.py), written into the scratch dir — never committed.
+FETCH_REPORT_FILE = "fetch_report.json"
+
+# Content-addressed object store inside the scratch dir (store.py): every body is
+# kept once under .objects/<sha256[:2]>/<sha256>, and each scratch filename is a
+# hard link to its object. The journal lists the filenames whose content this
+# run changed (read by build_search_index.py).
+OBJECT_STORE_DIR = ".objects"
+SCRATCH_JOURNAL_FILE = "scratch_journal.json"
+
+# Discovery source cache (source_cache.py), in the scratch dir: per-source body
+# hash, validators and parsed output, plus the last merged page set. A run whose
+# sources all come back unchanged reuses that page set without re-merging.
+DISCOVERY_CACHE_FILE = "discovery_cache.json"
+
+# Fused fetch-to-index stage (index_records.py, DOCS_INDEX_RECORDS=1): each
+# page's search-index analysis, computed from its bytes as they are fetched and
+# read by build_search_index.py instead of re-reading the scratch copy.
+INDEX_RECORDS_FILE = "index_records.json"
+# Pages at least this large also keep a per-section analysis in their record,
+# so the next change re-tokenizes only the sections it touched (changelog.md).
+SECTION_CACHE_MIN_BYTES = 32 * 1024
+
 # Domains the fetcher (and the client fetch layer, B1) are allowed to request.
 ALLOWED_DOMAINS = (
     "code.claude.com",
@@ -82,7 +119,59 @@ HEADERS = {
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # initial delay in seconds
 MAX_RETRY_DELAY = 30  # maximum delay in seconds
-RATE_LIMIT_DELAY = 0.5  # seconds between requests
+
+# Streaming page bodies (content.stream_markdown): read in chunks, hashed as
+# they arrive; only a small prefix is ever decoded (validation + title). A body
+# over MAX_BODY_BYTES (override: DOCS_MAX_BODY_BYTES) is aborted before it is
+# fully downloaded; documentation pages are orders of magnitude smaller.
+STREAM_CHUNK_SIZE = 64 * 1024
+VALIDATION_PREFIX_BYTES = 16 * 1024
+MAX_BODY_BYTES = 8 * 1024 * 1024
+RATE_LIMIT_DELAY = 0.5  # seconds between requests (to any ONE host)
+
+
+# =============================================================================
+# CONCURRENCY CONFIGURATION
+# =============================================================================
+# The page loop runs a bounded worker pool; pacing is per host (token bucket),
+# not one global sleep. The per-host rate keeps the old RATE_LIMIT_DELAY spacing
+# for each host — the speed-up comes from overlapping latency and from the hosts
+# no longer sharing a single budget. Override the pool size with
+# DOCS_FETCH_WORKERS (1 restores a serial loop).
+FETCH_WORKERS = 8
+HOST_RATE_LIMIT = 1 / RATE_LIMIT_DELAY  # requests/second per host
+HOST_RATE_BURST = 2                     # requests a host may take back-to-back
+
+# Adaptive per-host concurrency (AIMD, throttle.py): every host starts at
+# HOST_INITIAL_CONCURRENCY requests in flight, grows by AIMD_INCREASE per healthy
+# window up to HOST_MAX_CONCURRENCY, and is cut by AIMD_DECREASE (and held for
+# its Retry-After) on a 429. HOST_RATE_LIMIT stays the hard ceiling above it.
+HOST_INITIAL_CONCURRENCY = 2
+HOST_MAX_CONCURRENCY = FETCH_WORKERS
+AIMD_INCREASE = 1.0
+AIMD_DECREASE = 0.5
+
+# Outage handling (throttle.py): a host's circuit opens after this many
+# consecutive failed requests (network error / 5xx) and its remaining pages go
+# straight to carry-forward; one probe is allowed through per cooldown. The
+# retry budget caps backoff retries across the whole run.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 60              # seconds
+RETRY_BUDGET = 100                 # retries per run, all hosts
+
+
+# =============================================================================
+# INCREMENTAL REFRESH (DOCS_FETCH_MODE=incremental)
+# =============================================================================
+# Pages whose sitemap lastmod is unchanged are carried forward unfetched; pages
+# without lastmod are re-checked on an interval learned from their own change
+# history (half the time since their last change, clamped below). Every
+# FULL_SWEEP_EVERY-th run fetches everything (override: DOCS_FULL_SWEEP_EVERY).
+# History lives in the scratch dir, never in the committed manifest.
+FETCH_STATE_FILE = "fetch_state.json"
+FULL_SWEEP_EVERY = 8               # 8 runs x 3h cron = one full sweep a day
+MIN_RECHECK_HOURS = 3              # one cron tick: volatile pages every run
+MAX_RECHECK_HOURS = 48             # even dormant pages are re-checked every 2 days
 
 
 # =============================================================================
@@ -91,3 +180,4 @@ RATE_LIMIT_DELAY = 0.5  # seconds between requests
 MIN_DISCOVERY_THRESHOLD = 200      # Refuse to proceed if < 200 paths discovered
 MAX_DELETION_PERCENT = 10          # Never delete > 10% of existing files
 MIN_EXPECTED_FILES = 250           # Minimum expected file count after fetch
+MIN_DEADLINE_FLOOR = 50            # Deadline-scaled fetch-success floor never drops below this
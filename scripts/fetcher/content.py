@@ -2,18 +2,20 @@
 Content fetching and validation functionality.
 
 This module handles:
-- Fetching markdown content from documentation URLs
+- Fetching markdown content from documentation URLs (streamed to scratch with
+  incremental hashing, or buffered)
 - Validating markdown content
 - Saving markdown files
 - Fetching the Claude Code changelog
 """
 
 import hashlib
+import os
 import random
 import re
 import time
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 
 import requests
 
@@ -22,55 +24,100 @@ from .config import (
     MAX_RETRIES,
     RETRY_DELAY,
     MAX_RETRY_DELAY,
+    MAX_BODY_BYTES,
+    STREAM_CHUNK_SIZE,
+    VALIDATION_PREFIX_BYTES,
     logger,
 )
+from .store import ObjectStore
+from .throttle import HostLimiter, limited_get, limited_request
+from .throttle import retry_after_seconds as _retry_after_seconds
 
-# Retry-After handling: default when the header is absent/unparseable, and a hard
-# cap so a hostile/buggy header can never stall the pipeline for hours.
-DEFAULT_RETRY_AFTER = 60
-MAX_RETRY_AFTER = 300
 
-
-def _retry_after_seconds(response) -> int:
+def _wait_out_rate_limit(
+    response, label: str, limiter: Optional[HostLimiter], waits: Optional[Dict] = None
+) -> None:
     """
-    Parse a 429 response's Retry-After header defensively.
+    Back off after a 429.
 
-    HTTP allows either delta-seconds or an HTTP-date; a bare ``int()`` raises
-    ValueError on the date form (killing the page for the run via the wrong
-    handler). Unparseable/absent values fall back to ``DEFAULT_RETRY_AFTER``;
-    the result is clamped to ``[0, MAX_RETRY_AFTER]``.
+    With a shared ``limiter`` the host is already on hold for the Retry-After
+    delay (:meth:`HostLimiter.finish`) — every worker waits on it, so sleeping
+    here too would only double the pause. Without one, sleep on it alone.
     """
-    raw = response.headers.get('Retry-After', DEFAULT_RETRY_AFTER)
-    try:
-        seconds = int(raw)
-    except (TypeError, ValueError):
-        logger.warning(f"Unparseable Retry-After header {raw!r}; defaulting to {DEFAULT_RETRY_AFTER}s")
-        seconds = DEFAULT_RETRY_AFTER
-    return max(0, min(seconds, MAX_RETRY_AFTER))
+    if limiter is not None:
+        logger.warning(f"{label}: rate limited, waiting on the host-wide hold...")
+        return
+    wait_time = _retry_after_seconds(response)
+    logger.warning(f"{label}: rate limited, waiting {wait_time}s...")
+    time.sleep(wait_time)
+    if waits is not None:
+        waits["throttle"] = waits.get("throttle", 0.0) + wait_time
 
 
-def discovery_get(session: requests.Session, url: str) -> requests.Response:
+def _may_retry(attempt: int, url: str, limiter: Optional[HostLimiter]) -> bool:
+    """
+    Whether a failed attempt gets another try.
+
+    Beyond ``MAX_RETRIES``, a shared ``limiter`` can refuse: its host's circuit
+    has opened, or the run-wide retry budget is spent (see
+    :meth:`HostLimiter.should_retry`). Refusing skips the backoff sleep entirely,
+    so an outage drains into carry-forward in seconds.
+    """
+    if attempt >= MAX_RETRIES - 1:
+        return False
+    return limiter is None or limiter.should_retry(url)
+
+
+def discovery_get(
+    session: requests.Session,
+    url: str,
+    limiter: Optional[HostLimiter] = None,
+    read_body: Optional[Callable[[requests.Response], Any]] = None,
+    validators: Optional[Dict] = None,
+    info: Optional[Dict] = None,
+) -> Any:
     """
     GET a discovery source (llms.txt / sitemap) with the same retry/backoff
-    budget page fetches get.
+    budget page fetches get. ``limiter`` (optional) is the run's shared per-host
+    pacing, so a 429 here holds the host for the page fetches too.
 
     Discovery is fail-closed by design — a dead source aborts the whole run —
     so a single un-retried transient (one CDN 503 blip) must not be what pulls
     that trigger. Retries here, hard failure after; the caller still raises.
 
+    ``read_body`` (optional) streams the body instead of buffering it: the GET
+    is made with ``stream=True`` and ``read_body(response)`` consumes it inside
+    the retry loop, so a connection dropped mid-body is retried like any other
+    transient. Anything else it raises (e.g. ``ValueError`` for a malformed
+    document) propagates at once.
+
+    ``validators`` / ``info`` work as for page fetches: the previous copy's
+    ``etag`` / ``last_modified`` are sent conditionally, and the response's
+    status and validators are recorded into ``info``.
+
     Returns:
-        The successful (2xx) response.
+        The successful (2xx) response, or ``read_body``'s result; ``None`` when
+        ``validators`` were sent and the origin answered 304 Not Modified.
 
     Raises:
         requests.exceptions.RequestException: after MAX_RETRIES failures.
     """
+    headers = conditional_headers(validators)
+    conditional = len(headers) > len(HEADERS)
     last_error: Exception = requests.exceptions.RequestException("no attempts made")
     for attempt in range(MAX_RETRIES):
+        response = None
         try:
             # No redirects here either: a discovery source that starts
             # redirecting has moved — that must surface as a loud failure
             # (fail-closed), not be silently followed to who-knows-where.
-            response = session.get(url, headers=HEADERS, timeout=30, allow_redirects=False)
+            response = limited_get(
+                session, url, limiter, headers=headers, timeout=30, allow_redirects=False,
+                **({"stream": True} if read_body is not None else {}),
+            )
+            _record_response(info, response)
+            if response.status_code == 304 and conditional:
+                return None
             if 300 <= response.status_code < 400:
                 raise requests.exceptions.RequestException(
                     f"redirect {response.status_code} to "
@@ -81,19 +128,24 @@ def discovery_get(session: requests.Session, url: str) -> requests.Response:
                 last_error = requests.exceptions.RequestException(
                     f"rate limited (429) on all {MAX_RETRIES} attempts"
                 )
-                if attempt < MAX_RETRIES - 1:  # no pointless sleep after the last try
-                    wait_time = _retry_after_seconds(response)
-                    logger.warning(f"Discovery {url}: rate limited, waiting {wait_time}s...")
-                    time.sleep(wait_time)
+                if not _may_retry(attempt, url, limiter):  # no pointless sleep after the last try
+                    break
+                _wait_out_rate_limit(response, f"Discovery {url}", limiter)
                 continue
             response.raise_for_status()
-            return response
+            if read_body is None:
+                return response
+            return read_body(response)
         except requests.exceptions.RequestException as e:
             last_error = e
             logger.warning(f"Discovery attempt {attempt + 1}/{MAX_RETRIES} failed for {url}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                delay = min(RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
-                time.sleep(delay * random.uniform(0.5, 1.0))
+            if not _may_retry(attempt, url, limiter):
+                break
+            delay = min(RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
+            time.sleep(delay * random.uniform(0.5, 1.0))
+        finally:
+            if read_body is not None and response is not None:
+                response.close()
     raise last_error
 
 
@@ -113,7 +165,7 @@ def _reject_redirect(response, label: str) -> None:
             f"(treated as fetch failure; client uses --max-redirs 0)"
         )
         raise requests.exceptions.RequestException(
-            f"redirect {response.status_code} to {location}"
+            f"redirect {response.status_code} to {location}", response=response
         )
 
 
@@ -199,7 +251,115 @@ def extract_title(content: Union[str, bytes]) -> str:
     return match.group(1).strip() if match else "Untitled"
 
 
-def fetch_markdown(md_url: str, session: requests.Session, label: str = "") -> bytes:
+def conditional_headers(validators: Optional[Dict]) -> Dict[str, str]:
+    """
+    Request headers for a (possibly conditional) GET.
+
+    ``validators`` is a manifest page entry (or any dict) carrying the ``etag`` /
+    ``last_modified`` the origin sent with the copy we already hold; each present
+    one becomes ``If-None-Match`` / ``If-Modified-Since``. ``None`` -> plain
+    ``HEADERS``.
+    """
+    headers = dict(HEADERS)
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _record_response(info: Optional[Dict], response) -> None:
+    """Copy status + cache validators of ``response`` into the caller's ``info`` dict."""
+    if info is None:
+        return
+    info["http_status"] = response.status_code
+    for key, header in (("etag", "ETag"), ("last_modified", "Last-Modified")):
+        value = response.headers.get(header)
+        if isinstance(value, str) and value:
+            info[key] = value
+
+
+def _fetch_with_retries(
+    url: str,
+    session: requests.Session,
+    label: str,
+    limiter: Optional[HostLimiter],
+    validators: Optional[Dict],
+    info: Optional[Dict],
+    read_body: Callable,
+    stream: bool = False,
+):
+    """
+    The shared GET/retry loop behind :func:`fetch_markdown` and :func:`stream_markdown`.
+
+    Handles pacing, 429s, conditional 304s, redirects and backoff; ``read_body``
+    turns a 2xx response into the caller's result. Returns ``None`` for an
+    honored 304. Network errors (including ones mid-body) are retried; a
+    ``ValueError`` from ``read_body`` (invalid / oversized content) is not.
+    """
+    headers = conditional_headers(validators)
+    conditional = len(headers) > len(HEADERS)
+    extra = {"stream": True} if stream else {}
+    waits = None if info is None else info.setdefault("waits", {})
+
+    for attempt in range(MAX_RETRIES):
+        if info is not None:
+            info["attempts"] = attempt + 1
+        try:
+            # The slot is held until the body is read (see limited_request).
+            with limited_request(
+                session, url, limiter, waits,
+                headers=headers, timeout=30, allow_redirects=False, **extra,
+            ) as response:
+                try:
+                    _record_response(info, response)
+
+                    if response.status_code == 429:  # Rate limited
+                        if not _may_retry(attempt, url, limiter):
+                            break
+                        _wait_out_rate_limit(response, label, limiter, waits)
+                        continue
+
+                    # 304 is a 3xx: handle it before the redirect rejection. Only honored
+                    # when we actually asked conditionally — an unsolicited 304 has no
+                    # body to fall back on and stays a failure.
+                    if response.status_code == 304 and conditional:
+                        logger.info(f"Not modified: {label} (304, reusing previous copy)")
+                        return None
+
+                    _reject_redirect(response, label)
+                    response.raise_for_status()
+                    return read_body(response)
+                finally:
+                    if stream:
+                        response.close()  # hand the pooled connection back on every path
+
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {label}: {e}")
+            if _may_retry(attempt, url, limiter):
+                delay = min(RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
+                jittered_delay = delay * random.uniform(0.5, 1.0)
+                time.sleep(jittered_delay)
+            else:
+                raise Exception(f"Failed to fetch {label} after {attempt + 1} attempt(s): {e}")
+
+        except ValueError as e:
+            logger.error(f"Content validation failed for {label}: {e}")
+            raise
+
+    # Only reachable if every attempt returned HTTP 429 (rate limited).
+    raise Exception(f"Exhausted retries (rate limited) for {label}")
+
+
+def fetch_markdown(
+    md_url: str,
+    session: requests.Session,
+    label: str = "",
+    limiter: Optional[HostLimiter] = None,
+    validators: Optional[Dict] = None,
+    info: Optional[Dict] = None,
+) -> Optional[bytes]:
     """
     Fetch a markdown page from its verbatim ``.md`` URL.
 
@@ -212,13 +372,28 @@ def fetch_markdown(md_url: str, session: requests.Session, label: str = "") -> b
     title extraction) decodes a UTF-8 copy with errors="replace" for that purpose
     only. Redirects are NOT followed — see :func:`_reject_redirect`.
 
+    The pipeline itself uses :func:`stream_markdown` (bounded memory, written
+    straight to scratch); this buffered form remains for callers that want the
+    bytes in hand.
+
     Args:
         md_url: The verbatim ``.md`` URL to fetch.
         session: Requests session.
         label: Human-readable label for logs (usually the filename).
+        limiter: Shared per-host pacing (see :mod:`fetcher.throttle`); every
+            attempt, retries included, takes a concurrency slot and a token from
+            the page's host, and a 429 holds that host for every worker.
+        validators: The previous entry's ``etag`` / ``last_modified`` — sent as a
+            conditional GET (see :func:`conditional_headers`). Pass them only when
+            the copy they describe is still on disk: a 304 means "reuse it".
+        info: Optional dict filled with ``http_status``, ``attempts``, ``bytes``,
+            the response's ``etag`` / ``last_modified`` (for the caller's
+            manifest entry and run stats) and ``waits`` — seconds queued behind
+            429s (``throttle``) and per-host pacing (``pacing``).
 
     Returns:
-        The validated markdown content as raw bytes.
+        The validated markdown content as raw bytes, or ``None`` when
+        ``validators`` were sent and the origin answered 304 Not Modified.
 
     Raises:
         Exception: On network failure after retries.
@@ -226,67 +401,206 @@ def fetch_markdown(md_url: str, session: requests.Session, label: str = "") -> b
     """
     label = label or md_url
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            response = session.get(md_url, headers=HEADERS, timeout=30, allow_redirects=False)
+    def read_body(response) -> bytes:
+        raw = response.content
+        text = raw.decode('utf-8', errors='replace')
+        validate_markdown_content(text, label)
+        logger.info(f"Fetched and validated {label} ({len(raw)} bytes)")
+        if info is not None:
+            info["bytes"] = len(raw)
+        return raw
 
-            if response.status_code == 429:  # Rate limited
-                wait_time = _retry_after_seconds(response)
-                logger.warning(f"Rate limited. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
-                continue
+    return _fetch_with_retries(md_url, session, label, limiter, validators, info, read_body)
 
-            _reject_redirect(response, label)
-            response.raise_for_status()
 
-            raw = response.content
-            text = raw.decode('utf-8', errors='replace')
-            validate_markdown_content(text, label)
-            logger.info(f"Fetched and validated {label} ({len(raw)} bytes)")
-            return raw
+def _stream_body(
+    response, dest: Optional[Path], label: str, max_bytes: int, capture: bool = False
+) -> Dict:
+    """
+    Consume a streamed 2xx body: hash as chunks arrive, optionally write ``dest``.
+
+    Only the first ``VALIDATION_PREFIX_BYTES`` are ever decoded (validation and
+    title extraction look no further), so memory is bounded by the chunk and
+    prefix sizes, not the page. The body goes to a temp file in the store and
+    enters the object store (:mod:`fetcher.store`) only once complete and valid:
+    a failed, oversized or interrupted download never leaves a partial scratch
+    copy behind for a later 304 / incremental skip to trust. ``dest`` then
+    becomes a link to the object — untouched if it already was one, so an
+    unchanged page costs no write. ``dest=None`` hashes without writing.
+    ``capture=True`` also collects the whole body in memory — bounded by
+    ``max_bytes`` — for the fused index stage (:mod:`fetcher.index_records`),
+    which then analyzes it without reading ``dest`` back.
 
-        except requests.exceptions.RequestException as e:
-            logger.warning(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {label}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                delay = min(RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
-                jittered_delay = delay * random.uniform(0.5, 1.0)
-                time.sleep(jittered_delay)
-            else:
-                raise Exception(f"Failed to fetch {label} after {MAX_RETRIES} attempts: {e}")
+    Returns:
+        ``{"sha256", "bytes", "title", "changed"}`` — ``changed`` is True when
+        ``dest``'s content differs from what it held before — plus ``"body"``
+        (bytes) when ``capture``.
 
-        except ValueError as e:
-            logger.error(f"Content validation failed for {label}: {e}")
-            raise
+    Raises:
+        ValueError: The body exceeds ``max_bytes`` (declared or actual), or its
+            prefix is not valid markdown.
+    """
+    declared = response.headers.get("Content-Length")
+    if isinstance(declared, str) and declared.isdigit() and int(declared) > max_bytes:
+        raise ValueError(f"body too large ({declared} bytes declared, limit {max_bytes})")
+
+    digest = hashlib.sha256()
+    prefix = bytearray()
+    body = bytearray() if capture else None
+    size = 0
+    validated = False
+    changed = False
+    tmp_path = None
+    out = None
+    try:
+        if dest is not None:
+            store = ObjectStore(dest.parent)
+            fd, tmp_path = store.temp_file(dest.name)
+            out = os.fdopen(fd, "wb")
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(f"body too large (over {max_bytes} bytes, aborted mid-stream)")
+            digest.update(chunk)
+            if len(prefix) < VALIDATION_PREFIX_BYTES:
+                prefix.extend(chunk[:VALIDATION_PREFIX_BYTES - len(prefix)])
+                if len(prefix) >= VALIDATION_PREFIX_BYTES:
+                    # Reject an HTML/error body as soon as we can tell, not after
+                    # downloading (and writing) all of it.
+                    validate_markdown_content(prefix.decode('utf-8', errors='replace'), label)
+                    validated = True
+            if out is not None:
+                out.write(chunk)
+            if body is not None:
+                body.extend(chunk)
+        if not validated:
+            validate_markdown_content(prefix.decode('utf-8', errors='replace'), label)
+        if out is not None:
+            out.close()
+            out = None
+            store.add_file(tmp_path, digest.hexdigest())
+            tmp_path = None
+            changed = store.link(dest.name, digest.hexdigest())
+    finally:
+        if out is not None:
+            out.close()
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+    result = {
+        "sha256": digest.hexdigest(),
+        "bytes": size,
+        "title": extract_title(bytes(prefix)),
+        "changed": changed,
+    }
+    if body is not None:
+        result["body"] = bytes(body)
+    return result
+
+
+def stream_markdown(
+    md_url: str,
+    session: requests.Session,
+    dest: Optional[Path],
+    label: str = "",
+    limiter: Optional[HostLimiter] = None,
+    validators: Optional[Dict] = None,
+    info: Optional[Dict] = None,
+    max_bytes: int = MAX_BODY_BYTES,
+    capture: bool = False,
+) -> Optional[Dict]:
+    """
+    Fetch a markdown page straight to ``dest``, hashing it on the way in.
 
-    # Only reachable if every attempt returned HTTP 429 (rate limited).
-    raise Exception(f"Exhausted all {MAX_RETRIES} attempts (rate limited) for {label}")
+    The streaming counterpart of :func:`fetch_markdown` (same retries, pacing,
+    conditional GET and redirect rules): the body is never held whole in memory,
+    decoded in full, or hashed a second time — see :func:`_stream_body`. The
+    sha256 is over exactly the raw bytes written, as with
+    :func:`save_markdown_file`.
 
+    Args:
+        md_url: The verbatim ``.md`` URL to fetch.
+        session: Requests session.
+        dest: Final path of the scratch copy, or ``None`` for a hash-only fetch
+            (verify runs) that writes nothing.
+        label, limiter, validators, info: As for :func:`fetch_markdown`.
+        max_bytes: Abort (``ValueError``, no retry) once the body — declared via
+            Content-Length or actually received — exceeds this.
+        capture: Also return the body (``"body"``), held whole in memory —
+            only for callers that analyze it (the fused index stage).
+
+    Returns:
+        ``{"sha256", "bytes", "title", "changed"}`` for a fetched body
+        (``title`` from the first heading, ``"Untitled"`` if none; ``changed``
+        as for :func:`_stream_body`), or ``None`` on an honored 304.
+
+    Raises:
+        Exception: On network failure after retries.
+        ValueError: If the body is oversized or not valid markdown.
+    """
+    label = label or md_url
 
-def fetch_changelog(session: requests.Session) -> Tuple[str, bytes]:
+    def read_body(response) -> Dict:
+        result = _stream_body(response, dest, label, max_bytes, capture)
+        action = "Saved" if dest is not None else "Hashed"
+        logger.info(f"{action} {label} ({result['bytes']} bytes, streamed)")
+        if info is not None:
+            info["bytes"] = result["bytes"]
+        return result
+
+    return _fetch_with_retries(
+        md_url, session, label, limiter, validators, info, read_body, stream=True
+    )
+
+
+def fetch_changelog(
+    session: requests.Session,
+    limiter: Optional[HostLimiter] = None,
+    validators: Optional[Dict] = None,
+    info: Optional[Dict] = None,
+) -> Tuple[str, Optional[bytes]]:
     """
     Fetch Claude Code changelog from GitHub repository.
 
     Args:
         session: Requests session
+        limiter: Shared per-host pacing (raw.githubusercontent.com's bucket).
+        validators, info: As for :func:`fetch_markdown`.
 
     Returns:
-        Tuple of (filename, raw content bytes)
+        Tuple of (filename, raw content bytes) — content is ``None`` on a 304
+        answer to a conditional GET.
     """
     changelog_url = "https://raw.githubusercontent.com/anthropics/claude-code/main/CHANGELOG.md"
     filename = "changelog.md"
+    headers = conditional_headers(validators)
+    conditional = len(headers) > len(HEADERS)
+    waits = None if info is None else info.setdefault("waits", {})
 
     logger.info(f"Fetching Claude Code changelog: {changelog_url}")
 
     for attempt in range(MAX_RETRIES):
+        if info is not None:
+            info["attempts"] = attempt + 1
         try:
-            response = session.get(changelog_url, headers=HEADERS, timeout=30, allow_redirects=False)
+            response = limited_get(
+                session, changelog_url, limiter, waits,
+                headers=headers, timeout=30, allow_redirects=False,
+            )
+            _record_response(info, response)
 
             if response.status_code == 429:  # Rate limited
-                wait_time = _retry_after_seconds(response)
-                logger.warning(f"Rate limited. Waiting {wait_time} seconds...")
-                time.sleep(wait_time)
+                if not _may_retry(attempt, changelog_url, limiter):
+                    break
+                _wait_out_rate_limit(response, filename, limiter, waits)
                 continue
 
+            if response.status_code == 304 and conditional:
+                logger.info("Changelog not modified (304, reusing previous copy)")
+                return filename, None
+
             _reject_redirect(response, filename)
             response.raise_for_status()
 
@@ -302,24 +616,26 @@ def fetch_changelog(session: requests.Session) -> Tuple[str, bytes]:
                 raise ValueError(f"Changelog content too short ({len(content)} bytes)")
 
             logger.info(f"Successfully fetched changelog ({len(content)} bytes)")
+            if info is not None:
+                info["bytes"] = len(content)
             return filename, content
 
         except requests.exceptions.RequestException as e:
             logger.warning(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for changelog: {e}")
-            if attempt < MAX_RETRIES - 1:
+            if _may_retry(attempt, changelog_url, limiter):
                 delay = min(RETRY_DELAY * (2 ** attempt), MAX_RETRY_DELAY)
                 jittered_delay = delay * random.uniform(0.5, 1.0)
                 logger.info(f"Retrying in {jittered_delay:.1f} seconds...")
                 time.sleep(jittered_delay)
             else:
-                raise Exception(f"Failed to fetch changelog after {MAX_RETRIES} attempts: {e}")
+                raise Exception(f"Failed to fetch changelog after {attempt + 1} attempt(s): {e}")
 
         except ValueError as e:
             logger.error(f"Changelog validation failed: {e}")
             raise
 
     # Only reachable if every attempt returned HTTP 429 (rate limited).
-    raise Exception(f"Exhausted all {MAX_RETRIES} attempts (rate limited) for changelog")
+    raise Exception("Exhausted retries (rate limited) for changelog")
 
 
 def save_markdown_file(docs_dir: Path, filename: str, content: Union[str, bytes]) -> str:
@@ -329,7 +645,9 @@ def save_markdown_file(docs_dir: Path, filename: str, content: Union[str, bytes]
     The file is written with the EXACT bytes that are hashed, so the manifest
     sha256 always matches what a client hashing its own raw download computes —
     no text-mode/charset re-encoding in between. str input (legacy callers/tests)
-    is encoded as UTF-8 first.
+    is encoded as UTF-8 first. The bytes go into the scratch object store and
+    ``docs_dir/filename`` becomes a link to them; content the file already holds
+    is not rewritten.
 
     Args:
         docs_dir: Directory to save the file in
@@ -339,12 +657,12 @@ def save_markdown_file(docs_dir: Path, filename: str, content: Union[str, bytes]
     Returns:
         SHA256 hash of the written bytes
     """
-    file_path = docs_dir / filename
     data = content.encode('utf-8') if isinstance(content, str) else content
 
     try:
-        file_path.write_bytes(data)
-        content_hash = hashlib.sha256(data).hexdigest()
+        store = ObjectStore(docs_dir)
+        content_hash = store.add_bytes(data)
+        store.link(filename, content_hash)
         logger.info(f"Saved: {filename}")
         return content_hash
     except Exception as e:
@@ -352,6 +670,26 @@ def save_markdown_file(docs_dir: Path, filename: str, content: Union[str, bytes]
         raise
 
 
+def scratch_copy_matches(scratch: Path, filename: str, sha256: Optional[str]) -> bool:
+    """
+    True if ``scratch/filename`` exists and hashes to ``sha256``.
+
+    The gate for every path that reuses a previous run's copy instead of
+    downloading (304 revalidation, incremental skips): the index build reads the
+    scratch file, so it must be exactly the bytes the manifest hash describes.
+    A file linked to the store object for ``sha256`` matches by construction;
+    anything else is re-hashed.
+    """
+    if not sha256:
+        return False
+    path = scratch / filename
+    if ObjectStore(scratch).holds(path, sha256):
+        return True
+    if not path.is_file():
+        return False
+    return hashlib.sha256(path.read_bytes()).hexdigest() == sha256
+
+
 def content_has_changed(content: Union[str, bytes], old_hash: str) -> bool:
     """
     Check if content has changed based on hash.
@@ -0,0 +1,99 @@
+"""
+Normalized-content fingerprint: a page hash that ignores cosmetic churn.
+
+``sha256`` hashes the raw bytes, so a trailing space, a re-wrapped blank line,
+a regenerated build timestamp or a shuffled link list all read as a change.
+``fingerprint`` hashes a canonical form of the markdown instead:
+
+- text is decoded, NFC-normalized, and line endings become ``\\n``;
+- trailing whitespace goes everywhere; outside code fences, runs of spaces and
+  tabs inside a line collapse to one (indentation is kept);
+- runs of blank lines collapse to one, and leading/trailing blank lines go;
+- date-times (``2026-07-29T10:00:00Z``, ``2026-07-29 10:00 UTC``) become a
+  placeholder — plain dates are content (release notes) and are kept;
+- a run of consecutive list items that are each a single bare link, and a run
+  of link reference definitions (``[id]: url``), are sorted.
+
+The value is ``"<scheme>:<sha256 hex>"``. Bumping :data:`FINGERPRINT_SCHEME`
+when the rules change makes old and new values unequal rather than silently
+comparable.
+
+``sha256`` stays authoritative: clients check fetched bytes against it, and
+the manifest always carries the current one. The fingerprint only lets
+downstream stages (change history, ``manifest-diff.sh``, client sync) treat a
+page as unchanged when nothing but cosmetic bytes moved.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+FINGERPRINT_SCHEME = "n1"
+
+_FENCE = re.compile(r"^\s*(```|~~~)")
+_SPACE_RUN = re.compile(r"(?<=\S)[ \t]{2,}")
+_DATETIME = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2}|\s?UTC|\s?GMT)?"
+)
+_LINK_ITEM = re.compile(r"^\s*[-*+]\s+\[[^\]]*\]\([^)\s]*\)$")
+_LINK_DEF = re.compile(r"^\s{0,3}\[[^\]]+\]:\s+\S+")
+
+
+def _sort_runs(lines: List[str], pattern: "re.Pattern[str]") -> List[str]:
+    out: List[str] = []
+    run: List[str] = []
+    for line in lines + [None]:
+        if line is not None and pattern.match(line):
+            run.append(line)
+            continue
+        out.extend(sorted(run))
+        run = []
+        if line is not None:
+            out.append(line)
+    return out
+
+
+def canonical_markdown(text: str) -> str:
+    """The canonical form :func:`fingerprint` hashes (see the module docstring)."""
+    text = unicodedata.normalize("NFC", text.replace("\r\n", "\n").replace("\r", "\n"))
+    lines: List[str] = []
+    in_code = False
+    for line in text.split("\n"):
+        line = line.rstrip()
+        if _FENCE.match(line):
+            in_code = not in_code
+        elif not in_code:
+            line = _SPACE_RUN.sub(" ", line)
+        line = _DATETIME.sub("<datetime>", line)
+        if not line and (not lines or not lines[-1]):
+            continue
+        lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    lines = _sort_runs(lines, _LINK_ITEM)
+    lines = _sort_runs(lines, _LINK_DEF)
+    return "\n".join(lines) + "\n"
+
+
+def fingerprint(body: bytes) -> str:
+    """``"<scheme>:<hex>"`` fingerprint of a fetched body."""
+    canonical = canonical_markdown(body.decode("utf-8", errors="replace"))
+    return f"{FINGERPRINT_SCHEME}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+def content_changed(prev: Optional[Dict], entry: Dict) -> bool:
+    """
+    True if ``entry``'s content differs from ``prev``'s beyond cosmetic bytes.
+
+    Same sha256 is never a change; a missing ``prev`` always is. Otherwise the
+    fingerprints decide when both entries have one, and the sha256 when not.
+    """
+    if not prev:
+        return True
+    if prev.get("sha256") == entry.get("sha256"):
+        return False
+    if prev.get("fingerprint") and entry.get("fingerprint"):
+        return prev["fingerprint"] != entry["fingerprint"]
+    return True
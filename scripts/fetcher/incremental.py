@@ -0,0 +1,175 @@
+"""
+Incremental refresh: decide which pages a run may skip re-fetching.
+
+A full run fetches every page. In incremental mode (``DOCS_FETCH_MODE=incremental``)
+a page is carried forward unfetched — same sha256/title/validators, still
+``fetch_status: "ok"`` — when the evidence says it has not changed:
+
+- **Pages with a sitemap ``lastmod``** (code.claude.com): skipped while the
+  ``lastmod`` equals the one recorded in the previous manifest entry.
+- **Pages without one** (platform.claude.com, ~76% of the corpus): re-checked on
+  a per-page interval derived from the page's own change history — half the
+  time it has gone unchanged, clamped to ``[MIN_RECHECK_HOURS,
+  MAX_RECHECK_HOURS]``. A page that changed yesterday is re-checked every run; a
+  page untouched for a month waits up to the ceiling.
+
+Either way a page is only skipped when its previous entry was ``ok`` and its
+scratch copy still hashes to that sha256 (the index build reads it). Every
+``FULL_SWEEP_EVERY`` runs is a full sweep regardless, which catches a ``lastmod``
+that lies.
+
+The history lives in ``fetch_state.json`` inside the scratch dir, not in the
+committed manifest: per-run check timestamps would otherwise turn every run into
+a manifest commit. A missing/unreadable state file just means a full run.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import (
+    FETCH_STATE_FILE,
+    FULL_SWEEP_EVERY,
+    MIN_RECHECK_HOURS,
+    MAX_RECHECK_HOURS,
+    logger,
+)
+from .content import scratch_copy_matches
+from .fingerprint import content_changed
+
+
+def _iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def fetch_state_path(scratch: Path) -> Path:
+    """Path to the incremental-refresh history inside the scratch dir."""
+    return scratch / FETCH_STATE_FILE
+
+
+def load_fetch_state(path: Path) -> Dict:
+    """
+    Load the refresh history, or an empty one.
+
+    Unlike the manifest, a corrupt state file is NOT fatal: the worst outcome of
+    forgetting history is a full run, so it degrades to exactly that.
+    """
+    state = {"runs_since_full": None, "pages": {}}
+    if not path.exists():
+        return state
+    try:
+        data = json.loads(path.read_text())
+        if isinstance(data, dict) and isinstance(data.get("pages"), dict):
+            state.update(data)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable fetch state {path}: {e} (full run)")
+    return state
+
+
+def save_fetch_state(path: Path, state: Dict) -> None:
+    path.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+
+
+def is_full_sweep(state: Dict, every: int = FULL_SWEEP_EVERY) -> bool:
+    """True when this run must re-fetch everything (no history, or sweep due)."""
+    runs = state.get("runs_since_full")
+    return runs is None or runs + 1 >= every
+
+
+def recheck_interval(history: Optional[Dict], now: datetime) -> timedelta:
+    """
+    How long a page without ``lastmod`` may go between checks.
+
+    Half the time it has stayed unchanged (``now - changed_at``), clamped to
+    ``[MIN_RECHECK_HOURS, MAX_RECHECK_HOURS]``. No recorded change -> minimum.
+    """
+    floor = timedelta(hours=MIN_RECHECK_HOURS)
+    changed_at = _parse_iso((history or {}).get("changed_at"))
+    if changed_at is None:
+        return floor
+    interval = (now - changed_at) / 2
+    return max(floor, min(interval, timedelta(hours=MAX_RECHECK_HOURS)))
+
+
+def can_skip(
+    raw: Dict,
+    filename: str,
+    prev: Optional[Dict],
+    history: Optional[Dict],
+    scratch: Path,
+    now: datetime,
+) -> bool:
+    """True if the page may be carried forward without a fetch this run."""
+    if not prev or prev.get("fetch_status") != "ok":
+        return False  # new, stale, or failed pages always get a real fetch
+    lastmod = raw.get("lastmod")
+    if lastmod:
+        if prev.get("lastmod") != lastmod:
+            return False
+    else:
+        checked_at = _parse_iso((history or {}).get("checked_at"))
+        if checked_at is None or now - checked_at >= recheck_interval(history, now):
+            return False
+    # Checked last: the only test that reads the disk.
+    return scratch_copy_matches(scratch, filename, prev.get("sha256"))
+
+
+def select_skippable(
+    page_pairs: List[Tuple[Dict, str]],
+    old_by_url: Dict,
+    state: Dict,
+    scratch: Path,
+    now: datetime,
+) -> Set[str]:
+    """Filenames an incremental run may carry forward unfetched."""
+    histories = state.get("pages", {})
+    return {
+        filename
+        for raw, filename in page_pairs
+        if can_skip(raw, filename, old_by_url.get(raw["url"]), histories.get(raw["url"]), scratch, now)
+    }
+
+
+def record_history(
+    state: Dict,
+    pages: List[Dict],
+    old_by_url: Dict,
+    fetch_info: Dict[str, Dict],
+    now: datetime,
+    full_sweep: bool,
+) -> Dict:
+    """
+    Fold this run's results into the history and bump the sweep counter.
+
+    Only pages actually checked this run (full fetch or 304) update
+    ``checked_at``; ``changed_at`` moves when the content differs from the
+    previous entry beyond cosmetic bytes (:func:`fetcher.fingerprint.content_changed`;
+    first sighting counts as a change). Pages that left
+    discovery are dropped from the history.
+    """
+    stamp = _iso(now)
+    histories = state.get("pages", {})
+    updated = {}
+    for entry in pages:
+        url = entry["url"]
+        history = dict(histories.get(url, {}))
+        info = fetch_info.get(entry["filename"], {})
+        if entry["fetch_status"] == "ok" and ("bytes" in info or info.get("not_modified")):
+            history["checked_at"] = stamp
+            prev = old_by_url.get(url)
+            if content_changed(prev, entry) or "changed_at" not in history:
+                history["changed_at"] = stamp
+        updated[url] = history
+    state["pages"] = updated
+    state["runs_since_full"] = 0 if full_sweep else (state.get("runs_since_full") or 0) + 1
+    return state
@@ -0,0 +1,113 @@
+"""
+Fused fetch-to-index stage: analyze each page for the search index as it arrives.
+
+Without it, ``build_search_index.py`` re-reads every scratch ``.md`` after the
+fetch and tokenizes it. With ``DOCS_INDEX_RECORDS=1`` the fetcher collects each
+body as it streams in (one per worker, bounded by ``MAX_BODY_BYTES``) — no
+second pass over the scratch copy — and, for a sha256 with no record yet, runs
+the index analysis
+(:func:`fetcher.analysis.analyze_content` — headings, terms, word count, code
+blocks stripped once) on it, and writes the results to ``index_records.json`` in
+the scratch dir, keyed by filename and tagged with the body's sha256. The index
+builder then only assembles and guards records; it reads a scratch file only for
+a page without a matching record.
+
+Large pages (``changelog.md``) also keep an analysis per heading section
+(:func:`fetcher.analysis.analyze_sections`); when such a page changes, only
+the sections whose hash changed are tokenized again.
+
+Pages that were not downloaded this run (304, incremental skip, carried-forward
+failure) keep the previous run's record for as long as its sha256 is still the
+manifest's, so one cold run is enough to cover the whole corpus.
+
+The analysis code (:mod:`fetcher.analysis`) is the one the index builder runs
+too, so a record is exactly what the builder would have computed from the file.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .analysis import ANALYZER_VERSION, analyze_sections
+from .config import INDEX_RECORDS_FILE, SECTION_CACHE_MIN_BYTES, logger
+
+RECORDS_SCHEMA_VERSION = 1
+
+
+def index_records_path(scratch: Path) -> Path:
+    return scratch / INDEX_RECORDS_FILE
+
+
+class IndexRecords:
+    """This run's index records plus the previous run's. Safe to share across threads."""
+
+    def __init__(self, previous: Optional[Dict[str, Dict]] = None):
+        self._previous = previous or {}
+        self._fresh: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Path) -> "IndexRecords":
+        """Load the previous records, or none (never fatal — pages just get re-read)."""
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text())
+            if (data.get("schema_version") == RECORDS_SCHEMA_VERSION
+                    and data.get("analyzer_version") == ANALYZER_VERSION):
+                return cls(data["records"])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable index records {path}: {e}")
+        return cls()
+
+    def add(self, filename: str, sha256: str, body: bytes) -> None:
+        """
+        Analyze a freshly fetched body (decoded as the index builder reads files).
+
+        A body of at least ``SECTION_CACHE_MIN_BYTES`` keeps its per-section
+        analysis in the record, so the page's next version re-tokenizes only
+        the sections whose hash changed.
+        """
+        if self._reuse(filename, sha256):
+            return
+        previous = self._previous.get(filename) or {}
+        analysis, sections = analyze_sections(
+            body.decode("utf-8", errors="ignore"), previous.get("sections")
+        )
+        record = dict(analysis, sha256=sha256)
+        if len(body) >= SECTION_CACHE_MIN_BYTES:
+            record["sections"] = sections
+        with self._lock:
+            self._fresh[filename] = record
+
+    def _reuse(self, filename: str, sha256: str) -> bool:
+        previous = self._previous.get(filename)
+        if not previous or previous.get("sha256") != sha256:
+            return False
+        with self._lock:
+            self._fresh[filename] = previous  # downloaded again, same bytes
+        return True
+
+    def save(self, path: Path, pages: Iterable[Dict]) -> int:
+        """
+        Write the record of every manifest entry that has one for its sha256
+        (fresh this run, else carried over). Returns the number written.
+        """
+        records = {}
+        for entry in pages:
+            filename, sha256 = entry["filename"], entry.get("sha256")
+            for source in (self._fresh, self._previous):
+                record = source.get(filename)
+                if record and sha256 and record.get("sha256") == sha256:
+                    records[filename] = record
+                    break
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps({
+            "schema_version": RECORDS_SCHEMA_VERSION, "analyzer_version": ANALYZER_VERSION,
+            "records": records,
+        }) + "\n")
+        os.replace(tmp, path)
+        logger.info(f"Index records: {len(records)} page(s), {len(self._fresh)} analyzed this run")
+        return len(records)
@@ -22,13 +22,17 @@ The pure parser (:func:`parse_llms_txt`) is offline-testable; the network wrappe
 (:func:`discover_from_llms_txt`) fetches the real files.
 """
 
+import hashlib
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 import requests
 
 from .config import LLMS_TXT_URLS, logger
 from .content import discovery_get
+from .source_cache import SourceCache
+from .throttle import HostLimiter
 
 # A markdown list entry linking to a .md page, with an optional description that
 # may follow either a ":" (code.claude.com) or "-" (platform.claude.com) separator.
@@ -72,7 +76,10 @@ def parse_llms_txt(text: str) -> List[Dict[str, Optional[str]]]:
 
 
 def discover_from_llms_txt(
-    session: requests.Session, urls: Optional[List[str]] = None
+    session: requests.Session,
+    urls: Optional[List[str]] = None,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[SourceCache] = None,
 ) -> List[Dict[str, Optional[str]]]:
     """
     Fetch and parse the configured llms.txt files.
@@ -83,9 +90,15 @@ def discover_from_llms_txt(
     degrade discovery to sitemap-only and can delete that source's exclusive
     pages under the 10% deletion threshold.
 
+    The sources are fetched concurrently (one thread each); the result is
+    still combined in ``urls`` order, and a failing source still aborts.
+
     Args:
         session: Requests session for connection pooling.
+        limiter: The run's shared per-host pacing (see :mod:`fetcher.throttle`).
         urls: Override list of llms.txt URLs (defaults to ``LLMS_TXT_URLS``).
+        cache: The run's discovery source cache (see :mod:`fetcher.source_cache`);
+            an unchanged file (304, or the same body hash) is not re-parsed.
 
     Returns:
         Combined list of page records across all sources (may contain
@@ -96,28 +109,51 @@ def discover_from_llms_txt(
     """
     if urls is None:
         urls = LLMS_TXT_URLS
+    if cache is None:
+        cache = SourceCache()
 
     records: List[Dict[str, Optional[str]]] = []
-    for url in urls:
-        try:
-            # Retried GET (same budget as page fetches): fail-closed stays, but a
-            # single transient blip no longer aborts the whole 3-hourly run.
-            response = discovery_get(session, url)
-        except Exception as e:
-            raise RuntimeError(
-                f"Discovery source failed: llms.txt {url}: {e} — aborting the run "
-                f"(a dead source must not silently drop its pages)."
-            ) from e
-        parsed = parse_llms_txt(response.text)
-        if not parsed:
-            # Zero link entries from a file that exists is upstream format drift
-            # (or an error body). Proceeding would silently degrade discovery to
-            # sitemap-only (llms-only pages drop, titles -> Untitled) — abort.
-            raise RuntimeError(
-                f"Discovery source failed: llms.txt {url}: 0 entries parsed from "
-                f"{len(response.text)} bytes — possible format drift (the _ENTRY_RE "
-                f"regex may need updating). Aborting the run (fail closed)."
-            )
-        logger.info(f"llms.txt {url}: parsed {len(parsed)} entries")
-        records.extend(parsed)
+    with ThreadPoolExecutor(max_workers=max(1, len(urls)), thread_name_prefix="llms") as pool:
+        # map() re-raises the first failing source, in urls order.
+        for parsed in pool.map(lambda url: _records_from_source(session, url, limiter, cache), urls):
+            records.extend(parsed)
     return records
+
+
+def _records_from_source(
+    session: requests.Session, url: str, limiter: Optional[HostLimiter], cache: SourceCache
+) -> List[Dict[str, Optional[str]]]:
+    """Fetch and parse one llms.txt (fail closed — see :func:`discover_from_llms_txt`)."""
+    info: Dict = {}
+    try:
+        # Retried GET (same budget as page fetches): fail-closed stays, but a
+        # single transient blip no longer aborts the whole 3-hourly run.
+        response = discovery_get(session, url, limiter, validators=cache.validators(url), info=info)
+    except Exception as e:
+        raise RuntimeError(
+            f"Discovery source failed: llms.txt {url}: {e} — aborting the run "
+            f"(a dead source must not silently drop its pages)."
+        ) from e
+    if response is None:
+        parsed = cache.not_modified(url)
+        logger.info(f"llms.txt {url}: not modified (304), {len(parsed)} cached entries")
+        return parsed
+    sha256 = hashlib.sha256(response.text.encode("utf-8")).hexdigest()
+    parsed = cache.lookup(url, sha256)
+    if parsed is not None:
+        cache.record(url, sha256, info, parsed)
+        logger.info(f"llms.txt {url}: unchanged, {len(parsed)} cached entries")
+        return parsed
+    parsed = parse_llms_txt(response.text)
+    if not parsed:
+        # Zero link entries from a file that exists is upstream format drift
+        # (or an error body). Proceeding would silently degrade discovery to
+        # sitemap-only (llms-only pages drop, titles -> Untitled) — abort.
+        raise RuntimeError(
+            f"Discovery source failed: llms.txt {url}: 0 entries parsed from "
+            f"{len(response.text)} bytes — possible format drift (the _ENTRY_RE "
+            f"regex may need updating). Aborting the run (fail closed)."
+        )
+    cache.record(url, sha256, info, parsed)
+    logger.info(f"llms.txt {url}: parsed {len(parsed)} entries")
+    return parsed
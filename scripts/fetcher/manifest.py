@@ -7,13 +7,18 @@ single source of truth. Shape::
     {
       "schema_version": 2,
       "generated_at": "2026-07-29T...Z",
+      "content_hash": "...",
       "sources": ["https://code.claude.com/docs/llms.txt", ...],
       "pages": [
         { "id": "claude-code/hooks", "filename": "claude-code__hooks.md",
           "url": "https://code.claude.com/docs/en/hooks",
           "md_url": "https://code.claude.com/docs/en/hooks.md",
           "title": "Hooks", "category": "claude_code",
-          "sha256": "...", "lastmod": "2026-07-...Z", "fetch_status": "ok" },
+          "sha256": "...", "fingerprint": "n1:...",
+          "sections": {"": "...", "3b1a6c0e": "...", ...},
+          "lastmod": "2026-07-...Z",
+          "etag": "\"abc123\"", "last_modified": "Wed, 29 Jul 2026 ... GMT",
+          "fetch_status": "ok" },
         ...
       ]
     }
@@ -21,15 +26,55 @@ single source of truth. Shape::
 ``pages`` is the *discovery result*, not a successful-fetches-only list: a page
 whose fetch fails is carried forward (``fetch_status: "stale"``) rather than
 dropped, so a transient network error never deletes a page from the manifest.
+
+``fingerprint`` hashes the normalized markdown, so cosmetic-only edits keep it
+(see :mod:`fetcher.fingerprint`); ``sha256`` remains the integrity hash.
+``sections`` hashes each heading section of the body (hashes only, see
+:mod:`fetcher.sections`); ``null`` for a page that was never fetched.
+
+``content_hash`` is the sha256 of everything but the timestamp and the pages'
+cache validators (see :func:`manifest_content_hash`). :func:`save_manifest` leaves a file whose
+``content_hash`` already matches untouched, so ``generated_at`` is the time the
+content last changed and an unchanged run produces no diff at all; consumers
+compare this one value instead of diffing documents.
+
+Beside it, :func:`save_manifest` writes a compact companion for the shell
+clients (``paths_manifest.tsv``, see :func:`manifest_tsv`): one tab-separated
+row per page, so a lookup or a status scan is one awk pass instead of a full
+JSON parse. Its header carries the manifest's ``content_hash``; a reader uses
+the companion only while that matches the JSON's, and falls back to ``jq``
+otherwise.
+
+Each write that replaces a manifest also leaves a delta from the previous one in
+``manifest_deltas/`` (see :func:`manifest_delta`), so a client that synced
+against an earlier ``content_hash`` can follow the chain and check only the
+pages that changed since.
+
+``etag`` / ``last_modified`` are the origin's cache validators for the fetched
+body (``null`` when it sent none). The next run replays them as a conditional
+GET; a 304 keeps ``sha256`` with ``fetch_status: "ok"``. They are transport
+state, not content: a CDN that rotates them on identical bytes leaves the
+``content_hash`` — and so the file — as it was, and the next run replays the
+stored ones (answered with a 200 of the same bytes at worst).
 """
 
+import hashlib
 import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from .config import MANIFEST_SCHEMA_VERSION, PATHS_MANIFEST_FILE, logger
+from .config import (
+    MANIFEST_DELTA_DIR,
+    MANIFEST_DELTA_KEEP,
+    MANIFEST_SCHEMA_VERSION,
+    PATHS_MANIFEST_FILE,
+    logger,
+)
+
+
+COMPANION_COLUMNS = ("filename", "id", "md_url", "sha256", "fingerprint", "category", "title")
 
 
 def manifest_path(repo_root: Path) -> Path:
@@ -81,19 +126,167 @@ def pages_by_url(manifest: Dict) -> Dict[str, Dict]:
     return {p["url"]: p for p in manifest.get("pages", []) if p.get("url")}
 
 
+# Per-page cache validators: left out of the content hash (see module docstring).
+_VALIDATOR_FIELDS = ("etag", "last_modified")
+
+
+def manifest_content_hash(manifest: Dict) -> str:
+    """
+    sha256 of the manifest's canonical JSON, minus ``generated_at`` /
+    ``content_hash`` and each page's ``etag`` / ``last_modified``.
+    """
+    content = {k: v for k, v in manifest.items() if k not in ("generated_at", "content_hash")}
+    content["pages"] = [
+        {k: v for k, v in page.items() if k not in _VALIDATOR_FIELDS}
+        for page in content.get("pages", [])
+    ]
+    canonical = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 def build_manifest(pages: List[Dict], sources: List[str], generated_at: Optional[str] = None) -> Dict:
     """Assemble a v2 manifest dict from page entries (pages sorted by id)."""
     if generated_at is None:
         generated_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
-    return {
+    manifest = {
         "schema_version": MANIFEST_SCHEMA_VERSION,
         "generated_at": generated_at,
+        "content_hash": None,
         "sources": sources,
         "pages": sorted(pages, key=lambda p: p["id"]),
     }
+    manifest["content_hash"] = manifest_content_hash(manifest)
+    return manifest
+
+
+def companion_path(path: Path) -> Path:
+    """The TSV companion written beside a manifest (``paths_manifest.tsv``)."""
+    return path.with_suffix(".tsv")
+
 
+def _tsv_field(value) -> str:
+    # "-" for missing values: bash `read` collapses runs of tabs, so an empty
+    # field in the middle of a row would shift every field after it.
+    if value is None or value == "":
+        return "-"
+    return " ".join(str(value).split())
 
-def save_manifest(path: Path, manifest: Dict) -> None:
-    """Write a v2 manifest to disk (pretty-printed, trailing newline)."""
+
+def manifest_tsv(manifest: Dict) -> str:
+    """
+    The companion's text. A ``#`` header line, then one row per page::
+
+        # content_hash=<hex> columns=filename,id,md_url,sha256,fingerprint,category,title
+        claude-code__hooks.md<TAB>claude-code/hooks<TAB>https://...<TAB><sha256>...
+
+    Missing values (a never-fetched page's ``sha256``) are ``-``. Tabs and
+    newlines inside a title become spaces.
+    """
+    lines = [f"# content_hash={manifest.get('content_hash') or ''} columns={','.join(COMPANION_COLUMNS)}"]
+    for page in manifest.get("pages", []):
+        lines.append("\t".join(_tsv_field(page.get(column)) for column in COMPANION_COLUMNS))
+    return "\n".join(lines) + "\n"
+
+
+def _companion_rows(manifest: Dict) -> Dict[str, List[str]]:
+    rows = {}
+    for page in manifest.get("pages", []):
+        row = [_tsv_field(page.get(column)) for column in COMPANION_COLUMNS]
+        rows[row[0]] = row
+    return rows
+
+
+def manifest_delta(previous: Dict, manifest: Dict) -> Optional[str]:
+    """
+    The delta file's text for ``previous`` → ``manifest``, or None when
+    ``previous`` has no ``content_hash`` to name it by. A header line, then one
+    row per page whose companion row differs, keyed by filename::
+
+        # from=<hex> to=<hex> generated_at=<ts> columns=op,filename,id,...,title
+        C<TAB>claude-code__hooks.md<TAB>claude-code/hooks<TAB>https://...
+
+    ``op`` is ``A`` (added), ``C`` (changed) or ``R`` (removed; the row is the
+    previous one). Rows carry the companion's columns, so a client applies a
+    delta without reading the manifest.
+    """
+    base = previous.get("content_hash")
+    if not base or not manifest.get("content_hash"):
+        return None
+    old, new = _companion_rows(previous), _companion_rows(manifest)
+    lines = [
+        f"# from={base} to={manifest['content_hash']} generated_at={manifest.get('generated_at') or ''} "
+        f"columns=op,{','.join(COMPANION_COLUMNS)}"
+    ]
+    for filename, row in new.items():
+        if filename not in old:
+            lines.append("\t".join(["A", *row]))
+        elif old[filename] != row:
+            lines.append("\t".join(["C", *row]))
+    lines.extend("\t".join(["R", *row]) for filename, row in old.items() if filename not in new)
+    return "\n".join(lines) + "\n"
+
+
+def prune_manifest_deltas(delta_dir: Path, keep: int = MANIFEST_DELTA_KEEP) -> int:
+    """Delete all but the ``keep`` newest deltas (by header ``generated_at``); returns the count."""
+    dated = []
+    for delta in delta_dir.glob("*.tsv"):
+        try:
+            with delta.open() as f:
+                header = f.readline()
+        except OSError:
+            continue
+        generated_at = header.partition(" generated_at=")[2].partition(" ")[0]
+        dated.append((generated_at, delta.name, delta))
+    dated.sort(reverse=True)
+    for _, _, delta in dated[keep:]:
+        delta.unlink(missing_ok=True)
+    return max(len(dated) - keep, 0)
+
+
+def _load_stored(path: Path) -> Optional[Dict]:
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save_manifest(path: Path, manifest: Dict) -> bool:
+    """
+    Write a v2 manifest to disk (pretty-printed, trailing newline) and its TSV
+    companion — each unless it already records the same ``content_hash``.
+    Returns True if the manifest itself was written.
+
+    Replacing a manifest that has a ``content_hash`` also writes the delta from
+    it (:func:`manifest_delta`) to ``manifest_deltas/<old content_hash>.tsv``
+    beside the manifest, and prunes that directory to the newest
+    ``MANIFEST_DELTA_KEEP``.
+    """
+    content_hash = manifest.get("content_hash")
+    previous = _load_stored(path) or {}
+    companion = companion_path(path)
+    tsv = manifest_tsv(manifest)
+    try:
+        companion_current = companion.read_text() == tsv
+    except OSError:
+        companion_current = False
+    # Companion first: until the JSON below lands, its header hash mismatches
+    # and readers fall back to jq rather than trusting rows from a newer run.
+    if not companion_current:
+        companion.write_text(tsv)
+    if content_hash and previous.get("content_hash") == content_hash:
+        logger.info(f"Manifest unchanged (content_hash {content_hash[:12]}); left {path} as is")
+        return False
+    delta = manifest_delta(previous, manifest)
+    if delta is not None:
+        delta_dir = path.parent / MANIFEST_DELTA_DIR
+        delta_dir.mkdir(exist_ok=True)
+        (delta_dir / f"{previous['content_hash']}.tsv").write_text(delta)
+        prune_manifest_deltas(delta_dir)
+        logger.info(
+            f"Wrote manifest delta: {len(delta.splitlines()) - 1} page(s) since "
+            f"content_hash {previous['content_hash'][:12]}"
+        )
     path.write_text(json.dumps(manifest, indent=2) + "\n")
     logger.info(f"Wrote v2 manifest: {len(manifest.get('pages', []))} pages -> {path}")
+    return True
@@ -0,0 +1,325 @@
+"""
+Record/replay HTTP stand-in for benchmarking the fetcher without the live sites.
+
+A *corpus* is a directory mirroring every URL the pipeline requests, one file
+per URL at ``<corpus>/<host>/<path>``: both llms.txt files, both sitemaps, every
+page's ``.md`` twin and the changelog. :func:`record_corpus` captures one from
+production (once, politely paced); :func:`synthesize_corpus` fabricates one of
+any size for offline tests and benchmarks.
+
+:class:`ReplayServer` serves a corpus from a local threaded HTTP server, with
+configurable latency, 5xx error rate and 429 (``Retry-After``) injection, and
+answers ``If-None-Match`` with 304 like the real hosts. Sessions from
+:meth:`ReplayServer.session` mount :class:`ReplayAdapter`, which rewrites every
+``https://<host>/<path>`` request to the local server — so ``discover_pages``,
+``build_page_entry`` and ``build_manifest`` run unmodified, with their real
+``ALLOWED_DOMAINS`` checks, per-host limiter keys and manifest URLs.
+
+The benchmark driver is ``scripts/bench_fetcher.py``.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .cli import CHANGELOG_MD_URL
+from .config import HOST_RATE_BURST, HOST_RATE_LIMIT, LLMS_TXT_URLS, SITEMAP_URLS, logger
+from .discovery import discover_pages
+from .throttle import HostLimiter, limited_get
+
+# Every non-page URL a run requests; pages come from discovery.
+SOURCE_URLS = list(LLMS_TXT_URLS) + list(SITEMAP_URLS) + [CHANGELOG_MD_URL]
+
+_CONTENT_TYPES = {
+    ".xml": "application/xml",
+    ".txt": "text/plain; charset=utf-8",
+    ".md": "text/markdown; charset=utf-8",
+}
+
+
+def corpus_file(corpus: Path, url: str) -> Path:
+    """
+    Map a URL to its file in ``corpus`` (``<corpus>/<host>/<path>``).
+
+    Raises:
+        ValueError: If the URL has no host or path, or would escape the corpus.
+    """
+    parsed = urlparse(url)
+    rel = parsed.path.lstrip("/")
+    if not parsed.hostname or not rel:
+        raise ValueError(f"URL has no host/path to replay: {url}")
+    root = corpus.resolve()
+    path = (root / parsed.hostname / rel).resolve()
+    if root not in path.parents:
+        raise ValueError(f"URL escapes the corpus: {url}")
+    return path
+
+
+def _store(corpus: Path, url: str, body: bytes) -> None:
+    path = corpus_file(corpus, url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(body)
+
+
+# =============================================================================
+# Corpus capture
+# =============================================================================
+
+def record_corpus(
+    corpus: Path, session: requests.Session, limiter: Optional[HostLimiter] = None
+) -> Dict[str, int]:
+    """
+    Record the live sources and every discovered page into ``corpus``.
+
+    Paced by ``limiter`` (default: the production per-host rate), sequential,
+    and without retries — a recording is a one-off, and a page that fails is
+    logged and left out rather than hammered.
+
+    Returns:
+        ``{"sources": n, "pages": n, "failed": n}``.
+
+    Raises:
+        RuntimeError: If discovery fails (as in a real run).
+        requests.RequestException: If a discovery source cannot be recorded.
+    """
+    limiter = limiter or HostLimiter(HOST_RATE_LIMIT, HOST_RATE_BURST)
+    for url in SOURCE_URLS:
+        response = limited_get(session, url, limiter, timeout=30)
+        response.raise_for_status()
+        _store(corpus, url, response.content)
+
+    counts = {"sources": len(SOURCE_URLS), "pages": 0, "failed": 0}
+    for page in discover_pages(session, limiter):
+        try:
+            response = limited_get(session, page["md_url"], limiter, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.warning(f"Not recorded: {page['md_url']}: {e}")
+            counts["failed"] += 1
+            continue
+        _store(corpus, page["md_url"], response.content)
+        counts["pages"] += 1
+    logger.info(
+        f"Recorded corpus {corpus}: {counts['sources']} sources, "
+        f"{counts['pages']} pages ({counts['failed']} failed)"
+    )
+    return counts
+
+
+def synthesize_corpus(corpus: Path, pages: int = 300, page_bytes: int = 4096) -> None:
+    """
+    Write a synthetic corpus of ``pages`` pages (split across both doc hosts).
+
+    Deterministic: the same arguments always produce byte-identical files, so
+    benchmark runs over a synthetic corpus are comparable.
+    """
+    hosts = {
+        "code": ("https://code.claude.com/docs/en", LLMS_TXT_URLS[0], SITEMAP_URLS[1]),
+        "platform": ("https://platform.claude.com/docs/en/build-with-claude",
+                     LLMS_TXT_URLS[1], SITEMAP_URLS[0]),
+    }
+    listed: Dict[str, list] = {name: [] for name in hosts}
+    for n in range(pages):
+        name = "code" if n % 2 == 0 else "platform"
+        url = f"{hosts[name][0]}/synthetic-{n:04d}"
+        listed[name].append(url)
+        body = [f"# Synthetic page {n}", "", f"Benchmark fixture for the Claude Code docs fetcher ({name})."]
+        para = 0
+        while sum(len(line) + 1 for line in body) < page_bytes:
+            body += ["", f"## Section {para}", "",
+                     f"- Usage example {para}: configure the API and run `claude --page {n}`."]
+            para += 1
+        _store(corpus, url + ".md", ("\n".join(body) + "\n").encode())
+
+    for name, (_, llms_url, sitemap_url) in hosts.items():
+        entries = "\n".join(f"- [Synthetic {u.rsplit('-', 1)[1]}]({u}.md): Synthetic page." for u in listed[name])
+        _store(corpus, llms_url, f"# {name}\n\n## Docs\n\n{entries}\n".encode())
+        urls = "".join(
+            f"<url><loc>{u}</loc><lastmod>2026-01-{1 + i % 28:02d}</lastmod></url>"
+            for i, u in enumerate(listed[name])
+        )
+        _store(corpus, sitemap_url, (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>\n'
+        ).encode())
+
+    changelog = ["# Changelog", ""]
+    for v in range(20):
+        changelog += [f"## 1.0.{v}", "", f"- Synthetic release note {v} for the benchmark corpus.", ""]
+    _store(corpus, CHANGELOG_MD_URL, "\n".join(changelog).encode())
+
+
+# =============================================================================
+# Replay server
+# =============================================================================
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keep-alive, like the real hosts — the pool reuse is part of
+    # what is being measured.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 — stdlib signature
+        pass
+
+    def _reply(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server: "ReplayServer" = self.server.replay
+        # Path is /<host>/<path>; see ReplayAdapter.
+        url = "https:/" + urlparse(self.path).path
+        fault = server._next_fault()
+        if server.latency or server.jitter:
+            time.sleep(server.latency + server._jitter())
+        if fault == 429:
+            self._reply(429, headers={"Retry-After": str(server.retry_after)})
+            return
+        if fault == 503:
+            self._reply(503)
+            return
+        try:
+            path = corpus_file(server.corpus, url)
+            body = path.read_bytes()
+        except (ValueError, OSError):
+            server._count("missing")
+            self._reply(404)
+            return
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            server._count("not_modified")
+            self._reply(304, headers={"ETag": etag})
+            return
+        server._count("served")
+        self._reply(200, body, {
+            "Content-Type": _CONTENT_TYPES.get(path.suffix, "application/octet-stream"),
+            "ETag": etag,
+        })
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport adapter that sends every request to a :class:`ReplayServer`.
+
+    ``https://<host>/<path>`` becomes ``<base_url>/<host>/<path>``; the
+    response's ``url`` is restored to the original, so nothing downstream can
+    tell it was replayed.
+    """
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        original = request.url
+        parsed = urlparse(original)
+        request.url = f"{self.base_url}/{parsed.hostname}{parsed.path}" + (
+            f"?{parsed.query}" if parsed.query else ""
+        )
+        response = super().send(request, **kwargs)
+        response.url = original
+        return response
+
+
+class ReplayServer:
+    """
+    Serve a corpus on localhost with injected latency, 5xx errors and 429s.
+
+    Faults are drawn per request from a seeded RNG: with probability
+    ``throttle_rate`` the answer is a 429 carrying ``Retry-After: retry_after``
+    (whole seconds, as the real hosts send it), else with probability
+    ``error_rate`` a bare 503; every answer (faults included) is delayed by
+    ``latency`` plus up to ``jitter`` seconds. Unknown URLs get a 404.
+
+    Use as a context manager; :attr:`stats` counts what was served.
+    """
+
+    def __init__(
+        self,
+        corpus: Path,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: int = 1,
+        seed: int = 0,
+    ):
+        self.corpus = Path(corpus)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "served": 0, "not_modified": 0,
+                      "errors": 0, "throttled": 0, "missing": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        if self._httpd is None:
+            raise RuntimeError("ReplayServer is not running")
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ReplayHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.replay = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = self._thread = None
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def session(self, pool_maxsize: int = 10) -> requests.Session:
+        """A session whose https:// traffic goes to this server."""
+        session = requests.Session()
+        session.mount("https://", ReplayAdapter(self.base_url, pool_maxsize=pool_maxsize))
+        return session
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _jitter(self) -> float:
+        with self._lock:
+            return self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+
+    def _next_fault(self) -> Optional[int]:
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            if roll < self.throttle_rate:
+                self.stats["throttled"] += 1
+                return 429
+            if roll < self.throttle_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return 503
+        return None
@@ -0,0 +1,230 @@
+"""
+Machine-readable fetch run report (``fetch_report.json``) and Prometheus textfile.
+
+The run log says *what* happened; the report says *where the time went*, in a
+form that can be diffed across runs: per-page latency / bytes / attempts / HTTP
+status / time queued behind 429s, per-host and per-phase totals (discovery,
+pages, changelog, safeguards, write), and latency percentiles.
+
+It is written to the scratch dir on every run — including runs a safeguard
+aborts, which are exactly the ones worth looking at — and never committed. Set
+``DOCS_FETCH_REPORT_PROM=<path>`` to also write the headline numbers as a
+Prometheus textfile (node_exporter textfile-collector format).
+"""
+
+import json
+import math
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .config import FETCH_REPORT_FILE, logger
+from .throttle import url_host
+
+REPORT_SCHEMA_VERSION = 1
+PHASES = ("discovery", "pages", "changelog", "safeguards", "write")
+
+
+@contextmanager
+def timed(phases: Dict[str, float], name: str) -> Iterator[None]:
+    """Add the wall time of the ``with`` block to ``phases[name]`` (seconds)."""
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.monotonic() - started
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (``None`` when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _outcome(entry: Dict, info: Dict) -> str:
+    if info.get("skipped"):
+        return "skipped"
+    if info.get("short_circuited"):
+        return "short_circuited"
+    if info.get("deferred"):
+        return "deferred"
+    if entry["fetch_status"] != "ok":
+        return "failed"
+    return "not_modified" if info.get("not_modified") else "fetched"
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def page_record(entry: Dict, info: Dict) -> Dict:
+    """One page's row: identity, final status, and what its fetch cost."""
+    waits = info.get("waits", {})
+    return {
+        "filename": entry["filename"],
+        "host": url_host(entry["md_url"]),
+        "fetch_status": entry["fetch_status"],
+        "outcome": _outcome(entry, info),
+        "http_status": info.get("http_status"),
+        "attempts": info.get("attempts", 0),
+        "bytes": info.get("bytes", 0),
+        "latency_ms": _ms(info.get("latency_s")),
+        "throttle_wait_ms": _ms(waits.get("throttle", 0.0)),
+        "pacing_wait_ms": _ms(waits.get("pacing", 0.0)),
+    }
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    return {
+        "count": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies) if latencies else None,
+    }
+
+
+def build_report(
+    pages: List[Dict],
+    fetch_info: Dict[str, Dict],
+    phases: Dict[str, float],
+    host_metrics: Optional[Dict[str, Dict]] = None,
+    mode: str = "full",
+    outcome: str = "ok",
+    started_at: Optional[datetime] = None,
+) -> Dict:
+    """
+    Assemble the run report.
+
+    Args:
+        pages: The run's manifest entries (changelog included).
+        fetch_info: Per-filename fetch stats (see :func:`fetcher.cli.fetch_pages`).
+        phases: Seconds per phase (see :func:`timed`).
+        host_metrics: :meth:`fetcher.throttle.HostLimiter.metrics` output, merged
+            into the per-host totals.
+        mode: The run's ``DOCS_FETCH_MODE`` (or ``preview``).
+        outcome: ``ok``, or ``aborted`` when a safeguard stopped the run.
+        started_at: Run start (UTC); defaults to now.
+
+    Returns:
+        The report dict (``schema_version``, ``run``, ``phases``, ``latency_ms``,
+        ``hosts``, ``pages``).
+    """
+    records = [page_record(entry, fetch_info.get(entry["filename"], {})) for entry in pages]
+    latencies = [
+        r["latency_ms"] for r in records
+        if r["latency_ms"] is not None and r["outcome"] not in ("skipped", "short_circuited")
+    ]
+
+    hosts: Dict[str, Dict] = {}
+    for r in records:
+        h = hosts.setdefault(r["host"], {
+            "pages": 0, "ok": 0, "stale": 0, "failed": 0, "requests": 0, "bytes": 0,
+            "latency_ms_total": 0.0, "throttle_wait_ms": 0.0, "_latencies": [],
+        })
+        h["pages"] += 1
+        h[r["fetch_status"]] = h.get(r["fetch_status"], 0) + 1
+        h["requests"] += r["attempts"]
+        h["bytes"] += r["bytes"]
+        h["throttle_wait_ms"] = round(h["throttle_wait_ms"] + (r["throttle_wait_ms"] or 0), 1)
+        if r["latency_ms"] is not None and r["outcome"] not in ("skipped", "short_circuited"):
+            h["latency_ms_total"] = round(h["latency_ms_total"] + r["latency_ms"], 1)
+            h["_latencies"].append(r["latency_ms"])
+    for host, h in hosts.items():
+        h["latency_ms"] = _latency_summary(h.pop("_latencies"))
+        h.update((host_metrics or {}).get(host, {}))
+
+    outcomes: Dict[str, int] = {}
+    for r in records:
+        outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+
+    started = started_at or datetime.now(timezone.utc)
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "run": {
+            "started_at": started.isoformat().replace("+00:00", "Z"),
+            "mode": mode,
+            "outcome": outcome,
+            "duration_s": round(sum(phases.values()), 3),
+            "pages": len(records),
+            "outcomes": outcomes,
+            "bytes": sum(r["bytes"] for r in records),
+            "requests": sum(r["attempts"] for r in records),
+        },
+        "phases": {name: round(phases[name], 3) for name in PHASES if name in phases},
+        "latency_ms": _latency_summary(latencies),
+        "hosts": dict(sorted(hosts.items())),
+        "pages": records,
+    }
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    # Textfile collectors may read mid-write; write-then-rename is atomic on POSIX.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as out:
+            out.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_report(path: Path, report: Dict) -> None:
+    _atomic_write(path, json.dumps(report, indent=2) + "\n")
+    logger.info(f"Fetch report: {path}")
+
+
+def render_prometheus(report: Dict) -> str:
+    """Headline numbers of ``report`` in Prometheus text exposition format."""
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List) -> None:
+        lines.append(f"# HELP docs_fetch_{name} {help_text}")
+        lines.append(f"# TYPE docs_fetch_{name} {kind}")
+        for labels, value in samples:
+            if value is None:
+                continue
+            label_str = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+            lines.append(f"docs_fetch_{name}{{{label_str}}} {value:g}" if label_str
+                         else f"docs_fetch_{name} {value:g}")
+
+    run = report["run"]
+    metric("duration_seconds", "gauge", "Wall time of the fetch run.", [({}, run["duration_s"])])
+    metric("success", "gauge", "1 if the run completed, 0 if a safeguard aborted it.",
+           [({}, 1 if run["outcome"] == "ok" else 0)])
+    metric("phase_seconds", "gauge", "Wall time per pipeline phase.",
+           [({"phase": k}, v) for k, v in report["phases"].items()])
+    metric("pages", "gauge", "Pages by fetch outcome.",
+           [({"outcome": k}, v) for k, v in sorted(run["outcomes"].items())])
+    metric("bytes", "gauge", "Body bytes downloaded.", [({}, run["bytes"])])
+    metric("page_latency_seconds", "gauge", "Per-page fetch latency percentiles.",
+           [({"quantile": q}, None if report["latency_ms"][k] is None else report["latency_ms"][k] / 1000)
+            for q, k in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99"))])
+    hosts = report["hosts"]
+    metric("host_requests", "gauge", "HTTP requests per host.",
+           [({"host": h}, v["requests"]) for h, v in hosts.items()])
+    metric("host_throttle_wait_seconds", "gauge", "Time pages waited on 429 / Retry-After holds.",
+           [({"host": h}, v["throttle_wait_ms"] / 1000) for h, v in hosts.items()])
+    metric("host_throttle_events", "gauge", "429 / Retry-After responses per host.",
+           [({"host": h}, v.get("throttle_events")) for h, v in hosts.items()])
+    metric("host_concurrency", "gauge", "Final adaptive concurrency per host.",
+           [({"host": h}, v.get("concurrency")) for h, v in hosts.items()])
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: Path, report: Dict) -> None:
+    _atomic_write(path, render_prometheus(report))
+    logger.info(f"Prometheus textfile: {path}")
+
+
+def report_path(scratch: Path) -> Path:
+    return scratch / FETCH_REPORT_FILE
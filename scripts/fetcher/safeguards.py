@@ -12,12 +12,14 @@ prose — the thing worth protecting is now the **manifest**. Two gates:
    always passes.
 """
 
+import math
 import sys
 from typing import Dict, List
 
 from .config import (
     MIN_DISCOVERY_THRESHOLD,
     MAX_DELETION_PERCENT,
+    MIN_DEADLINE_FLOOR,
     MIN_EXPECTED_FILES,
     logger,
 )
@@ -66,13 +68,21 @@ def count_ok_doc_pages(pages: List[Dict]) -> int:
     )
 
 
-def validate_manifest_transition(old_manifest: Dict, new_pages: List[Dict]) -> None:
+def validate_manifest_transition(
+    old_manifest: Dict, new_pages: List[Dict], deferred: int = 0
+) -> None:
     """
     Guard the old→new manifest transition against mass removal.
 
     Args:
         old_manifest: The previously-loaded v2 manifest (``{pages: [...]}``).
         new_pages: The page entries about to be written.
+        deferred: Documentation pages the run never requested because its
+            deadline passed (``DOCS_FETCH_DEADLINE``). They are carried forward
+            as ``stale`` but are not failures, so the fetch-success floor is
+            scaled to the share of pages actually attempted — but never below
+            ``MIN_DEADLINE_FLOOR``, so a run the deadline left with (almost)
+            nothing fetched still aborts.
 
     Raises:
         SystemExit: If the transition would remove > ``MAX_DELETION_PERCENT`` of
@@ -107,13 +117,24 @@ def validate_manifest_transition(old_manifest: Dict, new_pages: List[Dict]) -> N
     # all-stale (100%-failed) run would pass a sha256-based count. The changelog
     # is excluded (GitHub-hosted; succeeds even in a total docs-site outage).
     ok_count = count_ok_doc_pages(new_pages)
-    if ok_count < MIN_EXPECTED_FILES:
+    floor = MIN_EXPECTED_FILES
+    if deferred:
+        # Same success rate, over the pages the deadline left time for.
+        doc_pages = sum(1 for p in new_pages if p.get("id") != "changelog")
+        attempted = max(0, doc_pages - deferred)
+        scaled = math.ceil(MIN_EXPECTED_FILES * attempted / doc_pages) if doc_pages else 0
+        floor = max(scaled, MIN_DEADLINE_FLOOR)
+        logger.warning(
+            f"{deferred} page(s) deferred by the run deadline: fetch-success floor "
+            f"scaled to {floor} of {attempted} attempted"
+        )
+    if ok_count < floor:
         logger.critical("=" * 70)
         logger.critical("🚨 SAFEGUARD TRIGGERED: Too few successfully fetched pages!")
         logger.critical(
             f"   Only {ok_count} of {len(new_pages)} documentation pages fetched OK "
             f"this run (fetch_status == \"ok\", changelog excluded; minimum "
-            f"{MIN_EXPECTED_FILES}). Most fetches failed/stale — aborting."
+            f"{floor}). Most fetches failed/stale — aborting."
         )
         logger.critical("=" * 70)
         sys.exit(1)
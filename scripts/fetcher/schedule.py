@@ -0,0 +1,72 @@
+"""
+Fetch scheduling: which pages go to the worker pool first.
+
+Entries still come back in ``page_pairs`` (sorted URL) order; only the order in
+which pages are *submitted* changes. The pages most likely to carry news go
+first, so a page published this run never waits behind hundreds of unchanged
+ones, and a run cut short has spent its time where it mattered:
+
+1. new URLs (not in the previous manifest);
+2. pages whose sitemap ``lastmod`` changed;
+3. pages left ``stale`` / ``failed`` by the previous run;
+4. everything else, least recently checked first (``checked_at`` from the
+   incremental history; never checked counts as oldest).
+
+Pages an incremental run carries forward without a request go last — they cost
+no request, but should not hold a worker slot ahead of real fetches.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import logger
+
+NEW = 0
+LASTMOD_CHANGED = 1
+RETRY = 2
+ROUTINE = 3
+
+_TIER_NAMES = {NEW: "new", LASTMOD_CHANGED: "lastmod changed", RETRY: "stale/failed last run"}
+
+
+def fetch_priority(raw: Dict, prev: Optional[Dict], history: Optional[Dict]) -> Tuple[int, str]:
+    """Sort key for one discovery record: lower is fetched sooner."""
+    if prev is None:
+        return (NEW, "")
+    lastmod = raw.get("lastmod")
+    if lastmod and lastmod != prev.get("lastmod"):
+        return (LASTMOD_CHANGED, "")
+    if prev.get("fetch_status") in ("stale", "failed"):
+        return (RETRY, "")
+    # ISO-8601 UTC stamps sort chronologically; "" (never checked) sorts first.
+    return (ROUTINE, (history or {}).get("checked_at") or "")
+
+
+def fetch_order(
+    page_pairs: List[Tuple[Dict, str]],
+    old_by_url: Dict,
+    histories: Optional[Dict] = None,
+    skip: Iterable[str] = (),
+) -> List[int]:
+    """
+    Indices into ``page_pairs`` in the order they should be submitted.
+
+    Ties keep ``page_pairs`` order, so the schedule is deterministic.
+    """
+    histories = histories or {}
+    skip = set(skip)
+    keys = [
+        (filename in skip, fetch_priority(raw, old_by_url.get(raw["url"]), histories.get(raw["url"])))
+        for raw, filename in page_pairs
+    ]
+    order = sorted(range(len(page_pairs)), key=lambda i: (keys[i], i))
+
+    counts: Dict[int, int] = {}
+    for skipped, (tier, _) in keys:
+        if not skipped and tier in _TIER_NAMES:
+            counts[tier] = counts.get(tier, 0) + 1
+    if counts:
+        logger.info(
+            "Fetching first: "
+            + ", ".join(f"{counts[tier]} {_TIER_NAMES[tier]}" for tier in sorted(counts))
+        )
+    return order
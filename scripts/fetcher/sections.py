@@ -0,0 +1,31 @@
+"""
+Per-section content hashes for manifest entries.
+
+A page's ``sha256`` says only *that* it changed. Each entry also carries
+``sections``: one short content hash per heading section, keyed by a short hash
+of the heading's anchor (:func:`fetcher.analysis.split_sections`), in page
+order::
+
+    "sections": {"": "9f2c...", "3b1a6c0e": "e4d0...", ...}
+
+``""`` is the text before the first heading, when there is any. Hashes only —
+no heading text, no prose; ``plugin/scripts/manifest-diff.sh`` names a changed
+section from the search index's ``headings``, which line up with the keyed
+sections in order.
+
+The split is the one the index builder and the fused index stage use, so a
+section the manifest reports as changed is exactly one that stage re-tokenizes.
+"""
+
+from typing import Dict
+
+from .analysis import section_hash, split_sections
+
+
+def page_sections(body: bytes) -> Dict[str, str]:
+    """``{section key: section hash}`` of a fetched body, in page order."""
+    content = body.decode("utf-8", errors="ignore")
+    return {
+        key: section_hash(text)
+        for key, text in split_sections(content)
+    }
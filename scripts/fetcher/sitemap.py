@@ -3,23 +3,46 @@ Sitemap discovery and parsing functionality.
 
 This module handles:
 - Discovering sitemaps from multiple URLs
-- Parsing XML sitemaps safely (XXE prevention)
+- Parsing XML sitemaps as a stream, plain or gzip (XXE prevention)
+- Following ``<sitemapindex>`` documents one level down to their child sitemaps
 - Extracting English documentation paths
+
+Sitemaps are never buffered whole: the body is read in chunks straight into an
+expat parser (gunzipped on the way when it starts with the gzip magic), so
+memory stays flat however large a sitemap grows, and the decompressed size is
+capped at ``MAX_SITEMAP_BYTES``.
 """
 
-import re
-import xml.etree.ElementTree as ET
-from typing import Dict, List, Optional
+import hashlib
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import urlparse
+from xml.parsers import expat
 
 import requests
 
-from .config import SITEMAP_URLS, logger
+from .config import (
+    ALLOWED_DOMAINS,
+    MAX_SITEMAP_BYTES,
+    SITEMAP_CHILD_WORKERS,
+    SITEMAP_URLS,
+    logger,
+)
 from .content import discovery_get
+from .source_cache import SourceCache
+from .throttle import HostLimiter
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+_GZIP_MAGIC = b"\x1f\x8b"
+_READ_CHUNK = 64 * 1024
 
 
 def discover_sitemap_entries(
-    session: requests.Session, urls: Optional[List[str]] = None
+    session: requests.Session,
+    urls: Optional[List[str]] = None,
+    limiter: Optional[HostLimiter] = None,
+    cache: Optional[SourceCache] = None,
 ) -> List[Dict[str, Optional[str]]]:
     """
     Discover English documentation pages from all sitemaps as full URLs + lastmod.
@@ -33,9 +56,18 @@ def discover_sitemap_entries(
     dead source would shrink the union by that source's exclusive pages — a loss
     the 10% deletion threshold cannot always catch.
 
+    The sitemaps are fetched concurrently (one thread each); their entries are
+    still combined in ``urls`` order, so the result does not depend on which
+    source answered first. A source that is a ``<sitemapindex>`` counts as one
+    source: its child sitemaps are fetched in parallel and their pages pooled
+    before the zero-English check.
+
     Args:
         session: Requests session for connection pooling.
+        limiter: The run's shared per-host pacing (see :mod:`fetcher.throttle`).
         urls: Override list of sitemap URLs (defaults to ``SITEMAP_URLS``).
+        cache: The run's discovery source cache (see :mod:`fetcher.source_cache`);
+            a sitemap answering 304 is not re-parsed.
 
     Returns:
         List of ``{url, lastmod}`` dicts (``lastmod`` is ``None`` when the sitemap
@@ -47,66 +79,17 @@ def discover_sitemap_entries(
     """
     if urls is None:
         urls = SITEMAP_URLS
+    if cache is None:
+        cache = SourceCache()
 
-    namespace = {"ns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
     entries: Dict[str, Optional[str]] = {}
-
-    for sitemap_url in urls:
-        try:
-            logger.info(f"Discovering sitemap entries from: {sitemap_url}")
-            # Retried GET (same budget as page fetches): fail-closed stays, but a
-            # single transient blip no longer aborts the whole 3-hourly run.
-            response = discovery_get(session, sitemap_url)
-            root = _parse_xml_safely(response.content)
-        except Exception as e:
-            raise RuntimeError(
-                f"Discovery source failed: sitemap {sitemap_url}: {e} — "
-                f"aborting the run (a dead source must not silently drop its pages)."
-            ) from e
-
-        source_pages = 0
-        url_elems = root.findall(".//ns:url", namespace) or root.findall(".//url")
-        for url_elem in url_elems:
-            loc_elem = url_elem.find("ns:loc", namespace)
-            if loc_elem is None:
-                loc_elem = url_elem.find("loc")
-            if loc_elem is None or not loc_elem.text:
-                continue
-
-            parsed = urlparse(loc_elem.text.strip())
-            path = parsed.path
-            if path.endswith(".html"):
-                path = path[:-5]
-            path = path.rstrip("/")
-
-            # English documentation pages only (exclude /de/, /fr/, ... and non-doc URLs)
-            if not (path.startswith("/docs/en/") or path.startswith("/en/")):
-                continue
-            if any(skip in path for skip in ("/examples/", "/legacy/")):
-                continue
-
-            canonical = f"{parsed.scheme}://{parsed.netloc}{path}"
-
-            lastmod_elem = url_elem.find("ns:lastmod", namespace)
-            if lastmod_elem is None:
-                lastmod_elem = url_elem.find("lastmod")
-            lastmod = (
-                lastmod_elem.text.strip()
-                if lastmod_elem is not None and lastmod_elem.text
-                else None
-            )
-
-            # First occurrence wins, but prefer a real lastmod over None.
-            if canonical not in entries or (entries[canonical] is None and lastmod):
-                entries[canonical] = lastmod
-            source_pages += 1
-
-        if source_pages == 0:
-            raise RuntimeError(
-                f"Discovery source failed: sitemap {sitemap_url} yielded zero English "
-                f"documentation pages — aborting the run (fail closed)."
-            )
-        logger.info(f"  {sitemap_url}: {source_pages} English pages")
+    with ThreadPoolExecutor(max_workers=max(1, len(urls)), thread_name_prefix="sitemap") as pool:
+        # map() re-raises the first failing source, in urls order.
+        for source in pool.map(lambda url: _entries_from_source(session, url, limiter, cache), urls):
+            for canonical, lastmod in source:
+                # First occurrence wins, but prefer a real lastmod over None.
+                if canonical not in entries or (entries[canonical] is None and lastmod):
+                    entries[canonical] = lastmod
 
     if not entries:
         raise RuntimeError("Could not discover any entries from sitemaps")
@@ -116,32 +99,256 @@ def discover_sitemap_entries(
     return result
 
 
-def _parse_xml_safely(content: bytes) -> ET.Element:
+def _entries_from_source(
+    session: requests.Session, sitemap_url: str, limiter: Optional[HostLimiter], cache: SourceCache
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    Fetch one sitemap (and, for a sitemap index, its children) and return its
+    English pages as ``(canonical_url, lastmod)`` in document order (fail
+    closed — see :func:`discover_sitemap_entries`).
     """
-    Parse XML content safely, rejecting DTD/entity declarations (XXE / billion
-    laughs defense).
+    try:
+        logger.info(f"Discovering sitemap entries from: {sitemap_url}")
+        # Retried GET (same budget as page fetches): fail-closed stays, but a
+        # single transient blip no longer aborts the whole 3-hourly run.
+        doc = _fetch_sitemap(session, sitemap_url, limiter, cache)
+        urls = list(doc["urls"])
+        if doc["kind"] == "sitemapindex":
+            children = _allowed_children(sitemap_url, doc["children"])
+            logger.info(f"  {sitemap_url}: sitemap index with {len(children)} child sitemap(s)")
+            workers = max(1, min(SITEMAP_CHILD_WORKERS, len(children)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sitemap-child") as pool:
+                # A failing child fails its whole source, same as a dead sitemap.
+                for child_url, child in zip(
+                    children, pool.map(lambda url: _fetch_sitemap(session, url, limiter, cache), children)
+                ):
+                    # One level only: an index pointing at indexes is not a sitemap we know.
+                    if child["kind"] != "urlset":
+                        raise ValueError(f"child {child_url} is a nested sitemap index")
+                    urls.extend(child["urls"])
+    except Exception as e:
+        raise RuntimeError(
+            f"Discovery source failed: sitemap {sitemap_url}: {e} — "
+            f"aborting the run (a dead source must not silently drop its pages)."
+        ) from e
 
-    Stdlib ``ET.XMLParser`` has no ``forbid_dtd``-style kwargs (those belong to
-    defusedxml), so the defense is a pre-parse content check: any ``<!DOCTYPE``
-    or ``<!ENTITY`` anywhere in the document rejects it outright. The scan must
-    cover the FULL content, not a fixed-size prefix: XML permits arbitrary
-    comments before the DOCTYPE, so a bounded prefix check is bypassable with
-    padding. Neither token can appear legitimately in a sitemap (``<`` inside
-    element text/attributes must be escaped as ``&lt;``), so this loses nothing.
+    found: List[Tuple[str, Optional[str]]] = []
+    for loc, lastmod in urls:
+        canonical = _english_doc_url(loc)
+        if canonical is not None:
+            found.append((canonical, lastmod))
 
-    Args:
-        content: Raw XML content bytes
+    if not found:
+        raise RuntimeError(
+            f"Discovery source failed: sitemap {sitemap_url} yielded zero English "
+            f"documentation pages — aborting the run (fail closed)."
+        )
+    logger.info(f"  {sitemap_url}: {len(found)} English pages")
+    return found
 
-    Returns:
-        Parsed XML root element
 
-    Raises:
-        ValueError: If the content contains a DTD or entity declaration.
+def _english_doc_url(loc: str) -> Optional[str]:
+    """Canonical URL for an English documentation ``<loc>``, else None."""
+    parsed = urlparse(loc)
+    path = parsed.path
+    if path.endswith(".html"):
+        path = path[:-5]
+    path = path.rstrip("/")
+
+    # English documentation pages only (exclude /de/, /fr/, ... and non-doc URLs)
+    if not (path.startswith("/docs/en/") or path.startswith("/en/")):
+        return None
+    if any(skip in path for skip in ("/examples/", "/legacy/")):
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}{path}"
+
+
+def _allowed_children(index_url: str, children: List[str]) -> List[str]:
+    """
+    The child sitemaps of ``index_url`` that may be fetched: https on an
+    ``ALLOWED_DOMAINS`` host. Anything else is dropped loudly — an index is
+    remote input, and must not be able to steer the fetcher at arbitrary hosts.
+    """
+    allowed = []
+    for child in children:
+        parsed = urlparse(child)
+        if parsed.scheme == "https" and parsed.hostname in ALLOWED_DOMAINS:
+            allowed.append(child)
+        else:
+            logger.warning(f"Ignoring child sitemap outside the allowed domains: {child} (in {index_url})")
+    return allowed
+
+
+def _fetch_sitemap(
+    session: requests.Session, url: str, limiter: Optional[HostLimiter], cache: SourceCache
+) -> Dict:
+    """
+    GET ``url`` (conditionally, if cached) and stream its body through
+    :func:`parse_sitemap`, hashing the raw bytes on the way for the cache.
     """
-    if re.search(rb'<!(?:doctype|entity)', content, re.IGNORECASE):
+    def read_body(response: requests.Response) -> Tuple[Dict, str]:
+        digest = hashlib.sha256()
+
+        def chunks() -> Iterable[bytes]:
+            for chunk in response.iter_content(_READ_CHUNK):
+                digest.update(chunk)
+                yield chunk
+
+        doc = parse_sitemap(chunks())
+        return doc, digest.hexdigest()
+
+    info: Dict = {}
+    result = discovery_get(
+        session, url, limiter, read_body=read_body, validators=cache.validators(url), info=info
+    )
+    if result is None:
+        logger.info(f"  {url}: not modified (304)")
+        return cache.not_modified(url)
+    doc, sha256 = result
+    cache.record(url, sha256, info, doc)
+    return doc
+
+
+class _SitemapParser:
+    """
+    Incremental expat handler for ``<urlset>`` / ``<sitemapindex>`` documents.
+
+    Only elements in the sitemap namespace (or in no namespace — some hosts omit
+    it) are read, so extension elements such as ``<image:loc>`` can never be
+    mistaken for page URLs.
+    """
+
+    def __init__(self):
+        self.kind: Optional[str] = None
+        self.urls: List[Tuple[str, Optional[str]]] = []
+        self.children: List[str] = []
+        self._stack: List[Optional[str]] = []
+        self._fields: Dict[str, str] = {}
+        self._text: Optional[List[str]] = None
+
+        self._parser = expat.ParserCreate(namespace_separator=" ")
+        self._parser.buffer_text = True
+        self._parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+        self._parser.StartDoctypeDeclHandler = self._reject_dtd
+        self._parser.EntityDeclHandler = self._reject_dtd
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._chars
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        try:
+            self._parser.Parse(data, final)
+        except expat.ExpatError as e:
+            raise ValueError(f"Malformed sitemap XML: {e}") from e
+
+    @staticmethod
+    def _reject_dtd(*args) -> None:
+        # Raised from the first DOCTYPE event, before any declaration inside it
+        # is processed: no DTD, no entity expansion (XXE / billion laughs).
         logger.error(
             "Rejecting XML containing a DTD/ENTITY declaration "
             "(possible XXE / billion-laughs payload) — sitemaps never declare DTDs."
         )
         raise ValueError("XML contains DTD/ENTITY declaration; refusing to parse")
-    return ET.fromstring(content)
+
+    @staticmethod
+    def _local(name: str) -> Optional[str]:
+        namespace, _, local = name.rpartition(" ")
+        return local if namespace in ("", SITEMAP_NS) else None
+
+    def _start(self, name: str, attrs) -> None:
+        local = self._local(name)
+        self._stack.append(local)
+        depth = len(self._stack)
+        if depth == 1:
+            if local not in ("urlset", "sitemapindex"):
+                raise ValueError(f"Not a sitemap: root element <{name}>")
+            self.kind = local
+        elif depth == 2 and local in ("url", "sitemap"):
+            self._fields = {}
+        elif depth == 3 and local in ("loc", "lastmod") and self._stack[1] in ("url", "sitemap"):
+            self._text = []
+
+    def _chars(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+
+    def _end(self, name: str) -> None:
+        local = self._stack.pop()
+        depth = len(self._stack) + 1
+        if self._text is not None and depth == 3:
+            self._fields[local] = "".join(self._text).strip()
+            self._text = None
+        elif depth == 2 and self._fields.get("loc"):
+            if local == "url" and self.kind == "urlset":
+                self.urls.append((self._fields["loc"], self._fields.get("lastmod") or None))
+            elif local == "sitemap" and self.kind == "sitemapindex":
+                self.children.append(self._fields["loc"])
+
+
+def parse_sitemap(body: Union[bytes, Iterable[bytes]], limit: int = MAX_SITEMAP_BYTES) -> Dict:
+    """
+    Parse a sitemap or sitemap index from its raw body, plain or gzip-compressed.
+
+    ``body`` may be the whole document or an iterable of chunks (e.g.
+    ``response.iter_content()``); chunks are parsed as they arrive and gunzipped
+    incrementally when the body starts with the gzip magic bytes, whatever the
+    URL or Content-Type claims.
+
+    DTD and entity declarations are rejected outright (XXE / billion-laughs
+    defense): expat reports the DOCTYPE before reading anything declared in
+    it, and the handler refuses the document there. Neither can appear
+    legitimately in a sitemap, so this loses nothing.
+
+    Args:
+        body: Raw bytes, or an iterable of byte chunks.
+        limit: Maximum decompressed size (decompression-bomb bound).
+
+    Returns:
+        ``{"kind": "urlset" | "sitemapindex", "urls": [(loc, lastmod), ...],
+        "children": [child sitemap loc, ...]}``.
+
+    Raises:
+        ValueError: If the document is malformed, declares a DTD/entity, is not
+            a sitemap, is truncated gzip, or expands past ``limit``.
+    """
+    chunks = [body] if isinstance(body, (bytes, bytearray)) else body
+    parser = _SitemapParser()
+    total = 0
+
+    def feed(data: bytes) -> None:
+        nonlocal total
+        total += len(data)
+        if total > limit:
+            raise ValueError(f"Sitemap exceeds {limit} bytes uncompressed; refusing to parse")
+        parser.feed(data)
+
+    head = b""
+    inflate = None
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if head is not None:
+                # Hold back the first bytes until the gzip magic can be checked.
+                head += chunk
+                if len(head) < len(_GZIP_MAGIC):
+                    continue
+                chunk, head = head, None
+                if chunk.startswith(_GZIP_MAGIC):
+                    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            if inflate is None:
+                feed(chunk)
+                continue
+            # Bounded output per step, so a bomb is caught at `limit`, not in RAM.
+            feed(inflate.decompress(chunk, _READ_CHUNK))
+            while inflate.unconsumed_tail:
+                feed(inflate.decompress(inflate.unconsumed_tail, _READ_CHUNK))
+        if head:
+            feed(head)
+        if inflate is not None and not inflate.eof:
+            raise ValueError("Truncated gzip sitemap")
+    except zlib.error as e:
+        raise ValueError(f"Corrupt gzip sitemap: {e}") from e
+    parser.feed(b"", final=True)
+    return {"kind": parser.kind, "urls": parser.urls, "children": parser.children}
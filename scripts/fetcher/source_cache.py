@@ -0,0 +1,130 @@
+"""
+Discovery source cache: don't re-parse (or re-merge) sources that did not change.
+
+Most runs discover exactly the page set the previous run did. The cache keeps,
+for every discovery source URL (each llms.txt, each sitemap, each child of a
+sitemap index), the sha256 of its raw body, its ``etag`` / ``last_modified``
+and its parsed output, plus the merged page set the last run produced:
+
+- each source is requested conditionally; a 304 reuses the stored parsed
+  output, and so does a 200 whose body hashes the same as last time (llms.txt
+  is then not re-parsed; a sitemap is parsed while it streams, so only its
+  result is discarded);
+- when every source came back unchanged — and the set of sources is the same —
+  :func:`fetcher.discovery.discover_pages` returns the stored page set as is:
+  ``merge_discovery`` / ``_filter_allowed`` do not run again.
+
+Fail-closed is untouched: every source is still requested every run, and a
+source that errors still aborts it. The cache only stands in for *parsing*.
+
+It lives in the scratch dir (``discovery_cache.json``), like
+``fetch_state.json``: a missing, unreadable or outdated file just means a cold
+discovery. Bump ``CACHE_SCHEMA_VERSION`` whenever a parser's output changes, so
+no run reuses output the current code would not produce.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import ALLOWED_DOMAINS, DISCOVERY_CACHE_FILE, logger
+
+CACHE_SCHEMA_VERSION = 1
+
+
+def discovery_cache_path(scratch: Path) -> Path:
+    """Path to the discovery source cache inside the scratch dir."""
+    return scratch / DISCOVERY_CACHE_FILE
+
+
+class SourceCache:
+    """
+    One run's view of the discovery cache. Safe to share across the discovery
+    threads: lookups read the previous run's entries, and :meth:`record` /
+    :meth:`not_modified` build this run's.
+    """
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self._previous: Dict[str, Dict] = data.get("sources") or {}
+        self._previous_pages: Optional[List[Dict]] = data.get("pages")
+        # The stored page set went through _filter_allowed; a different allow
+        # list must re-filter, never reuse.
+        if data.get("allowed_domains") != list(ALLOWED_DOMAINS):
+            self._previous_pages = None
+        self._sources: Dict[str, Dict] = {}
+        self._changed: set = set()
+        self._lock = threading.Lock()
+        self.pages: Optional[List[Dict]] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "SourceCache":
+        """Load the cache, or an empty one (never fatal — the cost is a cold discovery)."""
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text())
+            if isinstance(data, dict) and data.get("schema_version") == CACHE_SCHEMA_VERSION:
+                return cls(data)
+            logger.info(f"Discovery cache {path} has an outdated schema; ignoring it")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable discovery cache {path}: {e}")
+        return cls()
+
+    def save(self, path: Path) -> None:
+        """Write this run's sources and page set (call only after discovery succeeded)."""
+        data = {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "allowed_domains": list(ALLOWED_DOMAINS),
+            "sources": self._sources,
+            "pages": self.pages,
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(data, sort_keys=True) + "\n")
+        os.replace(tmp, path)
+
+    def validators(self, url: str) -> Optional[Dict]:
+        """The previous response's ``etag`` / ``last_modified`` for ``url``, if any."""
+        return self._previous.get(url)
+
+    def lookup(self, url: str, sha256: str) -> Any:
+        """The stored parsed output if ``url``'s body still hashes to ``sha256``, else None."""
+        prev = self._previous.get(url)
+        if prev is not None and prev.get("sha256") == sha256:
+            return prev["parsed"]
+        return None
+
+    def not_modified(self, url: str) -> Any:
+        """Carry ``url`` over after a 304; returns its stored parsed output."""
+        prev = self._previous[url]
+        with self._lock:
+            self._sources[url] = prev
+        return prev["parsed"]
+
+    def record(self, url: str, sha256: str, info: Dict, parsed: Any) -> None:
+        """Store ``url``'s fresh body hash, validators and parsed output."""
+        entry = {"sha256": sha256, "parsed": parsed}
+        entry.update({k: info[k] for k in ("etag", "last_modified") if info.get(k)})
+        prev = self._previous.get(url)
+        with self._lock:
+            self._sources[url] = entry
+            if prev is None or prev.get("sha256") != sha256:
+                self._changed.add(url)
+
+    def unchanged(self, urls: Optional[Iterable[str]] = None) -> bool:
+        """
+        True if the stored page set still stands for ``urls`` (default: every
+        source this run saw, which must also be exactly the previous run's set).
+        """
+        if self._previous_pages is None:
+            return False
+        with self._lock:
+            if urls is None:
+                return not self._changed and set(self._sources) == set(self._previous)
+            return all(url in self._sources and url not in self._changed for url in urls)
+
+    @property
+    def previous_pages(self) -> Optional[List[Dict]]:
+        return self._previous_pages
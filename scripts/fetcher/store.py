@@ -0,0 +1,189 @@
+"""
+Content-addressed object store behind the scratch dir.
+
+Every body the fetcher keeps is stored exactly once, under its sha256:
+``<scratch>/.objects/<sha256[:2]>/<sha256>`` (read-only). The flat scratch
+filenames the index build and the carry-forward checks read
+(``claude-code__hooks.md``, ...) are hard links to those objects, so:
+
+- unchanged content is never rewritten — the filename already links to the
+  object, and :meth:`ObjectStore.link` is a no-op;
+- changed content lands as a new object and the filename is re-pointed with an
+  atomic rename, so a reader never sees a half-written file;
+- "does the scratch copy still match the manifest hash?" (304 revalidation,
+  incremental skips) is an inode comparison instead of a re-hash.
+
+The store lives inside the scratch dir, so it persists wherever the scratch dir
+does (the Actions cache in CI). On filesystems without hard links the filename
+gets a copy instead; everything still works, minus the savings.
+
+Each run also writes a small journal (``scratch_journal.json``) naming the
+scratch files whose content changed *in that fetch run*, so
+``build_search_index.py`` can tell new entries from carried-over ones.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from .config import OBJECT_STORE_DIR, SCRATCH_JOURNAL_FILE, logger
+
+JOURNAL_SCHEMA_VERSION = 1
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class ObjectStore:
+    """The ``.objects/`` store of one scratch dir. Safe to share across threads."""
+
+    def __init__(self, scratch: Path):
+        self.scratch = Path(scratch)
+        self.root = self.scratch / OBJECT_STORE_DIR
+
+    def object_path(self, sha256: str) -> Path:
+        return self.root / sha256[:2] / sha256
+
+    def holds(self, path: Path, sha256: Optional[str]) -> bool:
+        """True if ``path`` is a link to the object for ``sha256``."""
+        if not sha256:
+            return False
+        try:
+            return os.path.samefile(path, self.object_path(sha256))
+        except OSError:
+            return False
+
+    def add_file(self, tmp: Path, sha256: str) -> bool:
+        """
+        Move a finished temp file (already hashed to ``sha256``) into the store.
+
+        Returns:
+            True if the object is new; False if it was already stored (the temp
+            file is discarded — identical bytes are never written twice).
+        """
+        obj = self.object_path(sha256)
+        if obj.is_file():
+            Path(tmp).unlink(missing_ok=True)
+            return False
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        # Read-only: every scratch filename linked to it shares this inode.
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, obj)
+        return True
+
+    def temp_file(self, name: str) -> Tuple[int, Path]:
+        """
+        Open a new temp file in the store root for a body bound for ``name``:
+        ``(fd, path)``. Hand it to :meth:`add_file` once written; one an
+        interrupted run leaves behind is swept by :meth:`prune`.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=f".{name}.", suffix=".part")
+        return fd, Path(tmp)
+
+    def add_bytes(self, data: bytes) -> str:
+        """Store an in-memory body; returns its sha256."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        obj = self.object_path(sha256)
+        if not obj.is_file():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=obj.parent, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    out.write(data)
+                self.add_file(Path(tmp), sha256)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        return sha256
+
+    def link(self, filename: str, sha256: str) -> bool:
+        """
+        Point ``scratch/filename`` at the stored object for ``sha256``.
+
+        Returns:
+            True if the file's content changed (new this run); False if it
+            already had these bytes. An unlinked file that already holds the
+            same bytes (a scratch dir from before the store, or a copy on a
+            filesystem without hard links) is re-pointed but reported unchanged.
+        """
+        dest = self.scratch / filename
+        if self.holds(dest, sha256):
+            return False
+        unchanged = dest.is_file() and _file_sha256(dest) == sha256
+        # In the store root (same filesystem, so the rename stays atomic), where
+        # prune() finds it if the run dies before the rename.
+        tmp = self.root / f".{dest.name}.{os.getpid()}.{threading.get_ident()}.link"
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(self.object_path(sha256), tmp)
+        except OSError:
+            shutil.copyfile(self.object_path(sha256), tmp)
+        os.replace(tmp, dest)
+        return not unchanged
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """
+        Delete every object whose sha256 is not in ``keep``; returns the count.
+
+        Also sweeps ``.part`` / ``.link`` temp files — in the store root, a
+        shard dir, or the scratch dir itself (where older runs made them): the
+        run calls this after its last write, so any left are from an interrupted
+        one.
+        """
+        keep = set(keep)
+        removed = 0
+        if not self.root.is_dir():
+            return 0
+        stale = [
+            path
+            for directory, pattern in ((self.root, "*.part"), (self.root, "*/*.part"),
+                                       (self.root, ".*.link"), (self.scratch, ".*.part"),
+                                       (self.scratch, ".*.link"))
+            for path in directory.glob(pattern)
+        ]
+        for part in stale:
+            part.unlink(missing_ok=True)
+        for obj in self.root.glob("*/*"):
+            if obj.name not in keep and not obj.name.endswith(".part"):
+                obj.unlink(missing_ok=True)
+                removed += 1
+        if removed:
+            logger.info(f"Object store: pruned {removed} unreferenced object(s)")
+        if stale:
+            logger.info(f"Object store: removed {len(stale)} temp file(s) from interrupted runs")
+        return removed
+
+
+def journal_path(scratch: Path) -> Path:
+    return scratch / SCRATCH_JOURNAL_FILE
+
+
+def write_scratch_journal(scratch: Path, fetch_info: Dict[str, Dict], now: datetime) -> None:
+    """
+    Record which scratch files this fetch run changed (``info["scratch_changed"]``).
+
+    The journal describes one fetch run only. A consumer that needs "changed
+    since I last ran" must not assume every fetch run was followed by it.
+    """
+    new = sorted(name for name, info in fetch_info.items() if info.get("scratch_changed"))
+    journal = {
+        "schema_version": JOURNAL_SCHEMA_VERSION,
+        "generated_at": now.astimezone(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "new": new,
+    }
+    path = journal_path(scratch)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(journal, indent=2) + "\n")
+    os.replace(tmp, path)
+    logger.info(f"Scratch journal: {len(new)} file(s) with new content this run")
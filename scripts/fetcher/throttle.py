@@ -0,0 +1,600 @@
+"""
+Per-host request pacing for the concurrent page loop.
+
+The serial fetcher slept ``RATE_LIMIT_DELAY`` between *every* request, whatever
+the host — so code.claude.com waited on platform.claude.com's share of the
+budget and vice versa. Now the loop runs a bounded worker pool and each host
+gets its own token bucket: requests to one host are paced independently of the
+others, and the pool keeps every host busy up to its own rate.
+
+Rate is only half of it: each host also gets an :class:`AIMDController` that
+bounds how many requests may be *in flight* to it. Healthy responses raise the
+bound additively; a 429 (or any response carrying ``Retry-After``) halves it and
+puts the whole host on hold for the advertised delay — every worker waits, not
+just the one that got throttled. The pool thus runs as fast as the origin
+tolerates and backs off together when it pushes back.
+
+Outages are the third half: a per-host :class:`CircuitBreaker` opens after
+``CIRCUIT_FAILURE_THRESHOLD`` consecutive failed requests, after which requests
+to that host fail instantly with :class:`HostUnavailable` (re-probed once per
+``CIRCUIT_COOLDOWN``), and a run-wide :class:`RetryBudget` caps the total number
+of retries. A dead host therefore costs seconds, not ``pages x MAX_RETRIES``
+backoff sleeps — its pages go straight to carry-forward and the manifest
+safeguards decide whether the run may publish.
+
+A :class:`HostLimiter` is shared by all workers of a run (discovery included).
+Fetch functions take it as an optional ``limiter`` argument and route each HTTP
+request (retries included) through :func:`limited_get` — or
+:func:`limited_request` for a streamed body, so the slot covers the download —
+without one they behave exactly as before (unpaced, each 429 slept on alone).
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from .config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_COOLDOWN,
+    RETRY_BUDGET,
+    HOST_INITIAL_CONCURRENCY,
+    HOST_MAX_CONCURRENCY,
+    AIMD_INCREASE,
+    AIMD_DECREASE,
+    logger,
+)
+
+# Retry-After handling: default when the header is absent/unparseable, and a hard
+# cap so a hostile/buggy header can never stall the pipeline for hours.
+DEFAULT_RETRY_AFTER = 60
+MAX_RETRY_AFTER = 300
+
+
+def retry_after_seconds(response) -> int:
+    """
+    Parse a response's Retry-After header defensively.
+
+    HTTP allows either delta-seconds or an HTTP-date; a bare ``int()`` raises
+    ValueError on the date form (killing the page for the run via the wrong
+    handler). Unparseable/absent values fall back to ``DEFAULT_RETRY_AFTER``;
+    the result is clamped to ``[0, MAX_RETRY_AFTER]``.
+    """
+    raw = response.headers.get('Retry-After', DEFAULT_RETRY_AFTER)
+    try:
+        seconds = int(raw)
+    except (TypeError, ValueError):
+        logger.warning(f"Unparseable Retry-After header {raw!r}; defaulting to {DEFAULT_RETRY_AFTER}s")
+        seconds = DEFAULT_RETRY_AFTER
+    return max(0, min(seconds, MAX_RETRY_AFTER))
+
+
+def is_throttle_response(response) -> bool:
+    """True for a 429, or any error response that tells us when to come back."""
+    status = getattr(response, "status_code", None)
+    if status == 429:
+        return True
+    headers = getattr(response, "headers", None) or {}
+    return isinstance(status, int) and status >= 500 and "Retry-After" in headers
+
+
+class TokenBucket:
+    """
+    Classic token bucket: ``rate`` tokens/second, at most ``burst`` banked.
+
+    Thread-safe. :meth:`acquire` blocks until a token is available. ``clock`` and
+    ``sleep`` are injectable so tests can drive time deterministically.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError(f"token bucket rate must be positive, got {rate!r}")
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                wait = (1.0 - self._tokens) / self.rate
+            # Sleep OUTSIDE the lock so other hosts' workers (and this bucket's
+            # refill bookkeeping) are never serialized behind a sleeper.
+            self._sleep(wait)
+            waited += wait
+
+
+def _add_wait(waits: Optional[Dict[str, float]], kind: str, seconds: float) -> None:
+    if waits is not None and seconds > 0:
+        waits[kind] = waits.get(kind, 0.0) + seconds
+
+
+class AIMDController:
+    """
+    Adaptive in-flight limit for one host: additive increase, multiplicative decrease.
+
+    :meth:`acquire` blocks while the host is on hold or ``in_flight`` has reached
+    the current limit, and returns a ticket for :meth:`release`. Each healthy
+    release adds ``increase / limit`` (about ``+increase`` per full window of
+    requests, TCP-style); a throttled one multiplies the limit by ``decrease``
+    and holds the host for ``retry_after`` seconds. Only the first throttle per
+    window cuts the limit: requests already in flight when it was cut carry an
+    older ticket, so a burst of 429s from one overload halves once, not N times.
+
+    Args:
+        initial: Starting limit (requests in flight).
+        maximum: Ceiling for the additive increase.
+        minimum: Floor for the multiplicative decrease (never below 1).
+        increase, decrease: AIMD parameters.
+        clock, sleep: Injectable time sources (tests).
+    """
+
+    def __init__(
+        self,
+        initial: float = HOST_INITIAL_CONCURRENCY,
+        maximum: float = HOST_MAX_CONCURRENCY,
+        minimum: float = 1,
+        increase: float = AIMD_INCREASE,
+        decrease: float = AIMD_DECREASE,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if not 0 < decrease < 1:
+            raise ValueError(f"AIMD decrease must be in (0, 1), got {decrease!r}")
+        self.minimum = max(1.0, float(minimum))
+        self.maximum = max(self.minimum, float(maximum))
+        self.limit = min(self.maximum, max(self.minimum, float(initial)))
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self._clock = clock
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        self._epoch = 0
+        self._hold_until = 0.0
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.min_limit = self.limit
+        self.throttle_events = 0
+        self.decreases = 0
+        self.held_seconds = 0.0
+
+    def acquire(self, waits: Optional[Dict[str, float]] = None,
+                deadline: Optional[float] = None) -> int:
+        """
+        Wait for a slot (and for any hold to lapse). Returns the ticket for :meth:`release`.
+
+        ``waits`` (optional) accumulates the seconds spent: ``"throttle"`` for
+        sitting out a Retry-After hold, ``"pacing"`` for waiting on a free slot.
+
+        Raises:
+            DeadlineReached: ``deadline`` (a clock value) has passed, or a hold
+                would outlast it — the wait is refused rather than slept.
+        """
+        with self._cond:
+            while True:
+                now = self._clock()
+                hold = self._hold_until - now
+                if deadline is not None and now + max(0.0, hold) >= deadline:
+                    raise DeadlineReached("run deadline reached while waiting on the host")
+                if hold > 0:
+                    # Sleep outside the condition so releases (and other hosts)
+                    # proceed; re-check afterwards — the hold may have been extended.
+                    self._cond.release()
+                    try:
+                        self._sleep(hold)
+                    finally:
+                        self._cond.acquire()
+                    _add_wait(waits, "throttle", hold)
+                    continue
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return self._epoch
+                started = self._clock()
+                self._cond.wait()
+                _add_wait(waits, "pacing", self._clock() - started)
+
+    def release(self, ticket: int, throttled: bool = False, retry_after: float = 0.0,
+                healthy: bool = True) -> None:
+        """
+        Return a slot and feed the outcome back into the limit.
+
+        ``throttled`` (a 429 / Retry-After) cuts the limit and holds the host for
+        ``retry_after`` seconds; otherwise a ``healthy`` response grows it. An
+        unhealthy non-throttle outcome (network error, 5xx) leaves it alone —
+        that is the retry/backoff path's business, not a congestion signal.
+        """
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if throttled:
+                self.throttle_events += 1
+                if ticket == self._epoch:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self.min_limit = min(self.min_limit, self.limit)
+                    self.decreases += 1
+                    self._epoch += 1
+                until = self._clock() + max(0.0, retry_after)
+                if until > self._hold_until:
+                    self.held_seconds += until - max(self._hold_until, self._clock())
+                    self._hold_until = until
+            elif healthy:
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current limit and throttle counters (for logs / run metrics)."""
+        with self._cond:
+            return {
+                "concurrency": round(self.limit, 2),
+                "peak_concurrency": round(self.peak_limit, 2),
+                "min_concurrency": round(self.min_limit, 2),
+                "in_flight": self.in_flight,
+                "throttle_events": self.throttle_events,
+                "decreases": self.decreases,
+                "held_seconds": round(self.held_seconds, 3),
+            }
+
+
+class HostUnavailable(Exception):
+    """
+    Raised instead of issuing a request to a host whose circuit is open.
+
+    Deliberately NOT a ``requests`` exception: the fetch functions' retry loops
+    only catch those, so this propagates straight out to the caller's
+    carry-forward (pages) or fail-closed (discovery) handling.
+    """
+
+
+class DeadlineReached(Exception):
+    """
+    Raised instead of waiting or retrying past the run's deadline.
+
+    Like :class:`HostUnavailable`, not a ``requests`` exception: it propagates
+    out of the retry loops, and the page is carried forward as deferred.
+    """
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one host.
+
+    ``closed`` -> ``open`` after ``threshold`` consecutive failures; while open,
+    :meth:`allow` refuses. After ``cooldown`` seconds one probe is let through
+    (``half_open``): success closes the circuit, failure re-opens it for
+    another cooldown, and a probe that ends with neither (throttled, or never
+    sent) is handed back via :meth:`release_probe`. Thread-safe; ``clock`` is
+    injectable (tests).
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = max(1, int(threshold))
+        self.cooldown = float(cooldown)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """True if a request may be issued now (claims the probe when half-open)."""
+        with self._lock:
+            if self.state == "open" and self._clock() - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.state == "open"
+
+    def release_probe(self) -> None:
+        """Let the next request probe again: the claimed probe produced no outcome."""
+        with self._lock:
+            self._probing = False
+
+    def record(self, success: bool) -> None:
+        """Feed one request outcome back (``False`` = network error / 5xx)."""
+        with self._lock:
+            if success:
+                self.state = "closed"
+                self.failures = 0
+                self._probing = False
+                return
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.opened += 1
+                self.state = "open"
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+class RetryBudget:
+    """Run-wide cap on retries (all hosts, all pages). Thread-safe."""
+
+    def __init__(self, total: int = RETRY_BUDGET):
+        self.total = max(0, int(total))
+        self.spent = 0
+        self._lock = threading.Lock()
+
+    def spend(self) -> bool:
+        """Take one retry from the budget; ``False`` once it is exhausted."""
+        with self._lock:
+            if self.spent >= self.total:
+                return False
+            self.spent += 1
+            return True
+
+
+def url_host(url: str) -> str:
+    """Hostname of a URL (the key every per-host control is indexed by)."""
+    return urlparse(url).hostname or ""
+
+
+class HostLimiter:
+    """
+    Registry of per-host pacing state — a token bucket (rate) and an
+    :class:`AIMDController` (concurrency) per host, created lazily on first use.
+
+    Args:
+        rate: Requests per second allowed to each host (a hard ceiling; AIMD
+            adapts concurrency underneath it).
+        burst: Tokens each host may bank (requests it may issue back-to-back).
+        initial_concurrency, max_concurrency: Each host's AIMD starting limit and
+            ceiling.
+        failure_threshold, cooldown: Each host's circuit breaker settings.
+        retry_budget: Total retries allowed across the run.
+        deadline: Optional ``clock`` value after which no slot wait, Retry-After
+            hold or retry is started (:class:`DeadlineReached`).
+        clock, sleep: Injectable time sources (tests).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        initial_concurrency: float = HOST_INITIAL_CONCURRENCY,
+        max_concurrency: float = HOST_MAX_CONCURRENCY,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN,
+        retry_budget: int = RETRY_BUDGET,
+        deadline: Optional[float] = None,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.retries = RetryBudget(retry_budget)
+        self.deadline = deadline
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._controllers: Dict[str, AIMDController] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        """The token bucket for ``host`` (created on first use)."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst, self._clock, self._sleep)
+                self._buckets[host] = bucket
+            return bucket
+
+    def controller(self, host: str) -> AIMDController:
+        """The AIMD concurrency controller for ``host`` (created on first use)."""
+        with self._lock:
+            controller = self._controllers.get(host)
+            if controller is None:
+                controller = AIMDController(
+                    self.initial_concurrency, self.max_concurrency,
+                    clock=self._clock, sleep=self._sleep,
+                )
+                self._controllers[host] = controller
+            return controller
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """The circuit breaker for ``host`` (created on first use)."""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.cooldown, self._clock)
+                self._breakers[host] = breaker
+            return breaker
+
+    def acquire(self, url: str) -> float:
+        """Block until ``url``'s host may be requested again. Returns seconds waited."""
+        return self.bucket(url_host(url)).acquire()
+
+    def should_retry(self, url: str) -> bool:
+        """
+        Whether a failed request to ``url`` may be retried (and slept on) at all.
+
+        ``False`` when its host's circuit has opened, the run's retry budget
+        is spent or its deadline has passed — the caller should give up on the
+        page immediately.
+        """
+        if self.breaker(url_host(url)).is_open():
+            return False
+        if self.deadline is not None and self._clock() >= self.deadline:
+            return False
+        return self.retries.spend()
+
+    def begin(self, url: str, waits: Optional[Dict[str, float]] = None) -> int:
+        """
+        Take a concurrency slot, then a rate token, for ``url``. Returns the AIMD ticket.
+
+        ``waits`` (optional) accumulates the time spent, split into ``"throttle"``
+        (Retry-After holds) and ``"pacing"`` (slot + token waits).
+
+        Raises:
+            HostUnavailable: ``url``'s host circuit is open (no request is made).
+            DeadlineReached: The run's deadline passed, or the host's Retry-After
+                hold outlasts it (no request is made).
+        """
+        host = url_host(url)
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise HostUnavailable(f"{host}: circuit open after repeated failures — not requesting {url}")
+        try:
+            ticket = self.controller(host).acquire(waits, self.deadline)
+        except BaseException:
+            breaker.release_probe()
+            raise
+        try:
+            _add_wait(waits, "pacing", self.acquire(url))
+        except BaseException:
+            self.controller(host).release(ticket, healthy=False)
+            breaker.release_probe()
+            raise
+        return ticket
+
+    def finish(self, url: str, ticket: int, response=None) -> Optional[int]:
+        """
+        Release ``url``'s slot and report the outcome to its host's controller.
+
+        Returns the Retry-After hold (seconds) when the response was a throttle
+        signal — the whole host is already on hold, so the caller must not sleep
+        on it again — else ``None``. ``response=None`` means the request raised.
+        """
+        controller = self.controller(url_host(url))
+        status = getattr(response, "status_code", None)
+        throttled = response is not None and is_throttle_response(response)
+        if not throttled:
+            # A 429 is the origin pacing us (AIMD's job), not an outage; a 4xx is
+            # a page problem on a healthy host. Errors and 5xx count against it.
+            reachable = isinstance(status, int) and status < 500
+            breaker = self.breaker(url_host(url))
+            was_open = breaker.is_open()
+            breaker.record(reachable)
+            if breaker.is_open() and not was_open:
+                logger.error(
+                    f"{url_host(url)}: circuit OPEN after {breaker.failures} consecutive "
+                    f"failures — remaining requests fail fast (re-probe in {breaker.cooldown:g}s)"
+                )
+        if throttled:
+            # Neither outcome for the breaker, but a half-open probe must not stay claimed.
+            self.breaker(url_host(url)).release_probe()
+            wait = retry_after_seconds(response)
+            controller.release(ticket, throttled=True, retry_after=wait)
+            logger.warning(
+                f"{url_host(url)}: throttled (HTTP {response.status_code}) — holding host "
+                f"{wait}s, concurrency -> {controller.limit:.2f}"
+            )
+            return wait
+        healthy = isinstance(status, int) and status < 400
+        controller.release(ticket, healthy=healthy)
+        return None
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-host concurrency, throttle and circuit counters, keyed by hostname."""
+        with self._lock:
+            controllers = dict(self._controllers)
+            breakers = dict(self._breakers)
+        metrics = {}
+        for host in sorted(set(controllers) | set(breakers)):
+            m = self.controller(host).snapshot()
+            b = self.breaker(host)
+            m.update(circuit=b.state, circuit_opened=b.opened, requests_rejected=b.rejected)
+            metrics[host] = m
+        return metrics
+
+
+def limited_get(
+    session,
+    url: str,
+    limiter: Optional[HostLimiter] = None,
+    waits: Optional[Dict[str, float]] = None,
+    **kwargs,
+):
+    """
+    ``session.get`` paced through ``limiter`` (a plain GET when it is None).
+
+    With a limiter the request holds one of its host's AIMD slots until
+    ``session.get`` returns, and its outcome (429 / Retry-After, healthy, error)
+    is fed back before returning. For a buffered GET that covers the body; a
+    ``stream=True`` body is read after the slot is gone — use
+    :func:`limited_request` for those. The response is returned unchanged
+    either way. ``waits`` collects the time the request spent queued (see
+    :meth:`HostLimiter.begin`).
+    """
+    with limited_request(session, url, limiter, waits, **kwargs) as response:
+        return response
+
+
+@contextmanager
+def limited_request(
+    session,
+    url: str,
+    limiter: Optional[HostLimiter] = None,
+    waits: Optional[Dict[str, float]] = None,
+    **kwargs,
+):
+    """
+    :func:`limited_get` as a context manager: the slot is held until the block exits.
+
+    Read a streamed body inside the block, so the download counts against its
+    host's concurrency and its outcome reaches the controller and the circuit
+    breaker. That is the response's when the block completes, rejects the
+    content (``ValueError`` — a page problem on a reachable host) or raises an
+    error carrying the response (``requests``' ``HTTPError``); anything else
+    escaping the block, such as a connection dropped mid-body, is a failed
+    request.
+    """
+    if limiter is None:
+        yield session.get(url, **kwargs)
+        return
+    ticket = limiter.begin(url, waits)
+    response = None
+    outcome = None
+    try:
+        response = session.get(url, **kwargs)
+        outcome = response
+        try:
+            yield response
+        except BaseException as e:
+            if not isinstance(e, ValueError) and getattr(e, "response", None) is None:
+                outcome = None
+            raise
+    finally:
+        limiter.finish(url, ticket, outcome)
@@ -1,5 +1,6 @@
 """v2 search-index unit tests: schema, headings, stemmed terms, forbidden-field absence."""
 
+import hashlib
 import json
 import sys
 from pathlib import Path
@@ -9,6 +10,7 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
 import build_search_index as bsi
+from fetcher import analysis as page_analysis
 
 SAMPLE_MD = """# Hooks
 
@@ -37,7 +39,7 @@ ENTRY = {
     "category": "claude_code",
 }
 
-ALLOWED_KEYS = {"filename", "id", "title", "category", "url", "headings", "terms", "word_count"}
+ALLOWED_KEYS = {"filename", "id", "title", "category", "url", "sha256", "headings", "terms", "word_count"}
 FORBIDDEN_KEYS = {"content_preview", "preview", "file_path", "keywords", "positions", "ngrams"}
 
 
@@ -175,6 +177,50 @@ class TestIndexCarryForward:
         assert page["word_count"] == len(SAMPLE_MD.split())  # rebuilt, not carried
         assert page["terms"] != self.OLD_RECORD["terms"]
 
+    def test_record_reused_while_sha256_matches(self, tmp_path, capsys):
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        (scratch / "claude-code__hooks.md").write_text(SAMPLE_MD)
+        entry = dict(ENTRY, sha256=hashlib.sha256(SAMPLE_MD.encode()).hexdigest(), fetch_status="ok")
+        first, _ = bsi.build_index({"pages": [entry]}, scratch)
+        assert first["pages"][0]["sha256"] == entry["sha256"]
+
+        # Same sha256: the old record is reused, even over a different scratch file.
+        (scratch / "claude-code__hooks.md").write_text("# Other\n\nunrelated words\n")
+        old = {"claude-code__hooks.md": dict(first["pages"][0], title="Old title")}
+        again, carried = bsi.build_index({"pages": [entry]}, scratch, old)
+        assert again["pages"] == first["pages"] and carried == 0  # title stays manifest-fresh
+        assert "1 unchanged since the last index, 0 carried forward" in capsys.readouterr().out
+
+        # New sha256: re-tokenized from scratch, stamped with the bytes analyzed.
+        changed = dict(entry, sha256="f" * 64)
+        third, carried = bsi.build_index({"pages": [changed]}, scratch, old)
+        page = third["pages"][0]
+        assert page["headings"] == [{"text": "Other", "level": 1}] and carried == 0
+        assert page["sha256"] == hashlib.sha256(b"# Other\n\nunrelated words\n").hexdigest()
+
+    def test_stale_or_other_analyzer_record_is_not_reused(self, tmp_path, capsys):
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        entry = dict(ENTRY, sha256="a" * 64, fetch_status="ok")
+        old = {"claude-code__hooks.md": dict(self.OLD_RECORD, sha256="a" * 64)}
+        # A stale page's record was not confirmed by this run: carried, not reused.
+        index, carried = bsi.build_index({"pages": [dict(entry, fetch_status="stale")]}, scratch, old)
+        assert carried == 1 and index["pages"][0]["terms"] == self.OLD_RECORD["terms"]
+        assert "0 unchanged since the last index, 1 carried forward" in capsys.readouterr().out
+        # Another analyzer version: re-read from scratch, the old record only a fallback.
+        (scratch / "claude-code__hooks.md").write_text(SAMPLE_MD)
+        index, carried = bsi.build_index({"pages": [entry]}, scratch, old, reuse_old=False)
+        assert carried == 0 and index["pages"][0]["terms"] == bsi.extract_terms(SAMPLE_MD)
+        assert index["analyzer_version"] == bsi.ANALYZER_VERSION
+
+    def test_carried_record_keeps_its_own_sha256(self, tmp_path):
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        old = {"claude-code__hooks.md": dict(self.OLD_RECORD, sha256="a" * 64)}
+        index, carried = bsi.build_index({"pages": [dict(ENTRY, sha256="b" * 64)]}, scratch, old)
+        assert carried == 1 and index["pages"][0]["sha256"] == "a" * 64
+
     def test_load_existing_index(self, tmp_path):
         path = tmp_path / "search_index.json"
         assert bsi.load_existing_index(path) == {}  # missing -> no carry-forward
@@ -231,6 +277,24 @@ class TestCarryShareGuard:
         bsi.check_carry_share(carried=0, total=10, max_share=0.0)  # no raise
 
 
+class TestWorkerCount:
+    def test_unset_or_empty_uses_default(self, monkeypatch):
+        monkeypatch.delenv("DOCS_INDEX_WORKERS", raising=False)
+        assert bsi._parse_worker_count("DOCS_INDEX_WORKERS", 4) == 4
+        monkeypatch.setenv("DOCS_INDEX_WORKERS", " ")
+        assert bsi._parse_worker_count("DOCS_INDEX_WORKERS", 4) == 4
+        monkeypatch.setenv("DOCS_INDEX_WORKERS", "1")
+        assert bsi._parse_worker_count("DOCS_INDEX_WORKERS", 4) == 1
+
+    @pytest.mark.parametrize("raw", ["0", "-2", "1.5", "many"])
+    def test_rejects_non_positive_counts(self, monkeypatch, capsys, raw):
+        monkeypatch.setenv("DOCS_INDEX_WORKERS", raw)
+        with pytest.raises(SystemExit):
+            bsi._parse_worker_count("DOCS_INDEX_WORKERS", 4)
+        err = capsys.readouterr().err
+        assert "positive number of processes" in err and "guard" not in err
+
+
 class TestBuildIndex:
     def test_build_and_save_roundtrip(self, tmp_path):
         scratch = tmp_path / "scratch"
@@ -249,3 +313,213 @@ class TestBuildIndex:
         # Whole-index forbidden-field sweep.
         for p in reloaded["pages"]:
             assert not (set(p.keys()) & FORBIDDEN_KEYS)
+
+    def test_process_pool_output_is_byte_identical(self, tmp_path, capsys):
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        entries = []
+        for n in range(12):
+            entry = dict(ENTRY, id=f"claude-code/p{n}", filename=f"claude-code__p{n}.md", sha256=f"s{n}")
+            entries.append(entry)
+            if n % 4 == 1:
+                continue  # missing: carried forward
+            (scratch / entry["filename"]).write_text("" if n == 6 else SAMPLE_MD.replace("Hooks", f"Hooks{n}"))
+        old = {e["filename"]: dict(TestIndexCarryForward.OLD_RECORD, filename=e["filename"]) for e in entries}
+        records = {"claude-code__p3.md": dict(bsi.analyze_content("# Pre\n\nrecorded"), sha256="s3")}
+
+        def build(workers):
+            index, carried = bsi.build_index({"pages": entries}, scratch, old, None, records, workers=workers)
+            del index["generated_at"]
+            return json.dumps(index, indent=2), carried, capsys.readouterr().out
+
+        serial, pooled = build(1), build(3)
+        assert serial == pooled
+        assert serial[1] == 4  # three missing files and the empty one
+
+    def test_unchanged_index_is_not_rewritten(self, tmp_path):
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        (scratch / "claude-code__hooks.md").write_text(SAMPLE_MD)
+        out = tmp_path / "search_index.json"
+        index, _ = bsi.build_index({"pages": [ENTRY]}, scratch)
+        assert bsi.save_index(index, out) is True
+        written = out.read_text()
+
+        again, _ = bsi.build_index({"pages": [ENTRY]}, scratch)
+        again["generated_at"] = "2099-01-01T00:00:00Z"
+        assert again["content_hash"] == index["content_hash"]
+        assert bsi.save_index(again, out) is False
+        assert out.read_text() == written
+
+
+class TestScratchJournal:
+    def test_reads_new_filenames(self, tmp_path, capsys):
+        (tmp_path / "claude-code__hooks.md").write_text(SAMPLE_MD)
+        (tmp_path / bsi.SCRATCH_JOURNAL_FILE).write_text(
+            json.dumps({"schema_version": 1, "new": ["claude-code__hooks.md", "gone.md"]})
+        )
+        new_files = bsi.load_scratch_journal(tmp_path)
+        assert new_files == {"claude-code__hooks.md", "gone.md"}
+        bsi.build_index({"pages": [ENTRY]}, tmp_path, new_files=new_files)
+        assert "1 new this fetch run" in capsys.readouterr().out
+
+    def test_missing_or_unreadable_means_unknown(self, tmp_path):
+        assert bsi.load_scratch_journal(tmp_path) is None
+        (tmp_path / bsi.SCRATCH_JOURNAL_FILE).write_text("{ not json")
+        assert bsi.load_scratch_journal(tmp_path) is None
+
+
+class TestIndexRecords:
+    def test_analyze_content_matches_extractors(self):
+        analysis = bsi.analyze_content(SAMPLE_MD)
+        assert analysis == {
+            "headings": bsi.extract_headings(SAMPLE_MD),
+            "terms": bsi.extract_terms(SAMPLE_MD),
+            "word_count": len(SAMPLE_MD.split()),
+        }
+
+    def test_matching_record_used_without_reading_scratch(self, tmp_path, capsys):
+        record = dict(bsi.analyze_content(SAMPLE_MD), sha256="abc")
+        (tmp_path / bsi.INDEX_RECORDS_FILE).write_text(
+            json.dumps({"schema_version": 1, "analyzer_version": bsi.ANALYZER_VERSION,
+                        "records": {ENTRY["filename"]: record}})
+        )
+        records = bsi.load_index_records(tmp_path)
+        entry = dict(ENTRY, sha256="abc", fetch_status="ok")
+        index, carried = bsi.build_index({"pages": [entry]}, tmp_path, records=records)
+        page = index["pages"][0]
+        assert page["terms"] == record["terms"] and page["headings"] == record["headings"]
+        assert set(page) == ALLOWED_KEYS and carried == 0
+        assert "1 from fetcher records" in capsys.readouterr().out
+
+    def test_stale_record_falls_back_to_scratch(self, tmp_path):
+        (tmp_path / ENTRY["filename"]).write_text("# Hooks\n\nFresh words only.\n")
+        records = {ENTRY["filename"]: dict(bsi.analyze_content(SAMPLE_MD), sha256="old")}
+        index, _carried = bsi.build_index({"pages": [dict(ENTRY, sha256="new")]}, tmp_path, records=records)
+        assert "matcher" not in index["pages"][0]["terms"]
+        assert "fresh" in index["pages"][0]["terms"]
+
+    def test_missing_or_unreadable_records(self, tmp_path):
+        assert bsi.load_index_records(tmp_path) == {}
+        (tmp_path / bsi.INDEX_RECORDS_FILE).write_text("{ not json")
+        assert bsi.load_index_records(tmp_path) == {}
+        (tmp_path / bsi.INDEX_RECORDS_FILE).write_text(json.dumps(
+            {"schema_version": 1, "analyzer_version": bsi.ANALYZER_VERSION - 1, "records": {"a.md": {}}}
+        ))
+        assert bsi.load_index_records(tmp_path) == {}  # another analyzer's output
+
+
+class TestSections:
+    def test_split_at_headings_outside_code(self):
+        sections = bsi.split_sections("intro\n" + SAMPLE_MD + "## Hooks\n\nagain\n")
+        assert "".join(text for _, text in sections) == "intro\n" + SAMPLE_MD + "## Hooks\n\nagain\n"
+        assert sections[0] == ("", "intro\n")
+        # One section per index heading (the "# this comment" in the fence is not one).
+        assert len(sections) - 1 == len(bsi.extract_headings(SAMPLE_MD)) + 1
+        keys = [key for key, _ in sections[1:]]
+        assert len(set(keys)) == len(keys)  # repeated "Hooks" gets its own -1 anchor
+        assert bsi.split_sections(SAMPLE_MD)[0][0] != ""  # no blank intro section
+
+    def test_keys_survive_body_edits(self):
+        edited = SAMPLE_MD.replace("Configure your hooks", "Configure every hook")
+        before, after = bsi.split_sections(SAMPLE_MD), bsi.split_sections(edited)
+        assert [k for k, _ in before] == [k for k, _ in after]
+        changed = [k for (k, a), (_, b) in zip(before, after) if bsi.section_hash(a) != bsi.section_hash(b)]
+        assert changed == [before[1][0]]
+
+    def test_section_reuse_matches_full_analysis(self, monkeypatch):
+        page = "# Changelog\n\n" + "".join(f"## 1.0.{v}\n\n- Fixed hooks release {v}\n\n" for v in range(30))
+        analysis, sections = bsi.analyze_sections(page)
+        assert analysis == bsi.analyze_content(page)
+        edited = page.replace("release 7\n", "release 7 with matchers\n")
+        calls = []
+        real = page_analysis._term_counts
+        monkeypatch.setattr(page_analysis, "_term_counts", lambda text: calls.append(text) or real(text))
+        again, _ = bsi.analyze_sections(edited, sections)
+        assert len(calls) == 1  # only the edited section is re-tokenized
+        monkeypatch.undo()
+        assert again == bsi.analyze_content(edited) and "matcher" in again["terms"]
+
+    def test_inline_code_across_a_heading_is_split_with_the_page(self):
+        page = "Intro `alpha\n\n## Heading\n\nbeta` gamma\n"
+        whole = page_analysis._terms(page_analysis._strip_code_blocks(page))
+        assert set(whole) == {"intro", "gamma"}  # one span, alpha...beta, removed
+        # Per section neither half holds a pair of backticks, so nothing is removed.
+        assert set(bsi.analyze_content(page)["terms"]) == {"intro", "alpha", "head", "beta", "gamma"}
+        assert bsi.ANALYZER_VERSION == 2  # the version that made the section bag the definition
+
+
+class TestPostings:
+    def test_inverted_view_of_the_index(self, tmp_path):
+        scratch = tmp_path / "scratch"
+        scratch.mkdir()
+        (scratch / "claude-code__hooks.md").write_text(SAMPLE_MD)
+        index, _ = bsi.build_index({"pages": [ENTRY]}, scratch)
+        postings = bsi.build_postings(index)
+        assert postings["content_hash"] == index["content_hash"]
+        assert postings["pages"] == [["claude-code__hooks.md", "Hooks"]]
+        freq = index["pages"][0]["terms"]["hook"]
+        assert postings["terms"]["hook"] == [[0, freq, bsi.bm25_weight(freq, index["pages"][0]["word_count"], 1, index["bm25"])]]
+        assert postings["filename_tokens"]["hooks"] == [0] and "md" in postings["filename_tokens"]
+        assert postings["heading_tokens"]["matchers"] == [[0, 2]]  # "Advanced Matchers"
+
+        path = bsi.postings_path(tmp_path / "search_index.json")
+        assert path.name == "search_index.postings.json"
+        assert bsi.save_postings(postings, path) is True
+        assert json.loads(path.read_text()) == postings
+        assert bsi.save_postings(postings, path) is False
+
+    def test_bm25_favors_rare_terms_and_short_pages(self):
+        pages = [
+            {"terms": {"claude": 3, "matcher": 3}, "word_count": 100},
+            {"terms": {"claude": 3}, "word_count": 100},
+            {"terms": {"claude": 3}, "word_count": 400},
+            {"terms": {}, "word_count": 0},
+        ]
+        stats = bsi.bm25_stats(pages)
+        assert stats["pages"] == 4 and stats["avgdl"] == 200 and stats["df"] == {"claude": 3, "matcher": 1}
+        assert bsi.bm25_weight(3, 100, 1, stats) > bsi.bm25_weight(3, 100, 3, stats)
+        assert bsi.bm25_weight(3, 100, 3, stats) > bsi.bm25_weight(3, 400, 3, stats) > 0
+        assert bsi.bm25_weight(3, 100, 3, stats) == round(bsi.bm25_weight(3, 100, 3, stats), 4)
+
+    def test_tokens_lowercase_ascii_only(self):
+        # jq's ascii_downcase leaves non-ASCII alone; U+0130 must not yield an "i".
+        assert bsi._match_tokens("\u0130nstall Node.js") == {"nstall", "node", "js"}
+
+
+class TestShards:
+    PAGES = [
+        {"filename": "a.md", "category": "claude_code", "terms": {"hook": 3}, "word_count": 100},
+        {"filename": "b.md", "category": "agent_sdk", "terms": {"hook": 1, "query": 2}, "word_count": 50},
+        {"filename": "c.md", "category": "claude_code", "terms": {"skill": 4}, "word_count": 80},
+    ]
+
+    def index(self, pages):
+        index = {"schema_version": 2, "generated_at": "2026-01-01T00:00:00Z",
+                 "content_hash": None, "bm25": bsi.bm25_stats(pages), "pages": pages}
+        index["content_hash"] = bsi.index_content_hash(index)
+        return index
+
+    def test_one_shard_per_category_with_collection_stats(self):
+        index = self.index(self.PAGES)
+        shards, catalog = bsi.build_shards(index)
+        assert list(shards) == ["agent_sdk.json", "claude_code.json"]
+        code = shards["claude_code.json"]
+        assert [p["filename"] for p in code["pages"]] == ["a.md", "c.md"]
+        assert code["bm25"]["df"] == {"hook": 2, "skill": 1}  # hook: collection-wide count
+        assert code["bm25"]["avgdl"] == index["bm25"]["avgdl"]
+        assert code["content_hash"] == bsi.index_content_hash(code)
+        assert catalog["content_hash"] == index["content_hash"]
+        assert [(s["category"], s["pages"]) for s in catalog["shards"]] == [("agent_sdk", 1), ("claude_code", 2)]
+
+    def test_only_changed_shards_are_rewritten(self, tmp_path):
+        directory = tmp_path / "search_shards"
+        assert bsi.save_shards(self.index(self.PAGES), directory) == 2
+        # a.md's freq changed, df / avgdl did not: only claude_code is rewritten.
+        pages = [dict(self.PAGES[0], terms={"hook": 5})] + self.PAGES[1:]
+        assert bsi.save_shards(self.index(pages), directory) == 1
+        # A category with no pages left loses its shard.
+        assert bsi.save_shards(self.index(pages[:1]), directory) == 1
+        assert sorted(p.name for p in directory.iterdir()) == ["catalog.json", "claude_code.json"]
+        catalog = json.loads((directory / "catalog.json").read_text())
+        assert [s["file"] for s in catalog["shards"]] == ["claude_code.json"]
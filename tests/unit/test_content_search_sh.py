@@ -0,0 +1,109 @@
+"""Contract tests for plugin/skills/claude-docs/scripts/content-search.sh (offline, jq)."""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import build_search_index as bsi
+
+SEARCH = ROOT / "plugin" / "skills" / "claude-docs" / "scripts" / "content-search.sh"
+
+pytestmark = pytest.mark.skipif(
+    not shutil.which("jq") or not shutil.which("bash"),
+    reason="requires jq + bash",
+)
+
+QUERIES = [
+    ["hooks"], ["agent-sdk"], ["mcp", "server"], ["streaming", "messages"], ["md"],
+    ["prompt", "caching"], ["settings"], ["PreToolUse"], ["nothingmatchesthis"], ["sub", "agents"],
+]
+
+
+@pytest.fixture(scope="module")
+def published(tmp_path_factory):
+    """The committed index, re-saved the way the builder writes it now (with postings)."""
+    out = tmp_path_factory.mktemp("index")
+    index = json.loads((ROOT / "search_index.json").read_text())
+    index["bm25"] = bsi.bm25_stats(index["pages"])
+    index["content_hash"] = bsi.index_content_hash(index)
+    index_path = out / "search_index.json"
+    bsi.save_index(index, index_path)
+    bsi.save_postings(bsi.build_postings(index), bsi.postings_path(index_path))
+    bsi.save_shards(index, bsi.shard_dir(index_path))
+    return index_path
+
+
+def search(index_path, *words, tmp_path=None):
+    env = {"PATH": "/usr/bin:/bin:/usr/local/bin", "CLAUDE_DOCS_INDEX": str(index_path),
+           "CLAUDE_DOCS_CACHE_DIR": str(index_path.parent / "no-cache")}
+    r = subprocess.run(["bash", str(SEARCH), *words], env=env, capture_output=True, text=True)
+    return r.stdout
+
+
+def test_postings_and_scan_agree(published, tmp_path):
+    scan_index = tmp_path / "search_index.json"
+    shutil.copy(published, scan_index)  # no sidecar beside this copy
+    for words in QUERIES:
+        assert search(published, *words) == search(scan_index, *words), words
+    assert search(published, "hooks").splitlines()[0].startswith("claude-code__hooks")
+
+
+def test_scan_computes_the_builders_bm25_weight(tmp_path):
+    pages = [{"filename": f"p{n}.md", "title": f"Page {n}", "headings": [],
+              "terms": {"widget": 4 + n, "claude": 2}, "word_count": 90 + 70 * n} for n in range(3)]
+    pages[0]["terms"]["gizmo"] = 5
+    index = {"schema_version": 2, "bm25": bsi.bm25_stats(pages), "pages": pages}
+    index_path = tmp_path / "search_index.json"
+    index_path.write_text(json.dumps(index))
+    expected = {p["filename"]: bsi.bm25_weight(p["terms"]["widget"], p["word_count"], 3, index["bm25"])
+                for p in pages}
+    got = {line.split("\t")[0]: float(line.split("\t")[2]) for line in search(index_path, "widget").splitlines()}
+    assert got == expected
+    assert search(index_path, "gizmo").split("\t")[0] == "p0.md"
+
+    del index["bm25"]  # an index from before the statistics: sqrt(freq) x2
+    index_path.write_text(json.dumps(index))
+    assert search(index_path, "gizmo") == f"p0.md\tPage 0\t{5 ** 0.5 * 2}\n"
+
+
+def test_sidecar_used_only_while_its_hash_matches(published, tmp_path):
+    index_path = tmp_path / "search_index.json"
+    shutil.copy(published, index_path)
+    sidecar = bsi.postings_path(index_path)
+    sidecar.write_text(bsi.postings_path(published).read_text().replace('"Hooks reference"', '"From postings"'))
+    assert "From postings" in search(index_path, "hooks")
+
+    index = json.loads(index_path.read_text())
+    index["content_hash"] = "0" * 64
+    index_path.write_text(json.dumps(index, indent=2) + "\n")
+    assert "From postings" not in search(index_path, "hooks")
+
+
+def test_category_filter_reads_only_matching_shards(published, tmp_path):
+    index = json.loads(published.read_text())
+    category = {p["filename"]: p["category"] for p in index["pages"]}
+    unfiltered = search(published, "hooks").splitlines()
+    sdk = search(published, "--category", "agent_sdk", "hooks").splitlines()
+    assert sdk and {category[line.split("\t")[0]] for line in sdk} == {"agent_sdk"}
+    assert {line for line in unfiltered if category[line.split("\t")[0]] == "agent_sdk"} <= set(sdk)  # same scores
+    both = search(published, "--category=agent_sdk,claude_code", "hooks")
+    assert both == search(published, "--category", "agent_sdk", "--category", "claude_code", "hooks")
+    assert search(published, "--category", "no_such_category", "hooks") == ""
+
+    # A shard only counts while the catalog matches the index; else the index is filtered.
+    stale = tmp_path / "search_index.json"
+    shutil.copy(published, stale)
+    shutil.copytree(bsi.shard_dir(published), bsi.shard_dir(stale))
+    shard = bsi.shard_dir(stale) / "agent_sdk.json"
+    shard.write_text(shard.read_text().replace('"Agent SDK reference - Python"', '"From shard"'))
+    assert "From shard" in search(stale, "--category", "agent_sdk", "python")
+    catalog = bsi.shard_dir(stale) / bsi.SHARD_CATALOG_FILE
+    catalog.write_text(catalog.read_text().replace(index["content_hash"], "0" * 64))
+    assert search(stale, "--category", "agent_sdk", "python") == search(published, "--category", "agent_sdk", "python")
@@ -2,6 +2,7 @@
 
 import json
 import sys
+import time
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -11,24 +12,46 @@ import requests
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
 from fetcher.paths import url_to_filename, categorize_from_url, page_id_from_filename
-from fetcher.manifest import load_manifest, pages_by_url, build_manifest, save_manifest
+from fetcher.manifest import (
+    build_manifest,
+    companion_path,
+    load_manifest,
+    manifest_delta,
+    pages_by_url,
+    prune_manifest_deltas,
+    save_manifest,
+)
 from fetcher.content import (
+    conditional_headers,
     validate_markdown_content,
     extract_title,
     fetch_markdown,
+    stream_markdown,
     save_markdown_file,
     _retry_after_seconds,
 )
+from fetcher.throttle import HostLimiter
 from fetcher.safeguards import (
     count_ok_doc_pages,
     validate_discovery_threshold,
     validate_manifest_transition,
 )
 from fetcher.cli import (
+    PageFetcher,
+    build_changelog_entry,
     build_page_entry,
+    fetch_pages,
     map_pages_to_filenames,
     parse_fetch_limit,
+    parse_fetch_mode,
+    parse_fetch_workers,
+    parse_full_sweep_every,
+    parse_fetch_deadline,
+    parse_max_body_bytes,
+    revalidation_validators,
+    summarize_transfer,
 )
+from fetcher.schedule import fetch_order
 
 
 class TestUrlToFilename:
@@ -127,6 +150,74 @@ class TestManifest:
         assert len(loaded["pages"]) == 1
         assert loaded["sources"] == ["s1"]
 
+    def test_unchanged_content_is_not_rewritten(self, tmp_path):
+        p = tmp_path / "paths_manifest.json"
+        pages = [{"id": "a", "url": "u1", "sha256": "abc"}]
+        first = build_manifest(pages, sources=["s1"], generated_at="2026-07-01T00:00:00Z")
+        again = build_manifest(pages, sources=["s1"], generated_at="2026-07-02T00:00:00Z")
+        assert first["content_hash"] == again["content_hash"]
+        assert save_manifest(p, first) is True
+        assert save_manifest(p, again) is False
+        assert load_manifest(p)["generated_at"] == "2026-07-01T00:00:00Z"
+
+        changed = build_manifest([dict(pages[0], sha256="def")], sources=["s1"])
+        assert changed["content_hash"] != first["content_hash"]
+        assert save_manifest(p, changed) is True
+        assert load_manifest(p)["content_hash"] == changed["content_hash"]
+
+    def test_rotated_validators_are_not_a_change(self, tmp_path):
+        p = tmp_path / "paths_manifest.json"
+        page = {"id": "a", "url": "u1", "sha256": "abc", "etag": '"v1"', "last_modified": None}
+        first = build_manifest([page], sources=["s1"])
+        rotated = build_manifest([dict(page, etag='"v2"', last_modified="Thu")], sources=["s1"])
+        assert rotated["content_hash"] == first["content_hash"]
+        assert save_manifest(p, first) is True
+        assert save_manifest(p, rotated) is False
+        assert load_manifest(p)["pages"][0]["etag"] == '"v1"'
+        assert not (tmp_path / "manifest_deltas").exists()
+
+    def test_companion_rows_and_header(self, tmp_path):
+        p = tmp_path / "paths_manifest.json"
+        pages = [
+            {"id": "b", "filename": "b.md", "md_url": "https://x/b.md", "sha256": None,
+             "title": "Tab\there", "category": "c"},
+            {"id": "a", "filename": "a.md", "md_url": "https://x/a.md", "sha256": "abc",
+             "fingerprint": "n1:f", "title": "A", "category": "c"},
+        ]
+        manifest = build_manifest(pages, sources=[])
+        save_manifest(p, manifest)
+        header, *rows = companion_path(p).read_text().splitlines()
+        assert header.startswith(f"# content_hash={manifest['content_hash']} ")
+        assert rows == ["a.md\ta\thttps://x/a.md\tabc\tn1:f\tc\tA",
+                        "b.md\tb\thttps://x/b.md\t-\t-\tc\tTab here"]
+        # A missing companion is restored even when the manifest itself is unchanged.
+        companion_path(p).unlink()
+        assert save_manifest(p, manifest) is False
+        assert companion_path(p).read_text().splitlines() == [header, *rows]
+
+    def test_delta_written_per_replacing_write(self, tmp_path):
+        p = tmp_path / "paths_manifest.json"
+        a = {"id": "a", "filename": "a.md", "sha256": "1", "title": "A"}
+        b = {"id": "b", "filename": "b.md", "sha256": "2", "title": "B"}
+        first = build_manifest([a, b], sources=[])
+        save_manifest(p, first)
+        assert not (tmp_path / "manifest_deltas").exists()  # nothing to diff against
+
+        second = build_manifest([dict(a, sha256="9"), {"id": "c", "filename": "c.md"}], sources=[])
+        save_manifest(p, second)
+        delta = (tmp_path / "manifest_deltas" / f"{first['content_hash']}.tsv").read_text()
+        header, *rows = delta.splitlines()
+        assert header.startswith(f"# from={first['content_hash']} to={second['content_hash']} ")
+        assert [r.split("\t")[:2] for r in rows] == [["C", "a.md"], ["A", "c.md"], ["R", "b.md"]]
+        assert rows[0].split("\t")[4] == "9"
+        assert manifest_delta({}, second) is None
+
+    def test_prune_keeps_newest_deltas(self, tmp_path):
+        for day in range(1, 5):
+            (tmp_path / f"h{day}.tsv").write_text(f"# from=h{day} to=x generated_at=2026-07-0{day}T00:00:00Z columns=op\n")
+        assert prune_manifest_deltas(tmp_path, keep=2) == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["h3.tsv", "h4.tsv"]
+
     def test_build_manifest_sorts_by_id(self):
         pages = [{"id": "b", "url": "u2"}, {"id": "a", "url": "u1"}]
         m = build_manifest(pages, sources=[])
@@ -163,6 +254,7 @@ class TestFetchMarkdown:
         resp = MagicMock()
         resp.status_code = status
         resp.content = content
+        resp.iter_content.side_effect = lambda chunk_size=1: iter([content])
         resp.text = content.decode("utf-8", errors="replace")
         resp.headers = headers or {}
         if status >= 400:
@@ -213,6 +305,20 @@ class TestFetchMarkdown:
         assert b"markdown" in content
         assert sleeps == [60]  # unparseable -> default 60s (well under the 300s cap)
 
+    def test_429_with_limiter_waits_on_host_hold_not_a_private_sleep(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("time.sleep", lambda s: sleeps.append(s))
+        clock_sleeps = []
+        limiter = HostLimiter(rate=100.0, burst=10, sleep=clock_sleeps.append)
+        session = MagicMock()
+        session.get.side_effect = [
+            self._response(status=429, headers={"Retry-After": "0"}), self._response(),
+        ]
+        content = fetch_markdown("https://code.claude.com/docs/en/x.md", session, "x", limiter=limiter)
+        assert b"markdown" in content
+        assert sleeps == []  # no per-request sleep: the shared hold did the waiting
+        assert limiter.metrics()["code.claude.com"]["throttle_events"] == 1
+
     def test_retry_after_seconds_parsing(self):
         def resp(headers):
             r = MagicMock()
@@ -226,6 +332,80 @@ class TestFetchMarkdown:
         assert _retry_after_seconds(resp({"Retry-After": "-3"})) == 0      # floor
 
 
+class TestStreamMarkdown:
+    """stream_markdown: hash while streaming, bounded prefix, atomic rename, size cap."""
+
+    URL = "https://code.claude.com/docs/en/hooks.md"
+    BODY = b"# Hooks\n\n" + b"lots of **markdown** content about claude code hooks\n" * 400
+
+    @staticmethod
+    def _session(chunks, headers=None):
+        session = MagicMock()
+        resp = MagicMock()
+        resp.status_code = 200
+        resp.headers = headers or {}
+        resp.raise_for_status.return_value = None
+        consumed = []
+
+        def iter_content(chunk_size=1):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        resp.iter_content.side_effect = iter_content
+        session.get.return_value = resp
+        return session, resp, consumed
+
+    def _chunks(self, body, size=1000):
+        return [body[i:i + size] for i in range(0, len(body), size)]
+
+    def test_streams_to_disk_with_incremental_hash(self, tmp_path):
+        import hashlib
+        session, resp, _ = self._session(self._chunks(self.BODY))
+        info = {}
+        result = stream_markdown(self.URL, session, tmp_path / "hooks.md", "hooks", info=info)
+        assert result == {"sha256": hashlib.sha256(self.BODY).hexdigest(),
+                          "bytes": len(self.BODY), "title": "Hooks", "changed": True}
+        assert (tmp_path / "hooks.md").read_bytes() == self.BODY
+        # no temp file left; the scratch file is a link into the object store
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".objects", "hooks.md"]
+        assert (tmp_path / "hooks.md").samefile(
+            tmp_path / ".objects" / result["sha256"][:2] / result["sha256"])
+        assert session.get.call_args.kwargs["stream"] is True
+        assert resp.close.called
+        assert info["bytes"] == len(self.BODY)
+
+    def test_hash_only_writes_nothing(self, tmp_path):
+        session, _, _ = self._session(self._chunks(self.BODY))
+        result = stream_markdown(self.URL, session, None, "hooks")
+        assert result["bytes"] == len(self.BODY)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_declared_oversize_aborts_before_reading(self, tmp_path):
+        session, _, consumed = self._session(self._chunks(self.BODY), {"Content-Length": "999999"})
+        with pytest.raises(ValueError, match="too large"):
+            stream_markdown(self.URL, session, tmp_path / "hooks.md", "hooks", max_bytes=5000)
+        assert consumed == []
+        assert session.get.call_count == 1  # invalid content is not retried
+
+    def test_oversize_mid_stream_keeps_previous_copy(self, tmp_path):
+        (tmp_path / "hooks.md").write_bytes(b"previous copy")
+        session, _, consumed = self._session(self._chunks(self.BODY))
+        with pytest.raises(ValueError, match="too large"):
+            stream_markdown(self.URL, session, tmp_path / "hooks.md", "hooks", max_bytes=5000)
+        assert len(consumed) < len(self._chunks(self.BODY))
+        assert (tmp_path / "hooks.md").read_bytes() == b"previous copy"
+        assert [p for p in tmp_path.rglob("*") if p.is_file()] == [tmp_path / "hooks.md"]
+
+    def test_html_rejected_from_prefix_without_full_download(self, tmp_path):
+        html = b"<!DOCTYPE html><html>" + b"x" * 200_000
+        session, _, consumed = self._session(self._chunks(html, 4096))
+        with pytest.raises(ValueError, match="HTML"):
+            stream_markdown(self.URL, session, tmp_path / "hooks.md", "hooks")
+        assert len(consumed) < 10
+        assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
 class TestSaveMarkdownFile:
     def test_writes_exact_bytes_and_hashes_them(self, tmp_path):
         import hashlib
@@ -271,6 +451,304 @@ class TestCarryForward:
         assert entry["sha256"] is None
 
 
+class TestConcurrentFetch:
+    """fetch_pages: the worker pool must not change order or carry-forward."""
+
+    GOOD_MD = b"# Doc\n\nlots of **markdown** content about claude code here\n\n- a\n- b"
+
+    def _session(self, failing=()):
+        session = MagicMock()
+
+        def get(url, **kwargs):
+            resp = MagicMock()
+            resp.headers = {}
+            if any(url.endswith(f"/{slug}.md") for slug in failing):
+                resp.status_code = 500
+                resp.raise_for_status.side_effect = requests.HTTPError("500")
+            else:
+                resp.status_code = 200
+                resp.content = self.GOOD_MD
+                resp.iter_content.side_effect = lambda chunk_size=1: iter([self.GOOD_MD])
+                resp.raise_for_status.return_value = None
+            return resp
+
+        session.get.side_effect = get
+        return session
+
+    @staticmethod
+    def _pairs(slugs):
+        return [
+            ({"url": f"https://code.claude.com/docs/en/{s}",
+              "md_url": f"https://code.claude.com/docs/en/{s}.md", "title": None, "lastmod": None},
+             f"claude-code__{s}.md")
+            for s in slugs
+        ]
+
+    def test_order_preserved_across_workers(self, tmp_path):
+        slugs = [f"p{i:02d}" for i in range(20)]
+        pages = fetch_pages(self._pairs(slugs), self._session(), tmp_path, {}, workers=6)
+        assert [p["filename"] for p in pages] == [f"claude-code__{s}.md" for s in slugs]
+        assert all(p["fetch_status"] == "ok" for p in pages)
+
+    def test_carry_forward_unchanged_under_concurrency(self, monkeypatch, tmp_path):
+        monkeypatch.setattr("time.sleep", lambda *_: None)
+        old_by_url = {"https://code.claude.com/docs/en/b": {"sha256": "OLD", "title": "B"}}
+        pages = fetch_pages(
+            self._pairs(["a", "b", "c"]), self._session(failing=("b", "c")),
+            tmp_path, old_by_url, workers=3,
+        )
+        assert [p["fetch_status"] for p in pages] == ["ok", "stale", "failed"]
+        assert pages[1]["sha256"] == "OLD"
+
+    def test_serial_and_pooled_results_identical(self, tmp_path):
+        pairs = self._pairs(["a", "b", "c", "d"])
+        serial = fetch_pages(pairs, self._session(), tmp_path, {}, workers=1)
+        pooled = fetch_pages(pairs, self._session(), tmp_path, {}, workers=4)
+        assert serial == pooled
+
+    def test_limiter_paces_every_request(self, tmp_path):
+        limiter = MagicMock()
+        fetch_pages(self._pairs(["a", "b"]), self._session(), tmp_path, {}, limiter, workers=2)
+        urls = sorted(c.args[0] for c in limiter.begin.call_args_list)
+        assert urls == ["https://code.claude.com/docs/en/a.md", "https://code.claude.com/docs/en/b.md"]
+        assert limiter.finish.call_count == 2  # every slot handed back
+
+    def test_host_outage_short_circuits_to_carry_forward(self, monkeypatch, tmp_path):
+        sleeps = []
+        monkeypatch.setattr("time.sleep", lambda s: sleeps.append(s))
+        slugs = [f"p{i:02d}" for i in range(30)]
+        old_by_url = {f"https://code.claude.com/docs/en/{s}": {"sha256": "OLD"} for s in slugs[:20]}
+        session = self._session(failing=slugs)
+        limiter = HostLimiter(rate=1000.0, burst=100, failure_threshold=3, cooldown=3600)
+        info = {}
+        pages = fetch_pages(
+            self._pairs(slugs), session, tmp_path, old_by_url, limiter, workers=1, fetch_info=info,
+        )
+        assert [p["fetch_status"] for p in pages] == ["stale"] * 20 + ["failed"] * 10
+        assert session.get.call_count == 3          # the breaker opened after 3 failures
+        assert len(sleeps) == 2                     # ...and no backoff once it had
+        assert summarize_transfer(info)["short_circuited"] == 29
+        assert limiter.metrics()["code.claude.com"]["circuit"] == "open"
+
+    def test_skipped_pages_carry_forward_without_a_request(self, tmp_path):
+        old_by_url = {"https://code.claude.com/docs/en/b": {
+            "sha256": "OLD", "title": "B", "etag": '"e"', "last_modified": None, "fetch_status": "ok",
+        }}
+        session, info = self._session(), {}
+        pages = fetch_pages(
+            self._pairs(["a", "b"]), session, tmp_path, old_by_url,
+            workers=2, fetch_info=info, skip={"claude-code__b.md"},
+        )
+        assert [p["fetch_status"] for p in pages] == ["ok", "ok"]
+        assert pages[1]["sha256"] == "OLD" and pages[1]["etag"] == '"e"'
+        assert [c.args[0] for c in session.get.call_args_list] == ["https://code.claude.com/docs/en/a.md"]
+        assert summarize_transfer(info)["skipped"] == 1
+
+    def test_deadline_defers_remaining_pages_to_carry_forward(self, tmp_path):
+        old_by_url = {"https://code.claude.com/docs/en/b": {"sha256": "OLD", "title": "B", "fetch_status": "ok"}}
+        session, info = self._session(), {}
+        with PageFetcher(session, tmp_path, old_by_url, workers=1, fetch_info=info,
+                         deadline=time.monotonic() - 1) as fetcher:
+            pages = fetcher.fetch(self._pairs(["a", "b"]))
+        assert [p["fetch_status"] for p in pages] == ["failed", "stale"]
+        assert pages[1]["sha256"] == "OLD"
+        assert session.get.call_count == 0
+        assert summarize_transfer(info)["deferred"] == 2
+
+    def test_hold_past_the_deadline_defers_instead_of_sleeping(self, tmp_path):
+        old_by_url = {"https://code.claude.com/docs/en/a": {"sha256": "OLD", "title": "A", "fetch_status": "ok"}}
+        session = MagicMock()
+        throttled = MagicMock(status_code=429, headers={"Retry-After": "300"})
+        session.get.return_value = throttled
+        limiter = HostLimiter(100.0, 10, deadline=time.monotonic() + 60)
+        info = {}
+        entry = build_page_entry(self._pairs(["a"])[0][0], "claude-code__a.md", session, tmp_path,
+                                 old_by_url, limiter, info)
+        assert entry["fetch_status"] == "stale" and entry["sha256"] == "OLD"
+        assert session.get.call_count == 1 and info["deferred"]
+
+    def test_changelog_honors_the_deadline(self, tmp_path):
+        session, info = self._session(), {}
+        entry = build_changelog_entry(session, tmp_path, {}, info=info, deadline=time.monotonic() - 1)
+        assert entry["fetch_status"] == "failed" and info["deferred"]
+        assert session.get.call_count == 0
+
+
+class TestFetchSchedule:
+    """Pages are submitted new → lastmod changed → stale/failed → least recently checked."""
+
+    def _setup(self):
+        pairs = TestConcurrentFetch._pairs(["a", "b", "c", "d", "e", "f"])
+        pairs[3][0]["lastmod"] = "2026-07-02"
+        url = "https://code.claude.com/docs/en/{}".format
+        old_by_url = {
+            url("a"): {"sha256": "A", "fetch_status": "ok"},
+            url("b"): {"sha256": "B", "fetch_status": "ok"},
+            url("c"): {"sha256": "C", "fetch_status": "failed"},
+            url("d"): {"sha256": "D", "fetch_status": "ok", "lastmod": "2026-07-01"},
+            # e: new
+            url("f"): {"sha256": "F", "fetch_status": "ok"},
+        }
+        histories = {
+            url("a"): {"checked_at": "2026-07-10T00:00:00Z"},
+            url("b"): {"checked_at": "2026-07-09T00:00:00Z"},
+            # f: never checked -> oldest
+        }
+        return pairs, old_by_url, histories
+
+    def test_fetch_order(self):
+        pairs, old_by_url, histories = self._setup()
+        order = fetch_order(pairs, old_by_url, histories)
+        assert [pairs[i][1] for i in order] == [
+            "claude-code__e.md", "claude-code__d.md", "claude-code__c.md",
+            "claude-code__f.md", "claude-code__b.md", "claude-code__a.md",
+        ]
+        # a skipped page (no request) queues behind every real fetch, even a new one
+        assert fetch_order(pairs, old_by_url, histories, skip={"claude-code__e.md"})[-1] == 4
+
+    def test_pool_submits_by_priority_but_returns_page_order(self, tmp_path):
+        pairs, old_by_url, histories = self._setup()
+        session = TestConcurrentFetch()._session()
+        with PageFetcher(session, tmp_path, old_by_url, workers=1, history=histories) as fetcher:
+            pages = fetcher.fetch(pairs)
+        fetched = [c.args[0].rsplit("/", 1)[1] for c in session.get.call_args_list]
+        assert fetched == ["e.md", "d.md", "c.md", "f.md", "b.md", "a.md"]
+        assert [p["filename"] for p in pages] == [filename for _, filename in pairs]
+
+
+class TestConditionalGet:
+    """ETag / Last-Modified revalidation: a 304 keeps the previous sha256 as ok."""
+
+    URL = "https://code.claude.com/docs/en/hooks"
+    BODY = b"# Hooks\n\nlots of **markdown** content about claude code hooks\n\n- a\n- b"
+
+    def _raw(self):
+        return {"url": self.URL, "md_url": self.URL + ".md", "title": None, "lastmod": None}
+
+    def _prev(self, body=BODY, **extra):
+        import hashlib
+        prev = {"url": self.URL, "sha256": hashlib.sha256(body).hexdigest(), "title": "Hooks",
+                "etag": '"v1"', "last_modified": "Tue, 28 Jul 2026 10:00:00 GMT",
+                "fetch_status": "ok"}
+        prev.update(extra)
+        return prev
+
+    @staticmethod
+    def _session(status, content=b"", headers=None):
+        session = MagicMock()
+        resp = MagicMock()
+        resp.status_code = status
+        resp.content = content
+        resp.iter_content.side_effect = lambda chunk_size=1: iter([content])
+        resp.headers = headers or {}
+        resp.raise_for_status.return_value = None
+        session.get.return_value = resp
+        return session
+
+    def test_conditional_headers(self):
+        h = conditional_headers({"etag": '"v1"', "last_modified": "Tue, 28 Jul 2026 10:00:00 GMT"})
+        assert h["If-None-Match"] == '"v1"'
+        assert h["If-Modified-Since"] == "Tue, 28 Jul 2026 10:00:00 GMT"
+        assert "If-None-Match" not in conditional_headers(None)
+        assert "If-None-Match" not in conditional_headers({"etag": None})
+
+    def test_fetch_markdown_304_returns_none(self):
+        session = self._session(304)
+        info = {}
+        assert fetch_markdown(self.URL + ".md", session, "hooks",
+                              validators={"etag": '"v1"'}, info=info) is None
+        assert session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+        assert info["http_status"] == 304
+
+    def test_unsolicited_304_is_a_failure(self, monkeypatch):
+        monkeypatch.setattr("time.sleep", lambda *_: None)
+        with pytest.raises(Exception):
+            fetch_markdown(self.URL + ".md", self._session(304), "hooks")
+
+    def test_304_keeps_previous_hash_as_ok(self, tmp_path):
+        (tmp_path / "claude-code__hooks.md").write_bytes(self.BODY)
+        prev = self._prev()
+        info = {}
+        entry = build_page_entry(self._raw(), "claude-code__hooks.md", self._session(304),
+                                 tmp_path, {self.URL: prev}, info=info)
+        assert entry["fetch_status"] == "ok"
+        assert entry["sha256"] == prev["sha256"]
+        assert entry["title"] == "Hooks"
+        assert entry["etag"] == '"v1"'  # kept when the 304 omits it
+        assert info["not_modified"] is True
+        assert info["bytes_saved"] == len(self.BODY)
+
+    def test_no_validators_without_matching_scratch_copy(self, tmp_path):
+        prev = self._prev()
+        # Missing copy -> plain GET.
+        assert revalidation_validators(prev, tmp_path, "claude-code__hooks.md") is None
+        # Copy present but different bytes -> plain GET (a 304 would reuse the wrong body).
+        (tmp_path / "claude-code__hooks.md").write_bytes(b"# Other\n")
+        assert revalidation_validators(prev, tmp_path, "claude-code__hooks.md") is None
+        # Matching copy but no validators recorded -> plain GET.
+        (tmp_path / "claude-code__hooks.md").write_bytes(self.BODY)
+        bare = self._prev(etag=None, last_modified=None)
+        assert revalidation_validators(bare, tmp_path, "claude-code__hooks.md") is None
+        assert revalidation_validators(prev, tmp_path, "claude-code__hooks.md") == {
+            "etag": '"v1"', "last_modified": "Tue, 28 Jul 2026 10:00:00 GMT"}
+
+    def test_verify_run_fetches_in_full_and_writes_nothing(self, tmp_path):
+        (tmp_path / "claude-code__hooks.md").write_bytes(self.BODY)
+        session = self._session(200, self.BODY + b"\nedited")
+        entry = build_page_entry(self._raw(), "claude-code__hooks.md", session, tmp_path,
+                                 {self.URL: self._prev()}, hash_only=True)
+        assert "If-None-Match" not in session.get.call_args.kwargs["headers"]
+        assert entry["fetch_status"] == "ok" and entry["sha256"] != self._prev()["sha256"]
+        assert (tmp_path / "claude-code__hooks.md").read_bytes() == self.BODY
+
+    def test_full_fetch_records_new_validators(self, tmp_path):
+        session = self._session(200, self.BODY, {"ETag": '"v2"', "Last-Modified": "Wed, 29 Jul 2026 GMT"})
+        info = {}
+        entry = build_page_entry(self._raw(), "claude-code__hooks.md", session, tmp_path, {}, info=info)
+        assert entry["fetch_status"] == "ok"
+        assert entry["etag"] == '"v2"'
+        assert entry["last_modified"] == "Wed, 29 Jul 2026 GMT"
+        assert info["bytes"] == len(self.BODY)
+        assert (tmp_path / "claude-code__hooks.md").read_bytes() == self.BODY
+
+    def test_derived_hashes_recorded_and_carried(self, tmp_path):
+        from fetcher.fingerprint import fingerprint
+        from fetcher.sections import page_sections
+        entry = build_page_entry(self._raw(), "claude-code__hooks.md", self._session(200, self.BODY),
+                                 tmp_path, {})
+        assert entry["sections"] == page_sections(self.BODY) and len(entry["sections"]) == 1
+        assert entry["fingerprint"] == fingerprint(self.BODY)
+        # 304 against an entry from before these fields: computed from the verified copy.
+        entry = build_page_entry(self._raw(), "claude-code__hooks.md", self._session(304),
+                                 tmp_path, {self.URL: self._prev()})
+        assert entry["sections"] == page_sections(self.BODY)
+        assert entry["fingerprint"] == fingerprint(self.BODY)
+        prev = self._prev(sections={"k": "h"}, fingerprint="n1:f")
+        entry = build_page_entry(self._raw(), "claude-code__hooks.md", self._session(304),
+                                 tmp_path, {self.URL: prev})
+        assert entry["sections"] == {"k": "h"} and entry["fingerprint"] == "n1:f"
+
+    def test_changelog_304(self, tmp_path):
+        import hashlib
+        body = b"# Changelog\n\n" + b"- change\n" * 30
+        (tmp_path / "changelog.md").write_bytes(body)
+        prev = {"sha256": hashlib.sha256(body).hexdigest(), "etag": '"c1"'}
+        from fetcher.cli import CHANGELOG_URL
+        entry = build_changelog_entry(self._session(304), tmp_path, {CHANGELOG_URL: prev})
+        assert entry["fetch_status"] == "ok"
+        assert entry["sha256"] == prev["sha256"]
+
+    def test_summarize_transfer_counts_304s_separately(self):
+        totals = summarize_transfer({
+            "a.md": {"bytes": 100},
+            "b.md": {"not_modified": True, "bytes_saved": 400},
+            "c.md": {"attempts": 3},  # failed: neither
+        })
+        assert totals == {"full_fetches": 1, "bytes_fetched": 100,
+                          "not_modified": 1, "bytes_saved": 400, "skipped": 0,
+                          "short_circuited": 0, "deferred": 0}
+
+
 class TestCollisionCheck:
     def test_raises_on_collision(self):
         # The v2 scheme is collision-free by construction; simulate by duplicating a URL.
@@ -396,6 +874,21 @@ class TestPreSaveFetchGuard:
         with pytest.raises(SystemExit):
             validate_manifest_transition({"pages": []}, self._pages(ok_docs=249, other=60))
 
+    def test_deferred_pages_scale_the_floor(self):
+        # 100 of 700 doc pages fetched ok before the deadline; 600 deferred.
+        pages = self._pages(ok_docs=100, other=600)
+        with pytest.raises(SystemExit):
+            validate_manifest_transition({"pages": []}, pages)
+        validate_manifest_transition({"pages": []}, pages, deferred=600)  # no raise
+        # ...but the attempted pages must still mostly succeed.
+        with pytest.raises(SystemExit):
+            validate_manifest_transition({"pages": []}, self._pages(ok_docs=10, other=690), deferred=600)
+
+    def test_fully_deferred_run_does_not_publish(self):
+        # Nothing attempted scales the floor to 0; the fixed minimum still applies.
+        with pytest.raises(SystemExit):
+            validate_manifest_transition({"pages": []}, self._pages(ok_docs=0, other=700), deferred=700)
+
 
 class TestParseFetchLimit:
     def test_valid_values(self):
@@ -407,3 +900,79 @@ class TestParseFetchLimit:
     def test_invalid_value_exits_with_clear_error(self):
         with pytest.raises(SystemExit):
             parse_fetch_limit("eight")
+
+
+class TestParseFetchWorkers:
+    def test_valid_values(self):
+        assert parse_fetch_workers("4") == 4
+        assert parse_fetch_workers("1") == 1
+        assert parse_fetch_workers("") == 8   # unset -> FETCH_WORKERS
+        assert parse_fetch_workers(None) == 8
+
+    @pytest.mark.parametrize("bad", ["0", "-2", "many"])
+    def test_invalid_value_exits_with_clear_error(self, bad):
+        with pytest.raises(SystemExit):
+            parse_fetch_workers(bad)
+
+
+class TestParseIncrementalSettings:
+    def test_fetch_mode(self):
+        assert parse_fetch_mode("verify") == "verify"
+        assert parse_fetch_mode("") == "full"
+        assert parse_fetch_mode(None) == "full"
+        assert parse_fetch_mode(" Incremental ") == "incremental"
+        with pytest.raises(SystemExit):
+            parse_fetch_mode("lazy")
+
+    def test_full_sweep_every(self):
+        assert parse_full_sweep_every("") == 8   # unset -> FULL_SWEEP_EVERY
+        assert parse_full_sweep_every("3") == 3
+        for bad in ("0", "-1", "daily"):
+            with pytest.raises(SystemExit):
+                parse_full_sweep_every(bad)
+
+    def test_max_body_bytes(self):
+        assert parse_max_body_bytes("") == 8 * 1024 * 1024
+        assert parse_max_body_bytes("4096") == 4096
+        with pytest.raises(SystemExit):
+            parse_max_body_bytes("0")
+
+    def test_fetch_deadline(self):
+        assert parse_fetch_deadline("") is None
+        assert parse_fetch_deadline("0") is None
+        assert parse_fetch_deadline(" 1500 ") == 1500
+        assert parse_fetch_deadline("90.5") == 90.5
+        for bad in ("-1", "soon", "inf", "nan"):
+            with pytest.raises(SystemExit):
+                parse_fetch_deadline(bad)
+
+
+class TestFingerprint:
+    BODY = (b"# Hooks\n\nRun  commands   before tools.\n\n"
+            b"- [Settings](https://code.claude.com/docs/en/settings)\n"
+            b"- [Agents](https://code.claude.com/docs/en/agents)\n\n"
+            b"```bash\necho  'a'\n```\n\nBuilt 2026-07-29T10:00:00Z. Released 2026-07-01.\n")
+
+    def test_cosmetic_edits_keep_the_fingerprint(self):
+        from fetcher.fingerprint import fingerprint
+        settings = b"- [Settings](https://code.claude.com/docs/en/settings)\n"
+        agents = b"- [Agents](https://code.claude.com/docs/en/agents)\n"
+        cosmetic = (self.BODY.replace(settings + agents, agents + settings + b"\n")
+                    .replace(b"Run  commands", b"Run commands").replace(b"tools.", b"tools.  ")
+                    .replace(b"10:00:00Z", b"11:30:00Z").replace(b"\n", b"\r\n") + b"\n\n")
+        assert fingerprint(cosmetic) == fingerprint(self.BODY)
+        assert fingerprint(self.BODY).startswith("n1:")
+
+    def test_real_edits_change_the_fingerprint(self):
+        from fetcher.fingerprint import fingerprint
+        for old, new in ((b"before tools", b"after tools"), (b"echo  'a'", b"echo 'a'"),
+                         (b"2026-07-01", b"2026-07-02")):
+            assert fingerprint(self.BODY.replace(old, new)) != fingerprint(self.BODY), new
+
+    def test_content_changed(self):
+        from fetcher.fingerprint import content_changed
+        assert content_changed(None, {"sha256": "a"})
+        assert not content_changed({"sha256": "a"}, {"sha256": "a"})
+        assert not content_changed({"sha256": "a", "fingerprint": "n1:f"}, {"sha256": "b", "fingerprint": "n1:f"})
+        assert content_changed({"sha256": "a", "fingerprint": "n1:f"}, {"sha256": "b", "fingerprint": "n1:g"})
+        assert content_changed({"sha256": "a"}, {"sha256": "b", "fingerprint": "n1:f"})
@@ -5,11 +5,16 @@ import json
 import os
 import shutil
 import subprocess
+import sys
 import time
 from pathlib import Path
 
 import pytest
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from fetcher.manifest import build_manifest, companion_path, save_manifest
+
 FETCH = Path(__file__).parent.parent.parent / "plugin" / "scripts" / "fetch-docs.sh"
 
 pytestmark = pytest.mark.skipif(
@@ -170,6 +175,49 @@ class TestSync:
         r = run(env, "sync")  # stale page must NOT re-fetch (synced against same manifest sha)
         assert "0 fetches" in r.stdout or "up to date" in r.stdout, r.stdout
 
+    def test_cosmetic_only_change_refetched_and_classified(self, harness):
+        env, cache, manifest_path = harness
+        data = json.loads(manifest_path.read_text())
+        for p in data["pages"]:
+            p["fingerprint"] = "n1:" + p["filename"]
+        manifest_path.write_text(json.dumps(data))
+        run(env, "sync")
+        meta = json.loads((cache / ".meta" / "claude-code__hooks.md.json").read_text())
+        assert meta["manifest_fingerprint"] == "n1:claude-code__hooks.md"
+        # Stale copies record no fingerprint: their bytes are not the manifest's.
+        assert json.loads((cache / ".meta" / "docs__en__stale.md.json").read_text())["manifest_fingerprint"] == ""
+
+        # Upstream bytes moved, fingerprint did not: sha256 stays authoritative,
+        # so the page re-fetches, counted as cosmetic-only.
+        hooks = next(p for p in data["pages"] if p["filename"] == "claude-code__hooks.md")
+        hooks["sha256"] = "1" * 64
+        manifest_path.write_text(json.dumps(data))
+        assert "fetching 1 page(s) (1 cosmetic-only)" in run(env, "sync").stdout
+
+        hooks["sha256"] = "2" * 64
+        hooks["fingerprint"] = "n1:edited"
+        manifest_path.write_text(json.dumps(data))
+        assert "fetching 1 page(s)...\n" in run(env, "sync").stdout
+
+    def test_synced_content_hash_short_circuits(self, harness):
+        env, cache, manifest_path = harness
+        data = json.loads(manifest_path.read_text())
+        data = {"schema_version": 2, "content_hash": "ab" * 32, "pages": data["pages"]}
+        manifest_path.write_text(json.dumps(data, indent=2))  # the writer's layout
+        assert run(env, "sync").returncode == 0
+        assert (cache / ".meta" / ".synced_content_hash").read_text().strip() == "ab" * 32
+
+        # Same content_hash: no per-page checks at all (a dropped sidecar goes unnoticed).
+        (cache / ".meta" / "claude-code__hooks.md.json").unlink()
+        assert "0 fetches" in run(env, "sync").stdout
+        assert run(env, "status").returncode == 0
+
+        data["content_hash"] = "cd" * 32
+        manifest_path.write_text(json.dumps(data, indent=2))
+        assert run(env, "status").returncode == 2
+        assert "fetching 1 page(s)" in run(env, "sync").stdout
+        assert (cache / ".meta" / ".synced_content_hash").read_text().strip() == "cd" * 32
+
     def test_good_page_not_stale(self, harness):
         env, cache, _ = harness
         run(env, "sync")
@@ -452,6 +500,85 @@ class TestStatusPrune:
         assert fresh_tmp.exists()
 
 
+class TestCompanion:
+    @staticmethod
+    def publish(manifest_path):
+        """Rewrite the harness manifest the way CI does: JSON + TSV companion."""
+        pages = json.loads(manifest_path.read_text())["pages"]
+        failed = _entry("docs__en__failed.md", "https://platform.claude.com/docs/en/failed.md", "")
+        pages.append(dict(failed, sha256=None, fetch_status="failed", title=""))
+        save_manifest(manifest_path, build_manifest(pages, sources=[]))
+        return companion_path(manifest_path)
+
+    def test_subcommands_run_from_the_companion(self, harness):
+        env, cache, manifest_path = harness
+        assert self.publish(manifest_path).exists()
+        r = run(env, "status")
+        assert r.returncode == 2 and "manifest pages : 5" in r.stdout and "syncable       : 4" in r.stdout
+        assert "fetching 4 page(s)" in run(env, "sync").stdout
+        for fn in list(PAGES) + [STALE[0]]:
+            assert (cache / fn).exists(), fn
+        assert run(env, "status").returncode == 0
+        (cache / "claude-code__hooks.md").unlink()
+        assert run(env, "get", "claude-code/hooks").returncode == 0
+        assert (cache / "claude-code__hooks.md").exists()
+        (cache / "orphan.md").write_text("not in manifest")
+        run(env, "prune")
+        assert not (cache / "orphan.md").exists() and (cache / "changelog.md").exists()
+
+    def test_companion_used_only_while_its_hash_matches(self, harness):
+        env, cache, manifest_path = harness
+        companion = self.publish(manifest_path)
+        # Point the companion's hooks row at a disallowed host: only a reader of
+        # the TSV (not the JSON) can see it.
+        companion.write_text(companion.read_text().replace(PAGES["claude-code__hooks.md"][0], EVIL[1]))
+        r = run(env, "get", "claude-code__hooks.md")
+        assert r.returncode != 0 and "disallowed host" in r.stderr
+
+        header, rest = companion.read_text().split("\n", 1)
+        companion.write_text("# content_hash=" + "0" * 64 + " " + header.split(" ", 2)[2] + "\n" + rest)
+        r = run(env, "get", "claude-code__hooks.md")
+        assert r.returncode == 0, r.stderr
+        assert (cache / "claude-code__hooks.md").exists()
+
+
+class TestDeltas:
+    @staticmethod
+    def edit_upstream(env, manifest_path, filename, content):
+        """Change a page upstream and republish the manifest (writing a delta)."""
+        url = PAGES[filename][0]
+        cmap_file = Path(env["CONTENT_MAP"])
+        cmap = json.loads(cmap_file.read_text())
+        cmap[url] = content
+        cmap_file.write_text(json.dumps(cmap))
+        pages = json.loads(manifest_path.read_text())["pages"]
+        for page in pages:
+            if page["filename"] == filename:
+                page["sha256"] = sha(content)
+        save_manifest(manifest_path, build_manifest(pages, sources=[]))
+
+    def test_sync_checks_only_pages_in_the_delta_chain(self, harness):
+        env, cache, manifest_path = harness
+        TestCompanion.publish(manifest_path)
+        assert "fetching 4 page(s)" in run(env, "sync").stdout
+        self.edit_upstream(env, manifest_path, "claude-code__hooks.md", "# Hooks\n\nedited\n")
+        self.edit_upstream(env, manifest_path, "changelog.md", "# Changelog\n\nmore\n")
+        assert len(list((manifest_path.parent / "manifest_deltas").glob("*.tsv"))) == 2
+
+        # A sidecar lost since the last sync is invisible to the delta path.
+        (cache / ".meta" / "docs__en__api__messages.md.json").unlink()
+        assert "fetching 2 page(s)" in run(env, "sync").stdout
+        assert (cache / "claude-code__hooks.md").read_text() == "# Hooks\n\nedited\n"
+        assert (cache / "changelog.md").read_text() == "# Changelog\n\nmore\n"
+
+        # No delta from the synced base: back to checking every page.
+        self.edit_upstream(env, manifest_path, "claude-code__hooks.md", "# Hooks\n\nagain\n")
+        for delta in (manifest_path.parent / "manifest_deltas").glob("*.tsv"):
+            delta.unlink()
+        assert "fetching 2 page(s)" in run(env, "sync").stdout
+        assert (cache / ".meta" / "docs__en__api__messages.md.json").exists()
+
+
 def test_changelog_pin_agrees_across_files():
     """The raw.githubusercontent.com changelog URL is hardcoded as the client exact-match
     pin (fetch-docs.sh) and in the CI fetcher (cli.py, content.py). They MUST stay byte-
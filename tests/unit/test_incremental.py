@@ -0,0 +1,153 @@
+"""Incremental refresh tests: skip selection, recheck intervals, history (offline)."""
+
+import hashlib
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from fetcher.incremental import (
+    can_skip,
+    is_full_sweep,
+    load_fetch_state,
+    recheck_interval,
+    record_history,
+    save_fetch_state,
+    select_skippable,
+)
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+BODY = b"# Page\n\nbody"
+SHA = hashlib.sha256(BODY).hexdigest()
+
+
+def _iso(moment):
+    return moment.isoformat().replace("+00:00", "Z")
+
+
+def _raw(slug, lastmod=None):
+    return {"url": f"https://code.claude.com/docs/en/{slug}", "md_url": "", "lastmod": lastmod}
+
+
+def _prev(lastmod=None, status="ok", sha=SHA):
+    return {"sha256": sha, "lastmod": lastmod, "fetch_status": status}
+
+
+class TestCanSkip:
+    def test_unchanged_lastmod_with_verified_copy_skips(self, tmp_path):
+        (tmp_path / "a.md").write_bytes(BODY)
+        assert can_skip(_raw("a", "2026-02-01"), "a.md", _prev("2026-02-01"), None, tmp_path, NOW)
+
+    def test_changed_lastmod_fetches(self, tmp_path):
+        (tmp_path / "a.md").write_bytes(BODY)
+        assert not can_skip(_raw("a", "2026-02-02"), "a.md", _prev("2026-02-01"), None, tmp_path, NOW)
+
+    def test_missing_or_drifted_scratch_copy_fetches(self, tmp_path):
+        raw, prev = _raw("a", "2026-02-01"), _prev("2026-02-01")
+        assert not can_skip(raw, "a.md", prev, None, tmp_path, NOW)
+        (tmp_path / "a.md").write_bytes(b"edited")
+        assert not can_skip(raw, "a.md", prev, None, tmp_path, NOW)
+
+    def test_new_stale_and_failed_pages_always_fetch(self, tmp_path):
+        (tmp_path / "a.md").write_bytes(BODY)
+        raw = _raw("a", "2026-02-01")
+        assert not can_skip(raw, "a.md", None, None, tmp_path, NOW)
+        assert not can_skip(raw, "a.md", _prev("2026-02-01", "stale"), None, tmp_path, NOW)
+
+    def test_no_lastmod_follows_recheck_interval(self, tmp_path):
+        (tmp_path / "a.md").write_bytes(BODY)
+        # Unchanged for 10 days -> interval clamps to 48h.
+        history = {"changed_at": _iso(NOW - timedelta(days=10))}
+        history["checked_at"] = _iso(NOW - timedelta(hours=20))
+        assert can_skip(_raw("a"), "a.md", _prev(), history, tmp_path, NOW)
+        history["checked_at"] = _iso(NOW - timedelta(hours=49))
+        assert not can_skip(_raw("a"), "a.md", _prev(), history, tmp_path, NOW)
+
+    def test_no_lastmod_and_no_history_fetches(self, tmp_path):
+        (tmp_path / "a.md").write_bytes(BODY)
+        assert not can_skip(_raw("a"), "a.md", _prev(), None, tmp_path, NOW)
+
+
+class TestRecheckInterval:
+    def test_half_the_unchanged_age_clamped(self):
+        assert recheck_interval({"changed_at": _iso(NOW - timedelta(hours=20))}, NOW) == timedelta(hours=10)
+        assert recheck_interval({"changed_at": _iso(NOW - timedelta(hours=1))}, NOW) == timedelta(hours=3)
+        assert recheck_interval({"changed_at": _iso(NOW - timedelta(days=60))}, NOW) == timedelta(hours=48)
+
+    def test_unknown_history_uses_floor(self):
+        assert recheck_interval(None, NOW) == timedelta(hours=3)
+        assert recheck_interval({"changed_at": "garbage"}, NOW) == timedelta(hours=3)
+
+
+class TestSweepAndState:
+    def test_full_sweep_schedule(self):
+        assert is_full_sweep({"runs_since_full": None}, every=4)   # no history
+        assert not is_full_sweep({"runs_since_full": 0}, every=4)
+        assert not is_full_sweep({"runs_since_full": 2}, every=4)
+        assert is_full_sweep({"runs_since_full": 3}, every=4)
+        assert is_full_sweep({"runs_since_full": 0}, every=1)
+
+    def test_corrupt_state_degrades_to_full_run(self, tmp_path):
+        path = tmp_path / "fetch_state.json"
+        path.write_text("{not json")
+        state = load_fetch_state(path)
+        assert state == {"runs_since_full": None, "pages": {}}
+        assert is_full_sweep(state)
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "fetch_state.json"
+        save_fetch_state(path, {"runs_since_full": 2, "pages": {"u": {"checked_at": "x"}}})
+        assert load_fetch_state(path)["pages"] == {"u": {"checked_at": "x"}}
+
+
+class TestRecordHistory:
+    def _entry(self, slug, sha, status="ok"):
+        return {"url": f"https://code.claude.com/docs/en/{slug}", "filename": f"{slug}.md",
+                "sha256": sha, "fetch_status": status}
+
+    def test_checked_and_changed_timestamps(self):
+        earlier = _iso(NOW - timedelta(days=3))
+        state = {"runs_since_full": 1, "pages": {
+            "https://code.claude.com/docs/en/same": {"checked_at": earlier, "changed_at": earlier},
+            "https://code.claude.com/docs/en/skip": {"checked_at": earlier, "changed_at": earlier},
+            "https://code.claude.com/docs/en/gone": {"checked_at": earlier},
+        }}
+        old_by_url = {
+            "https://code.claude.com/docs/en/same": {"sha256": "S"},
+            "https://code.claude.com/docs/en/edit": {"sha256": "OLD"},
+            "https://code.claude.com/docs/en/skip": {"sha256": "K"},
+        }
+        pages = [self._entry("same", "S"), self._entry("edit", "NEW"), self._entry("skip", "K")]
+        info = {"same.md": {"not_modified": True}, "edit.md": {"bytes": 10}, "skip.md": {"skipped": True}}
+
+        record_history(state, pages, old_by_url, info, NOW, full_sweep=False)
+        hist = state["pages"]
+        stamp = _iso(NOW)
+        assert hist["https://code.claude.com/docs/en/same"] == {"checked_at": stamp, "changed_at": earlier}
+        assert hist["https://code.claude.com/docs/en/edit"] == {"checked_at": stamp, "changed_at": stamp}
+        assert hist["https://code.claude.com/docs/en/skip"]["checked_at"] == earlier  # not checked
+        assert "https://code.claude.com/docs/en/gone" not in hist
+        assert state["runs_since_full"] == 2
+
+    def test_cosmetic_change_does_not_move_changed_at(self):
+        earlier = _iso(NOW - timedelta(days=3))
+        url = "https://code.claude.com/docs/en/tidy"
+        state = {"pages": {url: {"checked_at": earlier, "changed_at": earlier}}}
+        old_by_url = {url: {"sha256": "OLD", "fingerprint": "n1:F"}}
+        page = dict(self._entry("tidy", "NEW"), fingerprint="n1:F")
+        record_history(state, [page], old_by_url, {"tidy.md": {"bytes": 10}}, NOW, full_sweep=True)
+        assert state["pages"][url] == {"checked_at": _iso(NOW), "changed_at": earlier}
+
+    def test_full_sweep_resets_counter(self):
+        state = {"runs_since_full": 7, "pages": {}}
+        record_history(state, [], {}, {}, NOW, full_sweep=True)
+        assert state["runs_since_full"] == 0
+
+
+def test_select_skippable_mixed_corpus(tmp_path):
+    for name in ("a.md", "b.md"):
+        (tmp_path / name).write_bytes(BODY)
+    pairs = [(_raw("a", "2026-02-01"), "a.md"), (_raw("b", "2026-02-05"), "b.md"), (_raw("c"), "c.md")]
+    old_by_url = {raw["url"]: _prev("2026-02-01") for raw, _ in pairs}
+    assert select_skippable(pairs, old_by_url, {"pages": {}}, tmp_path, NOW) == {"a.md"}
@@ -1,6 +1,7 @@
 """Tests for llms.txt parsing and the discovery union (fully offline)."""
 
 import sys
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock
 
@@ -256,12 +257,69 @@ class TestDiscoveryFailClosed:
         # The old code swallowed sitemap failure and continued llms-only.
         monkeypatch.setattr(
             fetcher.discovery, "discover_from_llms_txt",
-            lambda session: parse_llms_txt(CODE_LLMS_TXT),
+            lambda session, limiter=None, cache=None: parse_llms_txt(CODE_LLMS_TXT),
         )
 
-        def boom(session):
+        def boom(session, limiter=None, cache=None):
             raise RuntimeError("Discovery source failed: sitemap down")
 
         monkeypatch.setattr(fetcher.discovery, "discover_sitemap_entries", boom)
         with pytest.raises(RuntimeError, match="sitemap down"):
             discover_pages(MagicMock())
+
+
+class TestParallelDiscovery:
+    """All sources are in flight at once; the llms.txt half is handed over early."""
+
+    def test_llms_sources_fetched_concurrently(self):
+        # Both GETs must be in flight together to pass the barrier.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get(url, **kwargs):
+            barrier.wait()
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.text = CODE_LLMS_TXT if "a.example" in url else PLATFORM_LLMS_TXT
+            return resp
+
+        session = MagicMock()
+        session.get.side_effect = get
+        records = discover_from_llms_txt(
+            session, urls=["https://a.example/llms.txt", "https://b.example/llms.txt"]
+        )
+        assert len(records) == 5
+        assert records[0]["md_url"].startswith("https://code.claude.com/")  # urls order kept
+
+    def test_on_llms_fires_before_sitemaps_finish(self, monkeypatch):
+        handed_over = threading.Event()
+        monkeypatch.setattr(
+            fetcher.discovery, "discover_from_llms_txt",
+            lambda session, limiter=None, cache=None: parse_llms_txt(CODE_LLMS_TXT),
+        )
+
+        def sitemaps(session, limiter=None, cache=None):
+            assert handed_over.wait(5), "sitemaps blocked the llms.txt hand-over"
+            return [{"url": "https://code.claude.com/docs/en/accessibility", "lastmod": "2026-07-01"}]
+
+        monkeypatch.setattr(fetcher.discovery, "discover_sitemap_entries", sitemaps)
+        early = []
+
+        def on_llms(records):
+            early.extend(records)
+            handed_over.set()
+
+        merged = discover_pages(MagicMock(), on_llms=on_llms)
+        assert [r["lastmod"] for r in early] == [None, None, None]
+        by_url = {r["url"]: r for r in merged}
+        assert by_url["https://code.claude.com/docs/en/accessibility"]["lastmod"] == "2026-07-01"
+
+    def test_llms_failure_skips_hand_over(self, monkeypatch):
+        def boom(session, limiter=None, cache=None):
+            raise RuntimeError("Discovery source failed: llms.txt down")
+
+        monkeypatch.setattr(fetcher.discovery, "discover_from_llms_txt", boom)
+        monkeypatch.setattr(fetcher.discovery, "discover_sitemap_entries", lambda session, limiter=None, cache=None: [])
+        on_llms = MagicMock()
+        with pytest.raises(RuntimeError, match="llms.txt down"):
+            discover_pages(MagicMock(), on_llms=on_llms)
+        on_llms.assert_not_called()
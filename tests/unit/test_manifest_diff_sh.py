@@ -107,3 +107,78 @@ def test_window_predating_history_is_all_added(repo):
     r = run_diff(repo, "--since", "1h", "--json")
     d = json.loads(r.stdout)
     assert {p["id"] for p in d["added"]} == {"claude-code/d"}
+
+
+@pytest.fixture
+def sectioned_repo(tmp_path):
+    r = tmp_path / "clone"; r.mkdir()
+    git(r, "init", "-q")
+    manifest = r / "paths_manifest.json"
+    v1 = {"schema_version": 2, "pages": [
+        dict(page("claude-code/a", "sha_a1", "Alpha"),
+             sections={"": "h0", "k1": "h1", "k2": "h2", "k3": "h3"}),
+        page("claude-code/b", "sha_b1", "Bravo"),  # predates section hashes
+    ]}
+    manifest.write_text(json.dumps(v1))
+    git(r, "add", "-A")
+    git(r, "commit", "-qm", "v1", date=OLD_DATE)
+
+    v2 = {"schema_version": 2, "pages": [
+        # k1 edited, k3 dropped, k4 new
+        dict(page("claude-code/a", "sha_a2", "Alpha"),
+             sections={"": "h0", "k1": "h1b", "k2": "h2", "k4": "h4"}),
+        dict(page("claude-code/b", "sha_b2", "Bravo"), sections={"k1": "x"}),
+    ]}
+    manifest.write_text(json.dumps(v2))
+    (r / "search_index.json").write_text(json.dumps({"pages": [
+        {"id": "claude-code/a", "headings": [
+            {"text": "Setup", "level": 2}, {"text": "Usage", "level": 2}, {"text": "Limits", "level": 2}]},
+    ]}))
+    git(r, "add", "-A")
+    git(r, "commit", "-qm", "v2", date=RECENT_DATE)
+    return r
+
+
+def test_section_changes_named_from_index(sectioned_repo):
+    r = run_diff(sectioned_repo, "--since", "7d", "--json")
+    assert r.returncode == 0, r.stderr
+    changed = {p["id"]: p for p in json.loads(r.stdout)["changed"]}
+    assert changed["claude-code/a"]["section_changes"] == {
+        "changed": ["Setup"], "added": ["Limits"], "removed": 1}
+    # Baseline without section hashes: page-level change only.
+    assert changed["claude-code/b"]["section_changes"] is None
+    assert all("sections" not in p for p in changed.values())
+
+    r = run_diff(sectioned_repo, "--since", "7d")
+    assert "sections changed: Setup; added: Limits; removed: 1" in r.stdout
+
+
+def test_section_names_fall_back_to_numbers(sectioned_repo):
+    (sectioned_repo / "search_index.json").unlink()
+    r = run_diff(sectioned_repo, "--since", "7d", "--json")
+    changed = {p["id"]: p for p in json.loads(r.stdout)["changed"]}
+    assert changed["claude-code/a"]["section_changes"]["changed"] == ["section 2"]
+
+
+def test_cosmetic_only_changes_are_not_changed(tmp_path):
+    r = tmp_path / "clone"; r.mkdir()
+    git(r, "init", "-q")
+    manifest = r / "paths_manifest.json"
+    manifest.write_text(json.dumps({"schema_version": 2, "pages": [
+        dict(page("claude-code/a", "sha_a1", "Alpha"), fingerprint="n1:fa"),
+        dict(page("claude-code/b", "sha_b1", "Bravo"), fingerprint="n1:fb"),
+    ]}))
+    git(r, "add", "-A")
+    git(r, "commit", "-qm", "v1", date=OLD_DATE)
+    manifest.write_text(json.dumps({"schema_version": 2, "pages": [
+        dict(page("claude-code/a", "sha_a2", "Alpha"), fingerprint="n1:fa"),   # whitespace only
+        dict(page("claude-code/b", "sha_b2", "Bravo"), fingerprint="n1:fb2"),  # real edit
+    ]}))
+    git(r, "add", "-A")
+    git(r, "commit", "-qm", "v2", date=RECENT_DATE)
+
+    d = json.loads(run_diff(r, "--since", "7d", "--json").stdout)
+    assert [p["id"] for p in d["changed"]] == ["claude-code/b"]
+    assert [p["id"] for p in d["cosmetic"]] == ["claude-code/a"]
+    out = run_diff(r, "--since", "7d").stdout
+    assert "=== Changed (1) ===" in out and "(1 page(s) with cosmetic-only changes not listed)" in out
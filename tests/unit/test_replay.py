@@ -0,0 +1,162 @@
+"""Replay server + benchmark tests: the real pipeline against a local synthetic corpus."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+import bench_fetcher
+import build_search_index as bsi
+from fetcher import cli
+from fetcher.cli import PageFetcher, fetch_pages, map_pages_to_filenames
+from fetcher.discovery import discover_pages
+from fetcher.index_records import IndexRecords, index_records_path
+from fetcher.replay import ReplayServer, corpus_file, synthesize_corpus
+from fetcher.throttle import HostLimiter
+
+PAGE = "https://code.claude.com/docs/en/synthetic-0000.md"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    synthesize_corpus(tmp_path / "corpus", pages=6, page_bytes=600)
+    return tmp_path / "corpus"
+
+
+def test_corpus_file_layout_and_traversal(tmp_path):
+    assert corpus_file(tmp_path, PAGE) == tmp_path.resolve() / "code.claude.com/docs/en/synthetic-0000.md"
+    with pytest.raises(ValueError):
+        corpus_file(tmp_path, "https://code.claude.com/../../etc/passwd")
+    with pytest.raises(ValueError):
+        corpus_file(tmp_path, "https://code.claude.com/")
+
+
+class TestReplayServer:
+    def test_serves_with_etag_and_304(self, corpus):
+        with ReplayServer(corpus) as server, server.session() as session:
+            first = session.get(PAGE)
+            assert first.status_code == 200 and first.url == PAGE
+            assert first.content == corpus_file(corpus, PAGE).read_bytes()
+            again = session.get(PAGE, headers={"If-None-Match": first.headers["ETag"]})
+            assert again.status_code == 304
+            assert session.get("https://code.claude.com/docs/en/nope.md").status_code == 404
+        assert server.stats == {"requests": 3, "served": 1, "not_modified": 1,
+                                "errors": 0, "throttled": 0, "missing": 1}
+
+    def test_fault_injection(self, corpus):
+        with ReplayServer(corpus, throttle_rate=1.0, retry_after=7) as server, server.session() as session:
+            response = session.get(PAGE)
+            assert response.status_code == 429 and response.headers["Retry-After"] == "7"
+        with ReplayServer(corpus, error_rate=1.0) as server, server.session() as session:
+            assert session.get(PAGE).status_code == 503
+        assert server.stats["errors"] == 1
+
+    def test_pipeline_runs_unmodified(self, corpus, tmp_path):
+        limiter = HostLimiter(1000, 10, max_concurrency=4)
+        (tmp_path / "scratch").mkdir()
+        with ReplayServer(corpus) as server, server.session() as session:
+            pairs = map_pages_to_filenames(discover_pages(session, limiter))
+            pages = fetch_pages(pairs, session, tmp_path / "scratch", {}, limiter, workers=4)
+        assert len(pages) == 6
+        assert {p["fetch_status"] for p in pages} == {"ok"}
+        assert {p["md_url"].split("/")[2] for p in pages} == {"code.claude.com", "platform.claude.com"}
+
+
+def test_benchmark_reports_each_scenario(tmp_path, capsys):
+    out = tmp_path / "bench.json"
+    assert bench_fetcher.main([
+        "--pages", "4", "--workers", "1,2", "--latency-ms", "0", "--jitter-ms", "0",
+        "--rate", "1000", "--json", str(out),
+    ]) == 0
+    results = json.loads(out.read_text())
+    assert [r["workers"] for r in results] == [1, 2]
+    assert all(r["ok"] == 5 and r["pages_per_s"] > 0 for r in results)  # 4 pages + changelog
+    assert "pages/s" in capsys.readouterr().out
+
+
+def test_early_fetches_are_reused_by_the_final_page_set(corpus, tmp_path):
+    (tmp_path / "scratch").mkdir()
+    limiter = HostLimiter(1000, 10, max_concurrency=4)
+    fetch_info = {}
+    with ReplayServer(corpus) as server, server.session() as session:
+        with PageFetcher(session, tmp_path / "scratch", {}, limiter, 4, fetch_info) as fetcher:
+            pairs = map_pages_to_filenames(discover_pages(session, limiter, on_llms=fetcher.start))
+            pages = fetcher.fetch(pairs)
+        # one GET per page (no duplicate fetch of the early ones) + 4 discovery sources
+        assert server.stats["requests"] == 6 + 4
+    assert [p["url"] for p in pages] == [raw["url"] for raw, _ in pairs]
+    assert all(p["lastmod"] for p in pages)  # patched in from the sitemaps
+    assert set(fetch_info) == {filename for _, filename in pairs}
+
+
+def test_index_records_match_the_builders_analysis(corpus, tmp_path):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    limiter = HostLimiter(1000, 10, max_concurrency=4)
+    records = IndexRecords()
+    with ReplayServer(corpus) as server, server.session() as session:
+        pairs = map_pages_to_filenames(discover_pages(session, limiter))
+        with PageFetcher(session, scratch, {}, limiter, 4, {}, records=records) as fetcher:
+            pages = fetcher.fetch(pairs)
+    assert records.save(index_records_path(scratch), pages) == 6
+    saved = bsi.load_index_records(scratch)
+    for entry in pages:
+        expected = bsi.analyze_content((scratch / entry["filename"]).read_text())
+        assert saved[entry["filename"]] == dict(expected, sha256=entry["sha256"])
+
+    # Next run: nothing re-downloaded, records carried over while the sha256 holds.
+    again = IndexRecords.load(index_records_path(scratch))
+    pages[0] = dict(pages[0], sha256="changed")
+    assert again.save(index_records_path(scratch), pages) == 5
+
+
+def test_large_pages_keep_section_analyses(monkeypatch):
+    monkeypatch.setattr("fetcher.index_records.SECTION_CACHE_MIN_BYTES", 100)
+    body = b"# Changelog\n\n" + b"".join(b"## 1.0.%d\n\n- Fixed a hook\n\n" % v for v in range(10))
+    records = IndexRecords()
+    records.add("changelog.md", "v1", body)
+    records.add("small.md", "s1", b"# Small\n")
+    fresh = records._fresh
+    assert len(fresh["changelog.md"]["sections"]) == 11 and "sections" not in fresh["small.md"]
+    # The next run starts from these records; an edit re-analyzes one section.
+    again = IndexRecords(fresh)
+    edited = body.replace(b"1.0.3\n\n- Fixed a hook", b"1.0.3\n\n- Fixed a matcher")
+    again.add("changelog.md", "v2", edited)
+    record = again._fresh["changelog.md"]
+    assert {k: v for k, v in record.items() if k != "sections"} == dict(
+        bsi.analyze_content(edited.decode()), sha256="v2")
+
+
+def test_bodies_are_held_only_for_the_fused_index_stage(corpus, tmp_path, monkeypatch):
+    scratch = tmp_path / "scratch"
+    scratch.mkdir()
+    limiter = HostLimiter(1000, 10, max_concurrency=4)
+    real = cli.stream_markdown
+    captures = []
+    monkeypatch.setattr(cli, "stream_markdown", lambda *a, **k: captures.append(
+        k.get("capture", False)) or real(*a, **k))
+    reads = []
+    real_read = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or real_read(self))
+    with ReplayServer(corpus) as server, server.session() as session:
+        pairs = map_pages_to_filenames(discover_pages(session, limiter))
+        with PageFetcher(session, scratch, {}, limiter, 4, {}) as fetcher:
+            first = fetcher.fetch(pairs)
+        assert captures and not any(captures)  # no records: streamed, read back once
+        assert all(p["fingerprint"] and p["sections"] for p in first)
+
+        # With records, each body is analyzed as fetched: no second pass over scratch.
+        captures.clear()
+        reads.clear()
+        records = IndexRecords()
+        fresh = tmp_path / "fresh"
+        fresh.mkdir()
+        with PageFetcher(session, fresh, {}, limiter, 4, {}, records=records) as fetcher:
+            again = fetcher.fetch(pairs)
+    assert captures and all(captures)
+    assert not [r for r in reads if r.parent == fresh]
+    assert [p["sections"] for p in again] == [p["sections"] for p in first]
+    assert len(records._fresh) == len(pairs)
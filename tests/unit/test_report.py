@@ -0,0 +1,119 @@
+"""Fetch run report tests: per-page rows, host/phase totals, percentiles, Prometheus."""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from fetcher.report import (
+    build_report,
+    percentile,
+    render_prometheus,
+    timed,
+    write_report,
+)
+
+
+def _entry(name, host="code.claude.com", status="ok"):
+    return {"filename": name, "md_url": f"https://{host}/docs/en/{name}", "fetch_status": status}
+
+
+PAGES = [
+    _entry("a.md"),
+    _entry("b.md"),
+    _entry("c.md", "platform.claude.com", "stale"),
+    _entry("d.md", "platform.claude.com"),
+]
+INFO = {
+    "a.md": {"http_status": 200, "attempts": 1, "bytes": 1000, "latency_s": 0.1},
+    "b.md": {"http_status": 304, "attempts": 2, "not_modified": True, "latency_s": 0.3,
+             "waits": {"throttle": 2.0, "pacing": 0.5}},
+    "c.md": {"http_status": 503, "attempts": 3, "latency_s": 0.5},
+    "d.md": {"skipped": True},
+}
+STARTED = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 90) == 90
+        assert percentile(values, 99) == 99
+        assert percentile([7], 99) == 7
+        assert percentile([], 50) is None
+
+
+class TestBuildReport:
+    def _report(self, **kwargs):
+        return build_report(PAGES, INFO, {"discovery": 1.5, "pages": 4.0}, started_at=STARTED, **kwargs)
+
+    def test_page_rows(self):
+        rows = {r["filename"]: r for r in self._report()["pages"]}
+        assert rows["a.md"] == {
+            "filename": "a.md", "host": "code.claude.com", "fetch_status": "ok",
+            "outcome": "fetched", "http_status": 200, "attempts": 1, "bytes": 1000,
+            "latency_ms": 100.0, "throttle_wait_ms": 0.0, "pacing_wait_ms": 0.0,
+        }
+        assert rows["b.md"]["outcome"] == "not_modified"
+        assert rows["b.md"]["throttle_wait_ms"] == 2000.0
+        assert rows["c.md"]["outcome"] == "failed"
+        assert rows["d.md"]["outcome"] == "skipped" and rows["d.md"]["latency_ms"] is None
+
+    def test_run_totals_and_percentiles(self):
+        report = self._report(mode="incremental")
+        assert report["run"]["outcomes"] == {"fetched": 1, "not_modified": 1, "failed": 1, "skipped": 1}
+        assert report["run"]["requests"] == 6
+        assert report["run"]["duration_s"] == 5.5
+        assert report["run"]["started_at"] == "2026-03-01T12:00:00Z"
+        assert report["phases"] == {"discovery": 1.5, "pages": 4.0}
+        assert report["latency_ms"]["count"] == 3  # the skipped page made no request
+        assert report["latency_ms"]["p50"] == 300.0
+        assert report["latency_ms"]["max"] == 500.0
+
+    def test_host_totals_merge_limiter_metrics(self):
+        report = self._report(host_metrics={"code.claude.com": {"concurrency": 3.5, "throttle_events": 1}})
+        code = report["hosts"]["code.claude.com"]
+        assert code["pages"] == 2 and code["requests"] == 3 and code["bytes"] == 1000
+        assert code["throttle_wait_ms"] == 2000.0
+        assert code["concurrency"] == 3.5
+        platform = report["hosts"]["platform.claude.com"]
+        assert platform["stale"] == 1 and platform["latency_ms"]["count"] == 1
+
+    def test_written_as_json(self, tmp_path):
+        path = tmp_path / "fetch_report.json"
+        write_report(path, self._report(outcome="aborted"))
+        assert json.loads(path.read_text())["run"]["outcome"] == "aborted"
+        assert list(tmp_path.iterdir()) == [path]  # temp file renamed away
+
+
+class TestPrometheus:
+    def test_textfile_format(self):
+        text = render_prometheus(
+            build_report(PAGES, INFO, {"pages": 4.0}, {"code.claude.com": {"concurrency": 2}},
+                         started_at=STARTED)
+        )
+        assert "# TYPE docs_fetch_duration_seconds gauge" in text
+        assert "docs_fetch_duration_seconds 4" in text
+        assert 'docs_fetch_phase_seconds{phase="pages"} 4' in text
+        assert 'docs_fetch_pages{outcome="skipped"} 1' in text
+        assert 'docs_fetch_page_latency_seconds{quantile="0.5"} 0.3' in text
+        assert 'docs_fetch_host_concurrency{host="code.claude.com"} 2' in text
+        assert 'docs_fetch_host_concurrency{host="platform.claude.com"}' not in text  # no data
+        assert text.endswith("\n")
+
+
+def test_timed_accumulates(monkeypatch):
+    ticks = iter([10.0, 12.5, 20.0, 21.0])
+    monkeypatch.setattr("fetcher.report.time.monotonic", lambda: next(ticks))
+    phases = {}
+    with timed(phases, "pages"):
+        pass
+    with pytest.raises(RuntimeError):
+        with timed(phases, "pages"):
+            raise RuntimeError("aborted phases are still timed")
+    assert phases == {"pages": 3.5}
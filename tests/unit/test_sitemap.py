@@ -1,5 +1,7 @@
-"""Sitemap parsing/discovery tests: XXE rejection, namespace handling, filtering (offline)."""
+"""Sitemap parsing/discovery tests: XXE rejection, namespace handling, filtering,
+sitemap indexes and gzip (offline)."""
 
+import gzip
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -9,7 +11,7 @@ import requests
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
 
-from fetcher.sitemap import _parse_xml_safely, discover_sitemap_entries
+from fetcher.sitemap import discover_sitemap_entries, parse_sitemap
 
 NAMESPACED_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
 <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
@@ -62,6 +64,7 @@ def _session_for(responses):
         resp = MagicMock()
         resp.status_code = status
         resp.content = content
+        resp.iter_content.side_effect = lambda chunk_size=1: iter([content])
         if status >= 400:
             resp.raise_for_status.side_effect = requests.HTTPError(f"{status}")
         else:
@@ -72,14 +75,14 @@ def _session_for(responses):
     return session
 
 
-class TestParseXmlSafely:
+class TestParseSitemap:
     def test_rejects_billion_laughs_dtd(self):
         with pytest.raises(ValueError, match="DTD/ENTITY"):
-            _parse_xml_safely(BILLION_LAUGHS)
+            parse_sitemap(BILLION_LAUGHS)
 
     def test_rejects_doctype_case_insensitive(self):
         with pytest.raises(ValueError):
-            _parse_xml_safely(b'<?xml version="1.0"?><!doctype foo><urlset/>')
+            parse_sitemap(b'<?xml version="1.0"?><!doctype foo><urlset/>')
 
     def test_rejects_external_entity(self):
         payload = (
@@ -87,7 +90,7 @@ class TestParseXmlSafely:
             b"<urlset><url><loc>&xxe;</loc></url></urlset>"
         )
         with pytest.raises(ValueError):
-            _parse_xml_safely(payload)
+            parse_sitemap(payload)
 
     def test_rejects_dtd_after_large_comment_padding(self):
         # XML allows arbitrary comments before the DOCTYPE; a fixed-size prefix
@@ -98,18 +101,49 @@ class TestParseXmlSafely:
             b"<urlset><url><loc>&lol;</loc></url></urlset>"
         )
         with pytest.raises(ValueError, match="DTD/ENTITY"):
-            _parse_xml_safely(padded)
+            parse_sitemap(padded)
 
     def test_parses_normal_namespaced_sitemap(self):
-        root = _parse_xml_safely(NAMESPACED_SITEMAP)
-        ns = {"ns": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-        locs = [e.text for e in root.findall(".//ns:loc", ns)]
-        assert "https://code.claude.com/docs/en/hooks" in locs
-        assert len(locs) == 4
+        doc = parse_sitemap(NAMESPACED_SITEMAP)
+        assert doc["kind"] == "urlset"
+        assert doc["urls"][0] == ("https://code.claude.com/docs/en/hooks", "2026-07-16T00:00:00Z")
+        assert doc["urls"][1] == ("https://code.claude.com/docs/en/mcp", None)
+        assert len(doc["urls"]) == 4
 
     def test_parses_plain_sitemap(self):
-        root = _parse_xml_safely(PLAIN_SITEMAP)
-        assert root.find(".//loc").text == "https://platform.claude.com/docs/en/api/messages"
+        assert parse_sitemap(PLAIN_SITEMAP)["urls"] == [
+            ("https://platform.claude.com/docs/en/api/messages", None)
+        ]
+
+    def test_chunked_and_gzipped_bodies_parse_identically(self):
+        expected = parse_sitemap(NAMESPACED_SITEMAP)
+        one_byte_chunks = (NAMESPACED_SITEMAP[i:i + 1] for i in range(len(NAMESPACED_SITEMAP)))
+        assert parse_sitemap(one_byte_chunks) == expected
+        packed = gzip.compress(NAMESPACED_SITEMAP)
+        assert parse_sitemap(packed[i:i + 7] for i in range(0, len(packed), 7)) == expected
+
+    def test_extension_namespaces_ignored(self):
+        doc = parse_sitemap(
+            b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            b'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+            b"<url><loc>https://code.claude.com/docs/en/a</loc>"
+            b"<image:image><image:loc>https://code.claude.com/img.png</image:loc></image:image></url>"
+            b"</urlset>"
+        )
+        assert doc["urls"] == [("https://code.claude.com/docs/en/a", None)]
+
+    def test_decompression_bomb_capped(self):
+        bomb = gzip.compress(b"<urlset>" + b" " * 1_000_000 + b"</urlset>")
+        with pytest.raises(ValueError, match="exceeds"):
+            parse_sitemap(bomb, limit=100_000)
+
+    def test_truncated_gzip_rejected(self):
+        with pytest.raises(ValueError, match="Truncated"):
+            parse_sitemap(gzip.compress(NAMESPACED_SITEMAP)[:-12])
+
+    def test_non_sitemap_root_rejected(self):
+        with pytest.raises(ValueError, match="Not a sitemap"):
+            parse_sitemap(b"<html><body/></html>")
 
 
 class TestDiscoverSitemapEntries:
@@ -178,7 +212,7 @@ class TestSitemapFailClosed:
         # raises, the retry succeeds, and the run proceeds normally.
         good = MagicMock()
         good.status_code = 200
-        good.content = NAMESPACED_SITEMAP
+        good.iter_content.side_effect = lambda chunk_size=1: iter([NAMESPACED_SITEMAP])
         good.raise_for_status.return_value = None
         calls = {"n": 0}
 
@@ -193,3 +227,75 @@ class TestSitemapFailClosed:
         entries = discover_sitemap_entries(session, urls=[self.GOOD])
         assert calls["n"] == 2
         assert len(entries) == 2  # hooks + mcp survive the filter
+
+    def test_dropped_connection_mid_body_is_retried(self):
+        def broken(chunk_size=1):
+            yield NAMESPACED_SITEMAP[:40]
+            raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+        responses = []
+
+        def get(url, **kwargs):
+            assert kwargs["stream"] is True
+            resp = MagicMock()
+            resp.status_code = 200
+            resp.raise_for_status.return_value = None
+            resp.iter_content.side_effect = (
+                broken if not responses else lambda chunk_size=1: iter([NAMESPACED_SITEMAP])
+            )
+            responses.append(resp)
+            return resp
+
+        session = MagicMock()
+        session.get.side_effect = get
+        assert len(discover_sitemap_entries(session, urls=[self.GOOD])) == 2
+        assert len(responses) == 2
+        assert all(r.close.called for r in responses)
+
+
+class TestSitemapIndex:
+    INDEX = "https://platform.claude.com/sitemap.xml"
+    CHILD_A = "https://platform.claude.com/sitemap-docs.xml.gz"
+    CHILD_B = "https://platform.claude.com/sitemap-api.xml"
+
+    @staticmethod
+    def _index(*locs):
+        body = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+        return (
+            '<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"{body}</sitemapindex>"
+        ).encode()
+
+    def test_children_fetched_and_pooled(self):
+        session = _session_for({
+            self.INDEX: (200, self._index(self.CHILD_A, self.CHILD_B)),
+            self.CHILD_A: (200, gzip.compress(NAMESPACED_SITEMAP)),  # gzip child
+            self.CHILD_B: (200, PLAIN_SITEMAP),
+        })
+        urls = [e["url"] for e in discover_sitemap_entries(session, urls=[self.INDEX])]
+        assert urls == [
+            "https://code.claude.com/docs/en/hooks",
+            "https://code.claude.com/docs/en/mcp",
+            "https://platform.claude.com/docs/en/api/messages",
+        ]
+
+    def test_child_outside_allowed_domains_not_fetched(self):
+        session = _session_for({
+            self.INDEX: (200, self._index(self.CHILD_B, "https://evil.example/sitemap.xml",
+                                          "http://platform.claude.com/plain-http.xml")),
+            self.CHILD_B: (200, PLAIN_SITEMAP),
+        })
+        assert len(discover_sitemap_entries(session, urls=[self.INDEX])) == 1
+        assert [c.args[0] for c in session.get.call_args_list] == [self.INDEX, self.CHILD_B]
+
+    def test_failing_child_fails_the_source(self):
+        session = _session_for({self.INDEX: (200, self._index(self.CHILD_A, self.CHILD_B)),
+                                self.CHILD_B: (200, PLAIN_SITEMAP)})  # CHILD_A unroutable
+        with pytest.raises(RuntimeError, match="Discovery source failed"):
+            discover_sitemap_entries(session, urls=[self.INDEX])
+
+    def test_nested_index_rejected(self):
+        session = _session_for({self.INDEX: (200, self._index(self.CHILD_A)),
+                                self.CHILD_A: (200, self._index(self.CHILD_B))})
+        with pytest.raises(RuntimeError, match="nested sitemap index"):
+            discover_sitemap_entries(session, urls=[self.INDEX])
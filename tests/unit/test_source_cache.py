@@ -0,0 +1,100 @@
+"""Discovery source cache tests: conditional source GETs, short-circuit, fail-closed."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+import fetcher.discovery
+from fetcher.config import LLMS_TXT_URLS, SITEMAP_URLS
+from fetcher.discovery import discover_pages
+from fetcher.replay import ReplayServer, corpus_file, synthesize_corpus
+from fetcher.source_cache import CACHE_SCHEMA_VERSION, SourceCache, discovery_cache_path
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_sleep(monkeypatch):
+    monkeypatch.setattr("fetcher.content.time.sleep", lambda s: None)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    synthesize_corpus(tmp_path / "corpus", pages=6, page_bytes=300)
+    return tmp_path / "corpus"
+
+
+def _discover(server, path, on_llms=None):
+    cache = SourceCache.load(path)
+    with server.session() as session:
+        pages = discover_pages(session, on_llms=on_llms, cache=cache)
+    cache.save(path)
+    return pages
+
+
+def _no_merge(monkeypatch):
+    def merge(*args):
+        raise AssertionError("merge_discovery ran on unchanged sources")
+
+    monkeypatch.setattr(fetcher.discovery, "merge_discovery", merge)
+    monkeypatch.setattr(fetcher.discovery, "_filter_allowed", merge)
+
+
+def test_unchanged_sources_reuse_the_previous_union(corpus, tmp_path, monkeypatch):
+    path = discovery_cache_path(tmp_path)
+    with ReplayServer(corpus) as server:
+        first = _discover(server, path)
+        _no_merge(monkeypatch)
+        early = []
+        second = _discover(server, path, on_llms=early.extend)
+    assert second == first
+    assert early == first  # the early hand-over is the whole previous union
+    assert server.stats["not_modified"] == len(LLMS_TXT_URLS) + len(SITEMAP_URLS)
+
+
+def test_changed_source_merges_again(corpus, tmp_path):
+    path = discovery_cache_path(tmp_path)
+    with ReplayServer(corpus) as server:
+        first = _discover(server, path)
+        sitemap = corpus_file(corpus, SITEMAP_URLS[1])
+        extra = "<url><loc>https://code.claude.com/docs/en/brand-new</loc></url></urlset>"
+        sitemap.write_text(sitemap.read_text().replace("</urlset>", extra))
+        second = _discover(server, path)
+    assert len(second) == len(first) + 1
+    assert "https://code.claude.com/docs/en/brand-new" in {p["url"] for p in second}
+
+
+def test_same_body_without_validators_counts_as_unchanged(corpus, tmp_path, monkeypatch):
+    path = discovery_cache_path(tmp_path)
+    with ReplayServer(corpus) as server:
+        first = _discover(server, path)
+    data = json.loads(path.read_text())
+    for entry in data["sources"].values():  # as if the hosts sent no ETag
+        entry.pop("etag", None)
+    path.write_text(json.dumps(data))
+    with ReplayServer(corpus) as server:
+        _no_merge(monkeypatch)
+        assert _discover(server, path) == first
+    assert server.stats["not_modified"] == 0
+
+
+def test_failing_source_still_aborts_with_a_warm_cache(corpus, tmp_path):
+    path = discovery_cache_path(tmp_path)
+    with ReplayServer(corpus) as server:
+        _discover(server, path)
+        corpus_file(corpus, LLMS_TXT_URLS[1]).unlink()
+        with pytest.raises(RuntimeError, match="Discovery source failed"):
+            _discover(server, path)
+
+
+def test_stale_or_corrupt_cache_is_a_cold_discovery(tmp_path):
+    path = discovery_cache_path(tmp_path)
+    path.write_text("{not json")
+    assert SourceCache.load(path).previous_pages is None
+    path.write_text(json.dumps({"schema_version": CACHE_SCHEMA_VERSION, "sources": {},
+                                "pages": [], "allowed_domains": ["evil.example"]}))
+    assert SourceCache.load(path).previous_pages is None  # different allow list
+    path.write_text(json.dumps({"schema_version": CACHE_SCHEMA_VERSION - 1, "pages": []}))
+    assert SourceCache.load(path).previous_pages is None
@@ -0,0 +1,82 @@
+"""Content-addressed scratch store: links, no-rewrite of unchanged content, pruning, journal."""
+
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from fetcher.content import save_markdown_file, scratch_copy_matches
+from fetcher.store import ObjectStore, journal_path, write_scratch_journal
+
+BODY = b"# Hooks\n\nHooks run commands.\n"
+SHA = hashlib.sha256(BODY).hexdigest()
+
+
+class TestObjectStore:
+    def test_link_points_filename_at_read_only_object(self, tmp_path):
+        store = ObjectStore(tmp_path)
+        assert store.add_bytes(BODY) == SHA
+        assert store.link("hooks.md", SHA) is True
+        assert (tmp_path / "hooks.md").read_bytes() == BODY
+        assert store.holds(tmp_path / "hooks.md", SHA)
+        assert store.object_path(SHA).stat().st_mode & 0o777 == 0o444
+
+    def test_unchanged_content_is_not_rewritten(self, tmp_path):
+        store = ObjectStore(tmp_path)
+        store.link("hooks.md", store.add_bytes(BODY))
+        before = (tmp_path / "hooks.md").stat()
+        assert store.add_bytes(BODY) == SHA  # object already present
+        assert store.link("hooks.md", SHA) is False
+        after = (tmp_path / "hooks.md").stat()
+        assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+    def test_changed_content_relinks(self, tmp_path):
+        store = ObjectStore(tmp_path)
+        store.link("hooks.md", store.add_bytes(BODY))
+        new_sha = store.add_bytes(b"# Hooks v2\n")
+        assert store.link("hooks.md", new_sha) is True
+        assert (tmp_path / "hooks.md").read_bytes() == b"# Hooks v2\n"
+        assert store.object_path(SHA).read_bytes() == BODY  # old object untouched
+
+    def test_plain_file_with_same_bytes_is_adopted_as_unchanged(self, tmp_path):
+        (tmp_path / "hooks.md").write_bytes(BODY)  # scratch dir from before the store
+        store = ObjectStore(tmp_path)
+        assert store.link("hooks.md", store.add_bytes(BODY)) is False
+        assert store.holds(tmp_path / "hooks.md", SHA)
+
+    def test_prune_keeps_referenced_objects(self, tmp_path):
+        store = ObjectStore(tmp_path)
+        old = store.add_bytes(b"old body")
+        store.link("hooks.md", old)
+        store.link("hooks.md", store.add_bytes(BODY))
+        assert store.prune({SHA}) == 1
+        assert not store.object_path(old).exists()
+        assert (tmp_path / "hooks.md").read_bytes() == BODY
+
+    def test_prune_sweeps_interrupted_writes(self, tmp_path):
+        store = ObjectStore(tmp_path)
+        store.add_bytes(BODY)
+        leftovers = [store.root / "tmpa.part", store.object_path(SHA).parent / "tmpb.part",
+                     store.root / ".hooks.md.1.2.link", tmp_path / ".hooks.md.x.part"]
+        for part in leftovers:
+            part.write_bytes(b"half a bo")
+        assert store.prune({SHA}) == 0
+        assert not any(part.exists() for part in leftovers)
+        assert store.object_path(SHA).read_bytes() == BODY
+
+
+def test_save_markdown_file_and_scratch_match_use_the_store(tmp_path):
+    assert save_markdown_file(tmp_path, "hooks.md", BODY) == SHA
+    assert ObjectStore(tmp_path).holds(tmp_path / "hooks.md", SHA)
+    assert scratch_copy_matches(tmp_path, "hooks.md", SHA)
+    assert not scratch_copy_matches(tmp_path, "hooks.md", "0" * 64)
+
+
+def test_journal_lists_changed_files(tmp_path):
+    fetch_info = {"a.md": {"scratch_changed": True}, "b.md": {"not_modified": True}, "c.md": {}}
+    write_scratch_journal(tmp_path, fetch_info, datetime(2026, 3, 1, tzinfo=timezone.utc))
+    journal = json.loads(journal_path(tmp_path).read_text())
+    assert journal == {"schema_version": 1, "generated_at": "2026-03-01T00:00:00Z", "new": ["a.md"]}
@@ -0,0 +1,255 @@
+"""Per-host pacing tests: token buckets, AIMD, circuit breakers, the host registry (fake clock, offline)."""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "scripts"))
+
+from fetcher.throttle import (
+    AIMDController,
+    CircuitBreaker,
+    HostLimiter,
+    HostUnavailable,
+    RetryBudget,
+    TokenBucket,
+    is_throttle_response,
+    limited_get,
+    limited_request,
+    url_host,
+)
+
+
+class FakeClock:
+    """Monotonic clock that only advances when something sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_burst_is_free_then_paced_at_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, burst=2, clock=clock, sleep=clock.sleep)
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0       # burst of 2 banked
+        assert bucket.acquire() == pytest.approx(0.5)  # then 1 token per 0.5s
+        assert clock.now == pytest.approx(0.5)
+
+    def test_idle_time_refills_up_to_burst_only(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+        clock.now += 100  # long idle: still only `burst` tokens banked
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(1.0)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestHostLimiter:
+    def test_hosts_are_paced_independently(self):
+        clock = FakeClock()
+        limiter = HostLimiter(rate=1.0, burst=1, clock=clock, sleep=clock.sleep)
+        limiter.acquire("https://code.claude.com/docs/en/a.md")
+        # A different host has its own full bucket: no wait.
+        assert limiter.acquire("https://platform.claude.com/docs/en/b.md") == 0
+        # The same host again must wait for its own refill.
+        assert limiter.acquire("https://code.claude.com/docs/en/c.md") == pytest.approx(1.0)
+
+    def test_bucket_per_host_is_reused(self):
+        limiter = HostLimiter(rate=5.0)
+        assert limiter.bucket("code.claude.com") is limiter.bucket("code.claude.com")
+        assert limiter.bucket("code.claude.com") is not limiter.bucket("platform.claude.com")
+
+    def test_url_host(self):
+        assert url_host("https://raw.githubusercontent.com/anthropics/x") == "raw.githubusercontent.com"
+
+
+def _response(status, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    return resp
+
+
+class TestAIMDController:
+    def test_additive_increase_per_window_up_to_maximum(self):
+        aimd = AIMDController(initial=2, maximum=4)
+        for _ in range(2):  # one full window at limit 2 -> +1
+            aimd.release(aimd.acquire())
+        assert 2.8 < aimd.limit <= 3.0
+        for _ in range(100):
+            aimd.release(aimd.acquire())
+        assert aimd.limit == 4
+
+    def test_throttle_cuts_once_per_window_and_holds_host(self):
+        clock = FakeClock()
+        aimd = AIMDController(initial=8, maximum=8, clock=clock, sleep=clock.sleep)
+        tickets = [aimd.acquire() for _ in range(4)]  # 4 in flight when the origin pushes back
+        for t in tickets:
+            aimd.release(t, throttled=True, retry_after=10)
+        assert aimd.limit == 4            # halved once, not four times
+        assert aimd.throttle_events == 4 and aimd.decreases == 1
+        aimd.acquire()                    # must sit out the Retry-After hold
+        assert clock.now == pytest.approx(10)
+        assert clock.sleeps == [10]
+
+    def test_never_below_minimum(self):
+        aimd = AIMDController(initial=2, maximum=8)
+        for _ in range(5):
+            aimd.release(aimd.acquire(), throttled=True)
+        assert aimd.limit == 1
+
+    def test_error_outcome_leaves_limit_alone(self):
+        aimd = AIMDController(initial=2, maximum=8)
+        aimd.release(aimd.acquire(), healthy=False)
+        assert aimd.limit == 2 and aimd.in_flight == 0
+
+    def test_in_flight_bounded_by_limit(self):
+        aimd = AIMDController(initial=1, maximum=1)
+        first = aimd.acquire()
+        got = threading.Event()
+        worker = threading.Thread(target=lambda: (aimd.acquire(), got.set()))
+        worker.start()
+        assert not got.wait(0.1)          # second request blocked at limit 1
+        aimd.release(first)
+        assert got.wait(2)
+        worker.join()
+
+
+class TestLimitedGet:
+    def test_429_holds_the_host_for_every_worker(self):
+        clock = FakeClock()
+        limiter = HostLimiter(rate=100.0, burst=10, clock=clock, sleep=clock.sleep)
+        session = MagicMock()
+        session.get.return_value = _response(429, {"Retry-After": "30"})
+        limited_get(session, "https://code.claude.com/docs/en/a.md", limiter)
+        metrics = limiter.metrics()["code.claude.com"]
+        assert metrics["throttle_events"] == 1 and metrics["concurrency"] == 1
+        # Another page on the same host waits out the hold; other hosts do not.
+        session.get.return_value = _response(200)
+        limited_get(session, "https://platform.claude.com/docs/en/b.md", limiter)
+        assert clock.now == 0
+        limited_get(session, "https://code.claude.com/docs/en/c.md", limiter)
+        assert clock.now == pytest.approx(30)
+
+    def test_slot_released_when_request_raises(self):
+        limiter = HostLimiter(rate=100.0, burst=10)
+        session = MagicMock()
+        session.get.side_effect = OSError("reset")
+        with pytest.raises(OSError):
+            limited_get(session, "https://code.claude.com/docs/en/a.md", limiter)
+        assert limiter.metrics()["code.claude.com"]["in_flight"] == 0
+
+    def test_streamed_body_holds_the_slot_and_reports_its_outcome(self):
+        limiter = HostLimiter(rate=100.0, burst=10, failure_threshold=1)
+        session = MagicMock()
+        session.get.return_value = _response(200)
+        with limited_request(session, "https://code.claude.com/a.md", limiter, stream=True):
+            assert limiter.metrics()["code.claude.com"]["in_flight"] == 1  # body still being read
+        with pytest.raises(ValueError):
+            with limited_request(session, "https://code.claude.com/b.md", limiter, stream=True):
+                raise ValueError("not markdown")  # a page problem, not an outage
+        assert limiter.metrics()["code.claude.com"]["circuit"] == "closed"
+        with pytest.raises(OSError):
+            with limited_request(session, "https://code.claude.com/c.md", limiter, stream=True):
+                raise OSError("connection reset mid-body")
+        metrics = limiter.metrics()["code.claude.com"]
+        assert metrics["in_flight"] == 0 and metrics["circuit"] == "open"
+
+    def test_throttle_signals(self):
+        assert is_throttle_response(_response(429))
+        assert is_throttle_response(_response(503, {"Retry-After": "5"}))
+        assert not is_throttle_response(_response(503))
+        assert not is_throttle_response(_response(200))
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_only(self):
+        breaker = CircuitBreaker(threshold=3, cooldown=60, clock=FakeClock())
+        for outcome in (False, False, True, False, False):
+            breaker.record(outcome)   # a success in between resets the streak
+        assert breaker.state == "closed" and breaker.allow()
+        breaker.record(False)
+        assert breaker.state == "open" and not breaker.allow()
+        assert breaker.opened == 1 and breaker.rejected == 1
+
+    def test_half_open_single_probe_after_cooldown(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(threshold=1, cooldown=60, clock=clock)
+        breaker.record(False)
+        clock.now = 61
+        assert breaker.allow()        # the one probe
+        assert not breaker.allow()    # everyone else still waits on it
+        breaker.record(False)         # probe failed: open for another cooldown
+        assert breaker.state == "open" and not breaker.allow()
+        clock.now = 200
+        assert breaker.allow()
+        breaker.record(True)
+        assert breaker.state == "closed" and breaker.allow()
+
+    def test_probe_released_when_throttled_or_never_sent(self):
+        clock = FakeClock()
+        limiter = HostLimiter(rate=100.0, burst=10, failure_threshold=1, cooldown=60, clock=clock,
+                              sleep=clock.sleep)
+        session = MagicMock()
+        session.get.return_value = _response(503)
+        limited_get(session, "https://code.claude.com/a.md", limiter)
+        clock.now = 61
+        session.get.return_value = _response(429, {"Retry-After": "0"})
+        limited_get(session, "https://code.claude.com/b.md", limiter)   # the probe, throttled
+        session.get.return_value = _response(200)
+        limited_get(session, "https://code.claude.com/c.md", limiter)   # probes again, closes
+        assert limiter.metrics()["code.claude.com"]["circuit"] == "closed"
+
+        breaker = limiter.breaker("platform.claude.com")
+        breaker.record(False)
+        clock.now = 200
+        limiter.bucket("platform.claude.com").acquire = MagicMock(side_effect=KeyboardInterrupt)
+        with pytest.raises(KeyboardInterrupt):
+            limiter.begin("https://platform.claude.com/d.md")
+        assert breaker.allow()  # the interrupted begin gave its probe back
+
+
+class TestRetryBudget:
+    def test_budget_is_run_wide(self):
+        budget = RetryBudget(2)
+        assert budget.spend() and budget.spend()
+        assert not budget.spend()
+        assert budget.spent == 2
+
+    def test_limiter_refuses_retries_when_spent_or_circuit_open(self):
+        limiter = HostLimiter(rate=100.0, failure_threshold=1, retry_budget=1)
+        assert limiter.should_retry("https://code.claude.com/a.md")
+        assert not limiter.should_retry("https://platform.claude.com/b.md")  # budget gone
+        session = MagicMock()
+        session.get.return_value = _response(503)
+        limited_get(session, "https://code.claude.com/a.md", limiter)
+        with pytest.raises(HostUnavailable):
+            limited_get(session, "https://code.claude.com/b.md", limiter)
+        assert session.get.call_count == 1
+        assert limiter.metrics()["code.claude.com"]["requests_rejected"] == 1
+
+    def test_4xx_and_429_do_not_trip_the_breaker(self):
+        limiter = HostLimiter(rate=100.0, burst=10, failure_threshold=1)
+        session = MagicMock()
+        for status in (404, 429):
+            session.get.return_value = _response(status, {"Retry-After": "0"})
+            limited_get(session, "https://code.claude.com/a.md", limiter)
+        assert limiter.metrics()["code.claude.com"]["circuit"] == "closed"